@@ -27,6 +27,8 @@ engine = Engine(config_path="examples/ping_pong/config.toml")
 engine.renderer = SimpleRenderer(width=800, height=600)
 # Connect renderer to engine event system for input forwarding
 engine.renderer.set_engine_events(engine.events)
+# System timings for the debug overlay (F4)
+engine.renderer.set_ecs(engine.ecs)
 
 _, _, _, scoring_system = install_ping_pong_systems(engine, bounds=(800, 600))
 
@@ -0,0 +1,51 @@
+"""Benchmark MovementSystem on object components vs. the NumPy column store.
+
+    python scripts/bench_ecs_movement.py [N ...]   (default: 10000 30000 100000)
+
+Builds N entities with position and velocity, runs MovementSystem through
+ECS.update() and prints the median frame time for both storage modes.
+"""
+
+import logging
+import statistics
+import sys
+import time
+
+from simplex.ecs.components import PositionComponent, VelocityComponent
+from simplex.ecs.ecs import ECS, Entity
+from simplex.ecs.systems import MovementSystem
+
+
+def build(n: int, columns: bool) -> ECS:
+    ecs = ECS(columns=columns)
+    for i in range(n):
+        entity = Entity(f"mob{i}")
+        entity.add_component(PositionComponent(float(i), 0.0, 0.0))
+        entity.add_component(VelocityComponent(0.1, 0.2, 0.3))
+        ecs.add_entity(entity)
+    ecs.add_system(MovementSystem())
+    return ecs
+
+
+def frame_ms(ecs: ECS, frames: int = 20) -> float:
+    ecs.update()  # warm the query caches
+    samples = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        ecs.update()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples)
+
+
+def main(argv) -> None:
+    logging.disable(logging.CRITICAL)
+    sizes = [int(a) for a in argv] or [10_000, 30_000, 100_000]
+    print(f"{'entities':>10} {'objects ms':>12} {'columns ms':>12} {'speedup':>8}")
+    for n in sizes:
+        objects = frame_ms(build(n, columns=False), frames=5)
+        columns = frame_ms(build(n, columns=True))
+        print(f"{n:>10} {objects:>12.2f} {columns:>12.3f} {objects / columns:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -4,7 +4,23 @@ Debug overlay for displaying engine statistics and debug information.
 
 import pygame
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+
+def format_system_profile(stats: Dict[str, Any], limit: int = 5) -> List[str]:
+    """Overlay lines for ECS.profile_stats(): the slowest systems by p99."""
+    systems = stats.get("systems") if stats else None
+    if not systems:
+        return []
+    frame = stats["frame"]
+    lines = [f"frame: {frame['p50_ms']:.1f}/{frame['p95_ms']:.1f}/{frame['p99_ms']:.1f}"]
+    ranked = sorted(systems.items(), key=lambda item: item[1]["p99_ms"], reverse=True)
+    for name, s in ranked[:limit]:
+        line = f"{name}: {s['p50_ms']:.1f}/{s['p95_ms']:.1f}/{s['p99_ms']:.1f}"
+        if s["over_budget"]:
+            line += f" ({s['over_budget']} over)"
+        lines.append(line)
+    return lines
 
 
 class DebugOverlay:
@@ -17,6 +33,8 @@ class DebugOverlay:
         self.max_fps_history = 60
         self.stats = {}
         self.debug_lines = []
+        # format_system_profile lines, shown while profiling (F4)
+        self.profile_lines = []
 
     def initialize(self):
         """Initialize pygame font for debug text."""
@@ -40,6 +58,10 @@ class DebugOverlay:
         """Update engine statistics."""
         self.stats.update(stats)
 
+    def update_system_profile(self, stats: Dict[str, Any]):
+        """Show per-system timings (ECS.profile_stats(); {} hides them)."""
+        self.profile_lines = format_system_profile(stats)
+
     def add_debug_line(self, text: str):
         """Add a debug text line."""
         self.debug_lines.append(text)
@@ -94,6 +116,18 @@ class DebugOverlay:
             overlay.blit(stat_text, (10, y_offset))
             y_offset += line_height
 
+        # System timings
+        if self.profile_lines:
+            y_offset += 10
+            profile_title = self.font.render("Systems p50/p95/p99 ms:", True, (200, 255, 200))
+            overlay.blit(profile_title, (10, y_offset))
+            y_offset += line_height
+
+            for line in self.profile_lines:
+                profile_text = self.font.render(line, True, (255, 255, 255))
+                overlay.blit(profile_text, (10, y_offset))
+                y_offset += line_height
+
         # Debug lines
         if self.debug_lines:
             y_offset += 10
@@ -116,6 +150,7 @@ class DebugOverlay:
             "F1: Toggle Debug",
             "F2: Toggle Pause",
             "F3: Step Frame",
+            "F4: System Timings",
             "ESC: Quit",
         ]
 
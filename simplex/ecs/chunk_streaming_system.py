@@ -1,13 +1,58 @@
 """Load and unload chunks around the player."""
 
+import heapq
 import math
+from typing import Optional
 
 from simplex.ecs.ecs import System
+from simplex.utils.frame_budget import FrameBudget, FrameTimer
 from simplex.utils.logger import log
+from simplex.world.chunk_manager import UNLOADED
+
+
+def chunk_priority(position, eye, forward, chunk_size, view_weight: float = 0.5) -> float:
+    """Load order key for chunk `position`: lower loads first.
+
+    Distance from `eye` to the chunk centre (in chunks), scaled down for
+    chunks in front of the camera and up for chunks behind it: with the
+    default `view_weight` a chunk straight ahead counts as half as far
+    and one straight behind as one and a half times as far. `forward` is
+    a unit vector or None (distance only).
+    """
+    sx, sy, sz = chunk_size
+    dx = (position[0] + 0.5) * sx - eye[0]
+    dy = (position[1] + 0.5) * sy - eye[1]
+    dz = (position[2] + 0.5) * sz - eye[2]
+    dist = math.sqrt(dx * dx + dy * dy + dz * dz)
+    if forward is None or dist == 0.0:
+        return dist / min(chunk_size)
+    dot = (dx * forward[0] + dy * forward[1] + dz * forward[2]) / dist
+    return dist / min(chunk_size) * (1.0 - view_weight * dot)
 
 
 class ChunkStreamingSystem(System):
-    """Stream chunks in a radius around the player when they cross chunk boundaries."""
+    """Stream chunks in a radius around the player when they cross chunk boundaries.
+
+    Wanted positions that are not loaded yet go into a priority queue
+    ordered by `chunk_priority` (distance to the player, favouring what
+    the camera faces, see FirstPersonController yaw/pitch), and at most
+    `loads_per_frame` of them are requested per frame. The queue is
+    rebuilt whenever the center chunk changes or the view turns by more
+    than `reprioritize_angle` degrees. The load area is pinned in the
+    ChunkManager so LRU eviction never drops it; loaded chunks are only
+    unloaded (and background jobs cancelled) once they are outside
+    `unload_radius`, by default one ring wider than `radius`, so walking
+    back and forth over a chunk boundary does not reload anything.
+
+    Also integrates chunks finished by the ChunkManager's background
+    generation every frame.
+
+    With `budget_ms`, integrating finished chunks and requesting queued
+    ones stop once that many milliseconds of the frame are spent (at
+    least one of each still happens); the rest carries over to the next
+    frame. The time spent per frame is recorded in `frame_timer`, see
+    `stats()`.
+    """
 
     def __init__(
         self,
@@ -17,21 +62,46 @@ class ChunkStreamingSystem(System):
         horizontal_only: bool = True,
         stream_y_chunk: int = 0,
         hysteresis: float = 4.0,
+        loads_per_frame: int = 16,
+        view_weight: float = 0.5,
+        reprioritize_angle: float = 45.0,
+        budget_ms: float = 0.0,
+        unload_radius: Optional[int] = None,
     ):
         super().__init__("chunk_streaming")
         self.event_system = event_system
         self.engine = engine
         self.radius = int(radius)
+        self.unload_radius = self.radius + 1 if unload_radius is None else max(int(unload_radius), self.radius)
         self.horizontal_only = horizontal_only
         self.stream_y_chunk = int(stream_y_chunk)
         self.hysteresis = float(hysteresis)
         self.required_components = ["position"]
         self._last_center = None
+        self.loads_per_frame = max(1, int(loads_per_frame))
+        self.view_weight = float(view_weight)
+        self._reprioritize_cos = math.cos(math.radians(reprioritize_angle))
+        # heap of (priority, chunk_pos) not yet requested from the ChunkManager
+        self._queue = []
+        self._queue_forward = None
+        self.budget_ms = float(budget_ms)
+        self._budget = FrameBudget(budget_ms, self.loads_per_frame)
+        self.frame_timer = FrameTimer()
 
     def _process_entities(self, entities):
         cm = getattr(self.engine, "chunk_manager", None) if self.engine else None
         if cm is None:
             return
+        budget = self._budget.start()
+        self._stream(cm, entities, budget)
+        self.frame_timer.record(budget.elapsed_ms())
+
+    def _stream(self, cm, entities, budget: FrameBudget):
+        # attach chunks finished by background generation (budgeted per frame)
+        if self.budget_ms > 0:
+            cm.integrate_pending(time_budget_ms=self.budget_ms)
+        else:
+            cm.integrate_pending()
 
         player = None
         for entity in entities:
@@ -55,18 +125,82 @@ class ChunkStreamingSystem(System):
         cz = self._stable_chunk_index(pos.z, sz, 2)
         center = (cx, cy, cz)
 
-        if center == self._last_center:
-            return
+        forward = self._view_forward()
+        eye = (pos.x, pos.y, pos.z)
+        if center != self._last_center:
+            self._last_center = center
+            cm.pin_area(center, radius=self.radius, horizontal_only=self.horizontal_only)
+            # drops loaded chunks and cancels queued jobs outside the unload radius
+            cm.unload_outside_area(center, radius=self.unload_radius, horizontal_only=self.horizontal_only)
+            self._rebuild_queue(cm, center, eye, forward)
+            log(
+                f"ChunkStreamingSystem: queued {len(self._queue)} chunks radius={self.radius} "
+                f"horizontal={self.horizontal_only} at {center}",
+                level="DEBUG",
+            )
+        elif self._queue and self._view_turned(forward):
+            self._rebuild_queue(cm, center, eye, forward)
+
+        self._drain_queue(cm, budget)
+
+    def _view_forward(self):
+        """Unit camera forward vector from the FirstPersonController, or None."""
+        ecs = getattr(self.engine, "ecs", None)
+        controller = ecs.get_system("player_control") if ecs is not None else None
+        if controller is None or not hasattr(controller, "yaw"):
+            return None
+        yaw = math.radians(controller.yaw)
+        pitch = 0.0 if self.horizontal_only else math.radians(controller.pitch)
+        # same convention as the controller's movement: yaw 0 faces +z
+        return (math.cos(pitch) * math.sin(yaw), math.sin(pitch), math.cos(pitch) * math.cos(yaw))
+
+    def _view_turned(self, forward) -> bool:
+        old = self._queue_forward
+        if forward is None or old is None:
+            return forward is not old
+        dot = forward[0] * old[0] + forward[1] * old[1] + forward[2] * old[2]
+        return dot < self._reprioritize_cos
+
+    def _rebuild_queue(self, cm, center, eye, forward) -> None:
+        if self.horizontal_only:
+            # rank by horizontal distance on the streamed layer
+            eye = (eye[0], (center[1] + 0.5) * cm.chunk_size[1], eye[2])
+        self._queue = [
+            (chunk_priority(p, eye, forward, cm.chunk_size, self.view_weight), p)
+            for p in cm.area_positions(center, self.radius, self.horizontal_only)
+            if cm.chunk_state(p) == UNLOADED
+        ]
+        heapq.heapify(self._queue)
+        self._queue_forward = forward
+
+    def _drain_queue(self, cm, budget: FrameBudget) -> int:
+        """Request queued chunks, best first, until the frame budget is spent."""
+        requested = 0
+        while self._queue and not budget.exhausted():
+            _, p = heapq.heappop(self._queue)
+            if cm.chunk_state(p) != UNLOADED:
+                continue
+            try:
+                cm.request_chunk(p)
+            except Exception as exc:
+                log(f"ChunkStreamingSystem: requesting chunk {p} failed: {exc}", level="ERROR")
+            budget.charge()
+            requested += 1
+        return requested
+
+    def stats(self) -> dict:
+        """Streaming frame time (ms), queue/pending counts and ChunkManager.stats() under "chunks"."""
+        cm = getattr(self.engine, "chunk_manager", None) if self.engine else None
+        stats = self.frame_timer.stats()
+        stats["queued"] = len(self._queue)
+        stats["pending"] = len(cm.list_pending()) if cm is not None else 0
+        if cm is not None:
+            stats["chunks"] = cm.stats()
+        return stats
 
-        self._last_center = center
-        cm.ensure_area_loaded(
-            center, radius=self.radius, horizontal_only=self.horizontal_only
-        )
-        log(
-            f"ChunkStreamingSystem: loaded area radius={self.radius} "
-            f"horizontal={self.horizontal_only} at {center}",
-            level="DEBUG",
-        )
+    def queued_positions(self):
+        """Positions waiting to be requested, in load order."""
+        return [p for _, p in sorted(self._queue)]
 
     def _stable_chunk_index(self, coord: float, size: int, axis: int) -> int:
         """Floor to chunk index with hysteresis so border jitter does not reload."""
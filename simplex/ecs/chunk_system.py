@@ -1,9 +1,15 @@
 """ECS systems for handling chunks and mesh generation."""
 
+from concurrent.futures.process import BrokenProcessPool
+
 from simplex.ecs.ecs import System
+from simplex.utils.frame_budget import FrameBudget, FrameTimer
 from simplex.utils.logger import log
 from simplex.voxel.chunk import Chunk
-from simplex.voxel.meshgen import generate_naive_mesh
+from simplex.voxel.meshgen import generate_naive_mesh, get_mesher
+from simplex.voxel.mesh_packing import pack_mesh
+from simplex.voxel.mesh_jobs import MeshWorkerPool
+from simplex.voxel.mesh_cache import CachedMesh, MeshCache, mesh_cache_key
 from simplex.ecs.components import MeshComponent
 
 
@@ -18,6 +24,9 @@ class ChunkSystem(System):
         super().__init__("chunk")
         self.event_system = event_system
         self.required_components = ["chunk"]
+        # fills chunk components that have no voxel data yet
+        self.reads = set()
+        self.writes = {"chunk", "world"}
 
     def _process_entities(self, entities):
         for entity in entities:
@@ -39,58 +48,292 @@ class ChunkSystem(System):
 
 
 class ChunkMeshSystem(System):
-    """System that generates meshes for dirty chunks and attaches MeshComponents."""
+    """System that generates meshes for dirty chunks and attaches MeshComponents.
+
+    When the engine has a ChunkManager, meshes are built against the
+    neighbouring chunks' border layers so faces hidden by an adjacent
+    chunk are culled, and edits along a chunk border re-mesh the
+    neighbour on that side.
+
+    `vertex_format` selects what lands on the MeshComponent: "float" keeps
+    the mesher's float lists, while "int16" stores a PackedMesh (indexed,
+    interleaved; see simplex.voxel.mesh_packing) instead. "uint8"
+    positions need a shader pipeline, which the fixed-function
+    OpenGLRenderer does not have, so they are rejected here.
+
+    With `workers > 0` meshing runs on a MeshWorkerPool: dirty chunks are
+    handed off as snapshots, finished meshes are attached on a later
+    frame, and a result is dropped if its chunk changed (`Chunk.version`)
+    while the job was in flight; the chunk stays dirty and is resubmitted.
 
-    def __init__(self, event_system=None, max_chunks_per_frame: int = 2):
+    Meshes are also kept in a content-addressed MeshCache (`cache_size`
+    entries, 0 disables it): a chunk whose blocks and neighbour borders
+    match an earlier chunk reuses that mesh, and its GPU handle once one
+    has been uploaded, without meshing. Cache hits do not count against
+    `max_chunks_per_frame`. GPU handles are reference counted (`refs` in
+    the handle dict) and released through the engine's VBO manager when
+    no mesh or cache entry uses them any more.
+
+    With `budget_ms` the per-frame limit is time instead of a chunk count:
+    the system keeps meshing (or submitting, and attaching finished jobs)
+    until `budget_ms` milliseconds have passed, at least one chunk per
+    frame, and leaves the rest dirty for later frames. Cache hits are
+    still served after the meshing budget is spent, but not past the
+    time limit. `frame_timer` records the time spent per frame.
+    """
+
+    def __init__(
+        self,
+        event_system=None,
+        max_chunks_per_frame: int = 2,
+        mesher: str = "greedy",
+        engine=None,
+        vertex_format: str = "float",
+        workers: int = 0,
+        worker_kind: str = "process",
+        cache_size: int = 256,
+        budget_ms: float = 0.0,
+    ):
         super().__init__("chunk_mesh")
         self.event_system = event_system
+        self.engine = engine
         self.max_chunks_per_frame = max(1, int(max_chunks_per_frame))
+        self._budget = FrameBudget(budget_ms, self.max_chunks_per_frame)
+        self.frame_timer = FrameTimer()
+        # "naive", "greedy" or "vectorized" (see simplex.voxel.meshgen.MESHERS)
+        self.mesher_name = mesher
+        self.mesher = get_mesher(mesher)
+        if vertex_format == "uint8":
+            raise ValueError("vertex format 'uint8' needs a shader-based renderer; use 'int16'")
+        if vertex_format not in ("float", "int16"):
+            raise ValueError(f"Unknown vertex format '{vertex_format}'")
+        self.vertex_format = vertex_format
         self.required_components = ["chunk"]
+        self._pool = MeshWorkerPool(workers, worker_kind) if workers > 0 else None
+        if self._pool is not None:
+            self._pool.start()
+        # entity -> (future, chunk, chunk version and entity id at submit time, cache key)
+        self._in_flight = {}
+        self.stale_results = 0
+        self.mesh_cache = MeshCache(cache_size, on_evict=self._on_cache_evict) if cache_size > 0 else None
+        if event_system is not None:
+            event_system.register("chunk_unloaded", self._on_chunk_unloaded)
 
     def _process_entities(self, entities):
-        meshed = 0
+        cm = getattr(self.engine, "chunk_manager", None) if self.engine else None
+        budget = self._budget.start()
+        if self._pool is not None:
+            self._collect_results(entities, budget)
+            self._submit_jobs(entities, cm, budget)
+        else:
+            self._mesh_inline(entities, cm, budget)
+        if cm is not None:
+            # attached meshes may have pushed the loaded chunks over budget
+            cm.enforce_memory_budget()
+        self.frame_timer.record(budget.elapsed_ms())
+
+    def _mesh_inline(self, entities, cm, budget: FrameBudget):
+        processed = 0
         for entity in entities:
-            if meshed >= self.max_chunks_per_frame:
-                break
             chunk_comp = entity.get_component("chunk")
             if chunk_comp and chunk_comp.has_chunk() and chunk_comp.dirty:
-                # Use greedy mesh generator for fewer vertices when available
-                try:
-                    from simplex.voxel.meshgen import generate_greedy_mesh
-
-                    verts, cols = generate_greedy_mesh(chunk_comp.chunk)
-                except Exception:
-                    verts, cols = generate_naive_mesh(chunk_comp.chunk)
-                mesh_comp = entity.get_component("mesh")
-                # compute world-space origin from chunk coordinates and chunk size
-                chunk_obj = chunk_comp.chunk
-                origin = (
-                    chunk_comp.position[0] * chunk_obj.size[0],
-                    chunk_comp.position[1] * chunk_obj.size[1],
-                    chunk_comp.position[2] * chunk_obj.size[2],
-                )
-                if not mesh_comp:
-                    mesh_comp = MeshComponent(
-                        vertices=verts, colors=cols, origin=origin
-                    )
-                    entity.add_component(mesh_comp)
-                else:
-                    mesh_comp.vertices = verts
-                    mesh_comp.colors = cols
-                    mesh_comp.origin = origin
-
-                # GPU upload is handled by the renderer (context required). Leave mesh_comp.gpu unset.
-
-                chunk_comp.clear_dirty()
-                meshed += 1
-                log(
-                    f"ChunkMeshSystem: Generated mesh for chunk {chunk_comp.position} (verts={len(verts) // 3})",
-                    level="DEBUG",
-                )
+                if processed and budget.expired():
+                    break
+                processed += 1
+                neighbors = cm.neighbor_borders(chunk_comp.position) if cm else None
+                budget_left = not budget.exhausted()
+                key, cached = self._cache_lookup(chunk_comp.chunk, neighbors, budget_left)
+                if cached is None:
+                    if not budget_left:
+                        break
+                    # Use the configured mesher, falling back to the naive reference
+                    try:
+                        verts, cols = self.mesher(chunk_comp.chunk, neighbors)
+                    except Exception:
+                        verts, cols = generate_naive_mesh(chunk_comp.chunk, neighbors)
+                    packed = None
+                    if self.vertex_format != "float":
+                        packed = pack_mesh(verts, cols, self.vertex_format)
+                        verts, cols = [], []
+                    cached = self._cache_store(key, verts, cols, packed)
+                    budget.charge()
+                self._attach_mesh(entity, chunk_comp, cached, key)
+                self._flush_dirty_borders(cm, chunk_comp.chunk, chunk_comp.position)
+
+    def _submit_jobs(self, entities, cm, budget: FrameBudget):
+        # in count mode the limit is on submissions only
+        if budget.budget_ms is None:
+            budget.items = 0
+        processed = budget.items
+        for entity in entities:
+            if entity in self._in_flight:
+                continue
+            chunk_comp = entity.get_component("chunk")
+            if not (chunk_comp and chunk_comp.has_chunk() and chunk_comp.dirty):
+                continue
+            if processed and budget.expired():
+                break
+            processed += 1
+            chunk_obj = chunk_comp.chunk
+            neighbors = cm.neighbor_borders(chunk_comp.position) if cm else None
+            budget_left = not budget.exhausted()
+            key, cached = self._cache_lookup(chunk_obj, neighbors, budget_left)
+            if cached is not None:
+                self._attach_mesh(entity, chunk_comp, cached, key)
+            else:
+                if not budget_left:
+                    break
+                future = self._pool.submit(chunk_obj.snapshot(), self.mesher_name, neighbors, self.vertex_format)
+                self._in_flight[entity] = (future, chunk_obj, chunk_obj.version, entity.id, key)
+                budget.charge()
+            # neighbours re-mesh against the border as it is now
+            self._flush_dirty_borders(cm, chunk_obj, chunk_comp.position)
+
+    def _collect_results(self, entities, budget: FrameBudget):
+        if not self._in_flight:
+            return
+        for entity, (future, chunk_obj, version, entity_id, key) in list(self._in_flight.items()):
+            if not future.done():
+                continue
+            if budget.exhausted() and budget.expired():
+                break  # attach the rest on a later frame
+            del self._in_flight[entity]
+            chunk_comp = entity.get_component("chunk")
+            if entity.id != entity_id or chunk_comp is None or chunk_comp.chunk is not chunk_obj:
+                continue  # unloaded or replaced while meshing
+            try:
+                verts, cols, packed = future.result()
+            except BrokenProcessPool:
+                self._pool.fall_back_to_threads()
+                continue
+            except Exception as e:
+                log(f"ChunkMeshSystem: mesh job for {entity.name} failed: {e}", level="ERROR")
+                continue
+            if chunk_obj.version != version:
+                self.stale_results += 1
+                continue
+            self._attach_mesh(entity, chunk_comp, self._cache_store(key, verts, cols, packed), key)
+            budget.charge()
+
+    def _cache_lookup(self, chunk_obj, neighbors, count_miss: bool = True):
+        """Return (key, CachedMesh or None); key is None when caching is off.
+
+        With `count_miss=False` (meshing budget used up) only hits are
+        recorded, since a miss is retried next frame.
+        """
+        if self.mesh_cache is None:
+            return None, None
+        key = mesh_cache_key(chunk_obj, neighbors, self.mesher_name, self.vertex_format)
+        if not count_miss and key not in self.mesh_cache:
+            return key, None
+        return key, self.mesh_cache.get(key)
+
+    def _cache_store(self, key, verts, cols, packed) -> CachedMesh:
+        cached = CachedMesh(verts, cols, packed)
+        if key is not None:
+            self.mesh_cache.put(key, cached)
+        return cached
+
+    def _on_cache_evict(self, cached: CachedMesh) -> None:
+        self._release_gpu(cached.gpu)
+        cached.gpu = None
+
+    @staticmethod
+    def _acquire_gpu(handle):
+        if handle is not None:
+            handle["refs"] = handle.get("refs", 1) + 1
+        return handle
+
+    def _release_gpu(self, handle) -> None:
+        if handle is None:
+            return
+        handle["refs"] = handle.get("refs", 1) - 1
+        if handle["refs"] > 0:
+            return
+        vm = getattr(self.engine, "vbo_manager", None) if self.engine else None
+        if vm is not None:
+            vm.delete_vbo(handle)
+
+    def _on_chunk_unloaded(self, event) -> None:
+        """Release the GPU buffers of a chunk the ChunkManager dropped."""
+        entity = event.get("entity") if isinstance(event, dict) else None
+        mesh_comp = entity.get_component("mesh") if entity is not None else None
+        if mesh_comp is not None and mesh_comp.gpu is not None:
+            self._release_gpu(mesh_comp.gpu)
+            mesh_comp.gpu = None
+        if entity is not None:
+            self._in_flight.pop(entity, None)
+
+    def cache_stats(self) -> dict:
+        """Mesh cache counters (hits, misses, evictions, size, capacity, hit_rate)."""
+        if self.mesh_cache is None:
+            return {}
+        return self.mesh_cache.stats()
+
+    def _attach_mesh(self, entity, chunk_comp, cached: CachedMesh, key=None):
+        verts, cols, packed = cached.vertices, cached.colors, cached.packed
+        mesh_comp = entity.get_component("mesh")
+        # compute world-space origin from chunk coordinates and chunk size
+        chunk_obj = chunk_comp.chunk
+        origin = (
+            chunk_comp.position[0] * chunk_obj.size[0],
+            chunk_comp.position[1] * chunk_obj.size[1],
+            chunk_comp.position[2] * chunk_obj.size[2],
+        )
+        if not mesh_comp:
+            mesh_comp = MeshComponent(
+                vertices=verts, colors=cols, origin=origin, packed=packed
+            )
+            entity.add_component(mesh_comp)
+        else:
+            mesh_comp.vertices = verts
+            mesh_comp.colors = cols
+            mesh_comp.packed = packed
+            mesh_comp.origin = origin
+
+        # Share the cached GPU handle if there is one; otherwise the renderer
+        # uploads on mesh_generated (context required).
+        old_gpu = mesh_comp.gpu
+        mesh_comp.gpu = self._acquire_gpu(cached.gpu)
+        mesh_comp.mesh_id = key.hex() if key is not None else None
+        self._release_gpu(old_gpu)
+
+        chunk_comp.clear_dirty()
+        vert_count = packed.vertex_count if packed is not None else len(verts) // 3
+        log(
+            f"ChunkMeshSystem: Generated mesh for chunk {chunk_comp.position} (verts={vert_count})",
+            level="DEBUG",
+        )
+
+        # Emit event so renderers or VBO managers can upload the mesh when context is available.
+        # Empty meshes (e.g. all-air chunks) have nothing to upload.
+        try:
+            if self.event_system and mesh_comp.has_geometry():
+                self.event_system.emit("mesh_generated", {"entity": entity, "mesh": mesh_comp})
+        except Exception:
+            pass
+        # listeners upload synchronously when a GL context is up; keep that
+        # handle with the cache entry so duplicates can share it
+        if key is not None and cached.gpu is None and mesh_comp.gpu is not None:
+            cached.gpu = self._acquire_gpu(mesh_comp.gpu)
+        cm = getattr(self.engine, "chunk_manager", None) if self.engine else None
+        if cm is not None:
+            cm.account_chunk(chunk_comp.position)
+
+    @staticmethod
+    def _flush_dirty_borders(cm, chunk_obj, position):
+        # edits on a border change what the neighbour on that side can cull
+        if cm and chunk_obj.dirty_borders:
+            cm.invalidate_neighbors(position, chunk_obj.dirty_borders)
+        chunk_obj.dirty_borders.clear()
+
+    def pending_jobs(self) -> int:
+        """Number of mesh jobs currently running on the worker pool."""
+        return len(self._in_flight)
 
-                # Emit event so renderers or VBO managers can upload the mesh when context is available
-                try:
-                    if self.event_system:
-                        self.event_system.emit("mesh_generated", {"entity": entity, "mesh": mesh_comp})
-                except Exception:
-                    pass
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+        self._in_flight.clear()
+        if self.mesh_cache is not None:
+            self.mesh_cache.clear()
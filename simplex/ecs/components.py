@@ -3,12 +3,92 @@ Core ECS components for simplex-engine.
 Defines reusable components for common game entity needs.
 """
 
+import sys
+from array import array
+
 from simplex.ecs.ecs import Component
 
+_FLOAT_SIZE = sys.getsizeof(0.0)
+
+
+def _seq_nbytes(seq) -> int:
+    """Approximate bytes held by a vertex/colour sequence."""
+    if seq is None:
+        return 0
+    if isinstance(seq, array):
+        return len(seq) * seq.itemsize
+    nbytes = getattr(seq, "nbytes", None)  # NumPy arrays
+    if nbytes is not None:
+        return int(nbytes)
+    # a list of floats: its pointer array plus one float object per entry
+    return sys.getsizeof(seq) + len(seq) * _FLOAT_SIZE
+
+
+class _Column:
+    """Attribute kept on the component, or in a ColumnStore once the component is bound.
+
+    See simplex.ecs.soa; `axis` is the row of the component's store array.
+    """
 
-class PositionComponent(Component):
+    def __init__(self, axis: int):
+        self.axis = axis
+
+    def __set_name__(self, owner, name):
+        self.slot = "_" + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        store = obj._store
+        if store is None:
+            return obj.__dict__[self.slot]
+        return getattr(store, obj._array)[self.axis, obj._row]
+
+    def __set__(self, obj, value):
+        store = obj._store
+        if store is None:
+            obj.__dict__[self.slot] = value
+        else:
+            getattr(store, obj._array)[self.axis, obj._row] = value
+
+
+class _ColumnBacked(Component):
+    """Component whose three fields can live in a ColumnStore row (ECS(columns=True))."""
+
+    _array = ""
+    _fields = ()
+    _store = None
+    _row = -1
+
+    def bind(self, store, row: int) -> None:
+        """Move the field values into `store` at `row`; the component becomes a view."""
+        values = [getattr(self, name) for name in self._fields]
+        getattr(store, self._array)[:, row] = values
+        self._store, self._row = store, row
+
+    def unbind(self) -> None:
+        """Copy the values back out of the store."""
+        if self._store is None:
+            return
+        values = [float(getattr(self, name)) for name in self._fields]
+        self._store, self._row = None, -1
+        for name, value in zip(self._fields, values):
+            setattr(self, name, value)
+
+    @property
+    def bound(self) -> bool:
+        return self._store is not None
+
+
+class PositionComponent(_ColumnBacked):
     """Component for entity position in 3D space."""
 
+    _array = "position"
+    _fields = ("x", "y", "z")
+    x = _Column(0)
+    y = _Column(1)
+    z = _Column(2)
+
     def __init__(self, x=0.0, y=0.0, z=0.0):
         super().__init__("position")
         self.x = x
@@ -24,9 +104,15 @@ class PositionComponent(Component):
         self.x, self.y, self.z = value
 
 
-class VelocityComponent(Component):
+class VelocityComponent(_ColumnBacked):
     """Component for entity velocity in 3D space."""
 
+    _array = "velocity"
+    _fields = ("vx", "vy", "vz")
+    vx = _Column(0)
+    vy = _Column(1)
+    vz = _Column(2)
+
     def __init__(self, vx=0.0, vy=0.0, vz=0.0):
         super().__init__("velocity")
         self.vx = vx
@@ -65,6 +151,25 @@ class CollisionComponent(Component):
         self.is_static = mass == 0.0
 
 
+class VoxelColliderComponent(Component):
+    """Box that collides with the voxel world (see VoxelCollisionSystem).
+
+    The entity's position is the centre of the box's bottom face (its
+    feet); sizes are in blocks. The system keeps the vertical speed, the
+    ground contact and the last resolved position here.
+    """
+
+    def __init__(self, width=0.6, height=1.8, depth=0.6, gravity=True):
+        super().__init__("voxel_collider")
+        self.width = width
+        self.height = height
+        self.depth = depth
+        self.gravity = gravity
+        self.vy = 0.0
+        self.on_ground = False
+        self.last_position = None
+
+
 class InputComponent(Component):
     """Component for entities that respond to input."""
 
@@ -113,13 +218,24 @@ class ChunkComponent(Component):
         self.chunk = (
             chunk  # expected to be a simplex.voxel.chunk.Chunk instance or None
         )
-        self.dirty = True
+        self._dirty = True
+
+    @property
+    def dirty(self) -> bool:
+        """True when the component or its chunk data (e.g. block edits) needs re-meshing."""
+        return self._dirty or bool(getattr(self.chunk, "dirty", False))
+
+    @dirty.setter
+    def dirty(self, value: bool):
+        self._dirty = bool(value)
 
     def mark_dirty(self):
-        self.dirty = True
+        self._dirty = True
 
     def clear_dirty(self):
-        self.dirty = False
+        self._dirty = False
+        if self.chunk is not None:
+            self.chunk.mark_clean()
 
     def has_chunk(self) -> bool:
         return self.chunk is not None
@@ -133,8 +249,10 @@ class ChunkComponent(Component):
 class MeshComponent(Component):
     """Component that stores a generated mesh (vertices/colors) or a renderer handle.
 
-    vertices: flat list of floats (x,y,z) per vertex
-    colors: flat list of floats (r,g,b,a) per vertex
+    vertices: flat list (or float32 array) of floats (x,y,z) per vertex
+    colors: flat list (or float32 array) of floats (r,g,b,a) per vertex
+    packed: optional PackedMesh (indexed, interleaved bytes); when set the
+        float vertices/colors may be left empty
     mesh_id / gpu: optional renderer-side handle or dict with VBO info
     origin: world-space offset to apply when rendering (x,y,z)
     """
@@ -145,10 +263,33 @@ class MeshComponent(Component):
         colors=None,
         mesh_id: str | None = None,
         origin: tuple = (0, 0, 0),
+        packed=None,
     ):
         super().__init__("mesh")
-        self.vertices = vertices or []
-        self.colors = colors or []
+        self.vertices = vertices if vertices is not None else []
+        self.colors = colors if colors is not None else []
+        self.packed = packed
         self.mesh_id = mesh_id
         self.origin = tuple(origin)
         self.gpu = None  # renderer may attach {'vbo': int, 'count': int, ...}
+
+    def has_geometry(self) -> bool:
+        if self.packed is not None:
+            return self.packed.quad_count > 0
+        return self.vertices is not None and len(self.vertices) > 0
+
+    def cpu_nbytes(self) -> int:
+        """Approximate bytes held by the CPU-side mesh data."""
+        if self.packed is not None:
+            return self.packed.nbytes + _seq_nbytes(self.vertices) + _seq_nbytes(self.colors)
+        return _seq_nbytes(self.vertices) + _seq_nbytes(self.colors)
+
+    def gpu_nbytes(self) -> int:
+        """Bytes of the uploaded buffers (from the handle, else estimated from its count)."""
+        gpu = self.gpu
+        if not isinstance(gpu, dict):
+            return 0
+        if "nbytes" in gpu:
+            return int(gpu["nbytes"])
+        # float path: xyz + rgba float32 per vertex
+        return int(gpu.get("count", 0)) * 28
@@ -1,11 +1,46 @@
 """
 Enhanced ECS implementation for simplex-engine.
 Provides proper component management and system organization.
+
+Entities added to an ECS are grouped into archetypes, one per distinct
+set of component names, and the entity tells its ECS whenever that set
+changes. `ECS.query(*names)` caches, per name set, the archetypes that
+match and the resulting entity list; the list is rebuilt (in insertion
+order) only after an entity joins or leaves one of those archetypes, so
+steady-state queries cost nothing and a rebuild costs O(matches).
+`ECS.update` hands each system its cached query result.
+
+`ECS(columns=True)` additionally keeps positions and velocities in a
+struct-of-arrays ColumnStore (see simplex.ecs.soa).
+
+Every entity in an ECS has an integer id, a generational handle: the low
+32 bits are a slot index (reused after the entity is removed) and the
+high bits count how often that slot has been freed, so `ECS.get(id)`
+returns None for a handle whose entity is gone instead of whatever
+entity took over the slot. `ECS.entities` is kept compact by swapping
+the last entity into a removed one's place, so removal is O(1) and the
+list is in no particular order (queries still are). The name index is
+optional: `ECS(name_index=False)` allows duplicate names and makes
+`get_entity` a linear scan.
+
+`ECS(workers=N)` runs systems that declare their component access
+concurrently on N threads, and `ECS(verify_access=True)` checks those
+declarations instead (see simplex.ecs.scheduler).
+
+`ECS.enable_profiling()` (or `ECS(profile=True)`) times every system on
+each update, see simplex.ecs.profiler and `ECS.profile_stats()`.
 """
 
+from operator import attrgetter
+from time import perf_counter
+
 from .interface import ECSInterface
 from simplex.utils.logger import log
-from typing import Dict, List, Set, Optional
+from typing import Dict, FrozenSet, List, Set, Optional, Union
+
+# entity ids: slot index in the low bits, slot generation above
+_INDEX_BITS = 32
+_INDEX_MASK = (1 << _INDEX_BITS) - 1
 
 
 class Component:
@@ -25,6 +60,16 @@ class Entity:
         self.name = name
         self.components: Dict[str, Component] = {}
         self._component_types: Set[str] = set()
+        # owning ECS, its archetype there and insertion order (set by ECS.add_entity)
+        self._ecs: Optional["ECS"] = None
+        self._archetype: Optional["Archetype"] = None
+        self._seq = 0
+        # ColumnStore row while the owning ECS keeps columns, else -1
+        self._row = -1
+        # generational handle while in an ECS (see ECS.get), else None
+        self.id: Optional[int] = None
+        # index into the owning ECS's entities list
+        self._pos = -1
 
     def add_component(self, component: Component) -> None:
         """Add a component to this entity."""
@@ -32,8 +77,11 @@ class Entity:
             raise TypeError(f"Expected Component, got {type(component)}")
 
         log(f"Adding component {component.name} to entity {self.name}", level="DEBUG")
+        previous = self.components.get(component.name)
         self.components[component.name] = component
         self._component_types.add(component.name)
+        if self._ecs is not None:
+            self._ecs._component_added(self, component, previous)
 
     def get_component(self, name: str) -> Optional[Component]:
         """Get a component by name."""
@@ -52,6 +100,8 @@ class Entity:
         if name in self.components:
             component = self.components.pop(name)
             self._component_types.discard(name)
+            if self._ecs is not None:
+                self._ecs._component_removed(self, component)
             log(f"Removed component {name} from entity {self.name}", level="DEBUG")
             return component
         return None
@@ -64,12 +114,61 @@ class Entity:
         return f"Entity(name='{self.name}', components={list(self._component_types)})"
 
 
+class EntityList(list):
+    """Cached result of `ECS.query`: entities having all of `components`.
+
+    Shared between callers, so treat it as read-only.
+    """
+
+    __slots__ = ("components",)
+
+    def __init__(self, entities=(), components: FrozenSet[str] = frozenset()):
+        super().__init__(entities)
+        self.components = components
+
+
+class Archetype:
+    """The entities of an ECS that have exactly the component names `components`."""
+
+    __slots__ = ("components", "entities", "queries")
+
+    def __init__(self, components: FrozenSet[str]):
+        self.components = components
+        # dict as an insertion-ordered set
+        self.entities: Dict[Entity, None] = {}
+        self.queries: List["_Query"] = []
+
+
+class _Query:
+    __slots__ = ("components", "archetypes", "result")
+
+    def __init__(self, components: FrozenSet[str]):
+        self.components = components
+        self.archetypes: List[Archetype] = []
+        self.result: Optional[EntityList] = None
+
+
+_insertion_order = attrgetter("_seq")
+
+
 class System:
     """Base class for all systems with proper entity filtering."""
 
     def __init__(self, name: str):
         self.name = name
         self.required_components: List[str] = []
+        # the ECS this system was added to (set by ECS.add_system)
+        self.ecs: Optional["ECS"] = None
+        # component (or resource) names used, see simplex.ecs.scheduler;
+        # reads=None means undeclared: the system runs alone, in order
+        self.reads: Optional[Set[str]] = None
+        self.writes: Set[str] = set()
+
+    def access(self):
+        """(reads, writes) for this frame, or None when undeclared."""
+        if self.reads is None:
+            return None
+        return self.reads, self.writes
 
     def update(self, entities: List[Entity]) -> None:
         """Override in subclass to process entities."""
@@ -82,6 +181,8 @@ class System:
         """Filter entities that have all required components."""
         if not self.required_components:
             return entities
+        if isinstance(entities, EntityList) and entities.components.issuperset(self.required_components):
+            return entities
         return [
             entity
             for entity in entities
@@ -92,6 +193,10 @@ class System:
         """Override this method in subclasses instead of update()."""
         pass
 
+    def shutdown(self) -> None:
+        """Release resources held by the system (worker pools, handles)."""
+        pass
+
     def __repr__(self):
         return f"System(name='{self.name}', required_components={self.required_components})"
 
@@ -99,27 +204,80 @@ class System:
 class ECS(ECSInterface):
     """Enhanced ECS core implementation with proper system management."""
 
-    def __init__(self, event_system=None):
+    def __init__(
+        self,
+        event_system=None,
+        columns: bool = False,
+        name_index: bool = True,
+        workers: int = 0,
+        verify_access: bool = False,
+        profile: bool = False,
+    ):
         self.event_system = event_system
+        # struct-of-arrays positions/velocities (simplex.ecs.soa), opt-in
+        self.columns = None
+        if columns:
+            from .soa import ColumnStore
+
+            self.columns = ColumnStore()
         self.entities: List[Entity] = []
         self.systems: List[System] = []
-        self._entity_lookup: Dict[str, Entity] = {}
+        # name -> entity; None when names need not be unique
+        self._entity_lookup: Optional[Dict[str, Entity]] = {} if name_index else None
+        # id slots: entity (or None when free) and generation per index
+        self._slots: List[Optional[Entity]] = []
+        self._generations: List[int] = []
+        self._free_slots: List[int] = []
+        self._archetypes: Dict[FrozenSet[str], Archetype] = {}
+        self._queries: Dict[FrozenSet[str], _Query] = {}
+        self._next_seq = 0
+        # bumped whenever an entity changes archetype (or joins/leaves)
+        self._structure_version = 0
+        self.system_scheduler = None
+        if workers or verify_access:
+            from .scheduler import SystemScheduler
+
+            self.system_scheduler = SystemScheduler(self, workers, verify=verify_access)
+        # per-system timings (simplex.ecs.profiler), opt-in
+        self.profiler = None
+        if profile:
+            self.enable_profiling()
         log("ECS created", level="INFO")
 
-    def add_entity(self, entity) -> None:
-        """Add an entity to the ECS."""
+    def add_entity(self, entity) -> Entity:
+        """Add an entity to the ECS and return it; its handle is `entity.id`."""
         if isinstance(entity, str):
             entity = Entity(entity)
         elif not isinstance(entity, Entity):
             raise TypeError(f"Expected Entity or str, got {type(entity)}")
 
-        if entity.name in self._entity_lookup:
-            log(f"Entity {entity.name} already exists, replacing", level="WARNING")
-            self.remove_entity(entity.name)
+        if entity._ecs is not None:
+            entity._ecs.remove_entity(entity)
+        lookup = self._entity_lookup
+        if lookup is not None:
+            if entity.name in lookup:
+                log(f"Entity {entity.name} already exists, replacing", level="WARNING")
+                self.remove_entity(lookup[entity.name])
+            lookup[entity.name] = entity
 
         log(f"Adding entity: {entity.name}", level="DEBUG")
+        if self._free_slots:
+            index = self._free_slots.pop()
+            self._slots[index] = entity
+        else:
+            index = len(self._slots)
+            self._slots.append(entity)
+            self._generations.append(0)
+        entity.id = index | (self._generations[index] << _INDEX_BITS)
+        entity._pos = len(self.entities)
         self.entities.append(entity)
-        self._entity_lookup[entity.name] = entity
+        entity._ecs = self
+        entity._seq = self._next_seq
+        self._next_seq += 1
+        self._place(entity)
+        if self.columns is not None:
+            self._bind_columns(entity)
+        return entity
 
     def add_system(self, system) -> None:
         """Add a system to the ECS."""
@@ -129,47 +287,225 @@ class ECS(ECSInterface):
             raise TypeError(f"Expected System or str, got {type(system)}")
 
         log(f"Adding system: {system.name}", level="INFO")
+        system.ecs = self
         self.systems.append(system)
 
-    def remove_entity(self, name: str) -> Optional[Entity]:
-        """Remove an entity by name."""
-        if name in self._entity_lookup:
-            entity = self._entity_lookup.pop(name)
-            self.entities.remove(entity)
-            log(f"Removed entity: {name}", level="DEBUG")
-            return entity
+    def remove_entity(self, entity: Union[str, int, Entity]) -> Optional[Entity]:
+        """Remove an entity given by name, id or the entity itself (O(1) except by name without the index)."""
+        if isinstance(entity, str):
+            entity = self.get_entity(entity)
+        elif isinstance(entity, int):
+            entity = self.get(entity)
+        if entity is None or entity._ecs is not self:
+            return None
+
+        # swap the last entity into the freed place
+        last = self.entities.pop()
+        if last is not entity:
+            self.entities[entity._pos] = last
+            last._pos = entity._pos
+        lookup = self._entity_lookup
+        if lookup is not None and lookup.get(entity.name) is entity:
+            del lookup[entity.name]
+        index = entity.id & _INDEX_MASK
+        self._slots[index] = None
+        self._generations[index] += 1
+        self._free_slots.append(index)
+        self._unplace(entity)
+        self._unbind_columns(entity)
+        entity._ecs = None
+        entity.id = None
+        entity._pos = -1
+        log(f"Removed entity: {entity.name}", level="DEBUG")
+        return entity
+
+    def get(self, entity_id: int) -> Optional[Entity]:
+        """The entity with handle `entity_id`, or None once it has been removed."""
+        index = entity_id & _INDEX_MASK
+        if index < len(self._slots) and self._generations[index] == entity_id >> _INDEX_BITS:
+            return self._slots[index]
         return None
 
+    def is_alive(self, entity_id: int) -> bool:
+        return self.get(entity_id) is not None
+
     def update(self) -> None:
         """Run all systems on filtered entities."""
-        for system in self.systems:
-            log(f"Running system: {system.name}", level="DEBUG")
-            try:
-                system.update(self.entities)
-            except Exception as e:
-                log(f"Error in system {system.name}: {e}", level="ERROR")
-                if self.event_system:
-                    self.event_system.emit(
-                        "system_error", {"system": system.name, "error": str(e)}
-                    )
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin_frame()
+        if self.system_scheduler is not None:
+            self.system_scheduler.run(self.systems)
+        else:
+            for system in self.systems:
+                self._run_system(system)
+        if profiler is not None:
+            profiler.end_frame(len(self.entities))
+
+    def enable_profiling(self, window: int = 300, budget_ms: Optional[float] = None):
+        """Start timing systems over the last `window` frames; returns the SystemProfiler."""
+        from .profiler import SystemProfiler
+
+        self.profiler = SystemProfiler(window, budget_ms)
+        return self.profiler
+
+    def disable_profiling(self) -> None:
+        self.profiler = None
+
+    def profile_stats(self) -> dict:
+        """SystemProfiler.stats(), or {} while profiling is off."""
+        return self.profiler.stats() if self.profiler is not None else {}
+
+    def _entities_for(self, system: System) -> List[Entity]:
+        if system.required_components:
+            return self.query(*system.required_components)
+        return self.entities
+
+    def _run_system(self, system: System) -> None:
+        log(f"Running system: {system.name}", level="DEBUG")
+        entities = self._entities_for(system)
+        start = perf_counter()
+        error = None
+        try:
+            system.update(entities)
+        except Exception as e:
+            error = e
+        if self.profiler is not None:
+            self.profiler.record(system.name, (perf_counter() - start) * 1000.0, len(entities))
+        if error is not None:
+            self._report_system_error(system, error)
+
+    def _report_system_error(self, system: System, error: BaseException) -> None:
+        log(f"Error in system {system.name}: {error}", level="ERROR")
+        if self.event_system:
+            self.event_system.emit(
+                "system_error", {"system": system.name, "error": str(error)}
+            )
 
     def get_entities_with(self, *component_names: str) -> List[Entity]:
-        """Get entities that have all specified components."""
-        return [
-            entity
-            for entity in self.entities
-            if entity.has_components(*component_names)
-        ]
+        """Get entities that have all specified components (a new list)."""
+        return list(self.query(*component_names))
+
+    def query(self, *component_names: str) -> List[Entity]:
+        """Entities that have all specified components, in insertion order.
+
+        Returns a cached EntityList shared with other callers (all entities
+        when no names are given); do not modify it.
+        """
+        if not component_names:
+            return self.entities
+        key = frozenset(component_names)
+        query = self._queries.get(key)
+        if query is None:
+            query = self._queries[key] = _Query(key)
+            for archetype in self._archetypes.values():
+                if key <= archetype.components:
+                    query.archetypes.append(archetype)
+                    archetype.queries.append(query)
+        if query.result is None:
+            entities = [entity for archetype in query.archetypes for entity in archetype.entities]
+            # archetypes hold entities in the order they joined; mostly sorted already
+            entities.sort(key=_insertion_order)
+            query.result = EntityList(entities, key)
+        return query.result
+
+    def archetypes(self) -> List[Archetype]:
+        """Non-empty archetypes, for inspection and debugging."""
+        return [archetype for archetype in self._archetypes.values() if archetype.entities]
+
+    def _place(self, entity: Entity) -> None:
+        key = frozenset(entity._component_types)
+        archetype = self._archetypes.get(key)
+        if archetype is None:
+            archetype = self._archetypes[key] = Archetype(key)
+            for query in self._queries.values():
+                if query.components <= key:
+                    query.archetypes.append(archetype)
+                    archetype.queries.append(query)
+        archetype.entities[entity] = None
+        self._structure_version += 1
+        entity._archetype = archetype
+        for query in archetype.queries:
+            query.result = None
+
+    def _unplace(self, entity: Entity) -> None:
+        archetype = entity._archetype
+        if archetype is None:
+            return
+        del archetype.entities[entity]
+        entity._archetype = None
+        self._structure_version += 1
+        for query in archetype.queries:
+            query.result = None
+
+    def _component_added(self, entity: Entity, component: Component, previous: Optional[Component]) -> None:
+        if previous is None:
+            self._unplace(entity)
+            self._place(entity)
+        if self.columns is not None:
+            if previous is not None and previous is not component:
+                self._unbind_component(previous)
+            self._bind_columns(entity)
+
+    def _component_removed(self, entity: Entity, component: Component) -> None:
+        self._unplace(entity)
+        self._place(entity)
+        if self.columns is not None:
+            self._unbind_component(component)
+            if not any(self._columnar(c) for c in entity.components.values()):
+                self._unbind_columns(entity)
+
+    @staticmethod
+    def _columnar(component: Component) -> bool:
+        # components.PositionComponent / VelocityComponent (name of their store array)
+        return bool(getattr(component, "_array", ""))
+
+    def _bind_columns(self, entity: Entity) -> None:
+        for component in entity.components.values():
+            if self._columnar(component) and component._store is None:
+                if entity._row < 0:
+                    entity._row = self.columns.allocate()
+                component.bind(self.columns, entity._row)
+
+    def _unbind_component(self, component: Component) -> None:
+        if self._columnar(component) and component._store is self.columns:
+            component.unbind()
+
+    def _unbind_columns(self, entity: Entity) -> None:
+        if self.columns is None or entity._row < 0:
+            return
+        for component in entity.components.values():
+            self._unbind_component(component)
+        self.columns.release(entity._row)
+        entity._row = -1
 
     def get_entity(self, name: str) -> Optional[Entity]:
-        """Get entity by name (O(1) lookup)."""
-        return self._entity_lookup.get(name)
+        """Get entity by name (O(1) with the name index, else the first match)."""
+        if self._entity_lookup is not None:
+            return self._entity_lookup.get(name)
+        for entity in self.entities:
+            if entity.name == name:
+                return entity
+        return None
 
     def clear(self) -> None:
         """Clear all entities and systems."""
+        for entity in self.entities:
+            self._unbind_columns(entity)
+            entity._ecs = None
+            entity._archetype = None
+            entity.id = None
+            entity._pos = -1
         self.entities.clear()
         self.systems.clear()
-        self._entity_lookup.clear()
+        if self._entity_lookup is not None:
+            self._entity_lookup.clear()
+        # bump every generation so that no handle from before resolves again
+        self._generations = [generation + 1 for generation in self._generations]
+        self._slots = [None] * len(self._generations)
+        self._free_slots = list(range(len(self._slots) - 1, -1, -1))
+        self._archetypes.clear()
+        self._queries.clear()
         log("ECS cleared", level="INFO")
 
     def get_system(self, name: str) -> Optional[System]:
@@ -181,6 +517,13 @@ class ECS(ECSInterface):
 
     def shutdown(self) -> None:
         """Clean shutdown of ECS."""
+        for system in self.systems:
+            try:
+                system.shutdown()
+            except Exception as e:
+                log(f"Error shutting down system {system.name}: {e}", level="ERROR")
+        if self.system_scheduler is not None:
+            self.system_scheduler.shutdown()
         self.clear()
         log("ECS shutdown", level="INFO")
 
@@ -0,0 +1,119 @@
+"""
+Per-system timings for `ECS.update` (opt-in, see `ECS.enable_profiling`).
+
+For every system the profiler keeps the wall time and the number of
+entities it was handed for each of the last `window` calls, plus a
+total call count. `stats()` reports p50/p95/p99 over that window, so a
+system that is usually cheap but spikes every few seconds shows up in
+p99 even when its average looks harmless. The whole `ECS.update` is
+recorded the same way under `frame`. With `budget_ms`, every frame that
+goes over the budget is charged to its slowest system (`over_budget`),
+which answers "who blew the frame".
+
+Systems that the scheduler runs concurrently are timed on their own
+thread, so their times can add up to more than the frame.
+"""
+
+import math
+from collections import deque
+from time import perf_counter
+from typing import Deque, Dict, List, Optional, Tuple
+
+
+def percentile(ordered, p: float) -> float:
+    """Nearest-rank percentile of an ascending sequence (0.0 when empty)."""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(p / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class _Series:
+    __slots__ = ("ms", "entities", "calls", "over_budget")
+
+    def __init__(self, window: int):
+        self.ms: Deque[float] = deque(maxlen=window)
+        self.entities: Deque[int] = deque(maxlen=window)
+        self.calls = 0
+        self.over_budget = 0
+
+    def stats(self) -> dict:
+        ms = sorted(self.ms)
+        entities = sorted(self.entities)
+        return {
+            "calls": self.calls,
+            "last_ms": self.ms[-1] if self.ms else 0.0,
+            "p50_ms": percentile(ms, 50),
+            "p95_ms": percentile(ms, 95),
+            "p99_ms": percentile(ms, 99),
+            "max_ms": ms[-1] if ms else 0.0,
+            "entities": self.entities[-1] if self.entities else 0,
+            "entities_p50": percentile(entities, 50),
+            "entities_max": entities[-1] if entities else 0,
+            "over_budget": self.over_budget,
+        }
+
+
+class SystemProfiler:
+    def __init__(self, window: int = 300, budget_ms: Optional[float] = None):
+        self.window = max(1, int(window))
+        self.budget_ms = float(budget_ms) if budget_ms else None
+        self.frames = 0
+        self._frame = _Series(self.window)
+        self._systems: Dict[str, _Series] = {}
+        # (name, ms) of the systems recorded since the last end_frame
+        self._current: List[Tuple[str, float]] = []
+        self._start = 0.0
+
+    def begin_frame(self) -> None:
+        self._current.clear()
+        self._start = perf_counter()
+
+    def record(self, name: str, ms: float, entities: int = 0) -> None:
+        series = self._systems.get(name)
+        if series is None:
+            series = self._systems[name] = _Series(self.window)
+        series.ms.append(ms)
+        series.entities.append(entities)
+        series.calls += 1
+        self._current.append((name, ms))
+
+    def end_frame(self, entities: int = 0) -> float:
+        """Close the frame started by begin_frame; returns its duration in ms."""
+        ms = (perf_counter() - self._start) * 1000.0
+        self._frame.ms.append(ms)
+        self._frame.entities.append(entities)
+        self._frame.calls += 1
+        self.frames += 1
+        if self.budget_ms is not None and ms > self.budget_ms and self._current:
+            self._frame.over_budget += 1
+            slowest = max(self._current, key=lambda item: item[1])[0]
+            self._systems[slowest].over_budget += 1
+        return ms
+
+    def stats(self) -> dict:
+        """{"frames", "window", "budget_ms", "frame": {...}, "systems": {name: {...}}}.
+
+        Each entry has calls, last/p50/p95/p99/max milliseconds, the
+        entity count of the last call with its p50 and max, and
+        over_budget. For "frame" the entity figures are the ECS's size.
+        """
+        return {
+            "frames": self.frames,
+            "window": self.window,
+            "budget_ms": self.budget_ms,
+            "frame": self._frame.stats(),
+            "systems": {name: series.stats() for name, series in self._systems.items()},
+        }
+
+    def slowest(self, limit: int = 5, key: str = "p99_ms") -> List[Tuple[str, dict]]:
+        """The `limit` systems with the highest `key`, highest first."""
+        systems = self.stats()["systems"]
+        ranked = sorted(systems.items(), key=lambda item: item[1][key], reverse=True)
+        return ranked[:limit]
+
+    def reset(self) -> None:
+        self.frames = 0
+        self._frame = _Series(self.window)
+        self._systems.clear()
+        self._current.clear()
@@ -0,0 +1,232 @@
+"""
+Run ECS systems concurrently from their declared component access.
+
+A system declares what it touches with `reads` and `writes`, sets of
+component names. Any other shared state a system uses (the voxel world,
+the event system) can be named the same way, e.g. "world" or "events".
+Every declared system implicitly reads the ECS's entity structure. A
+system that adds or removes entities or components must write
+`STRUCTURE`, which makes it run alone. A system whose access changes
+from frame to frame can override `System.access()` instead. Systems
+that declare nothing (`reads` is None) keep the old behaviour: they run
+on the calling thread, after every system before them and before every
+system after them.
+
+Each frame `SystemScheduler.run` builds a dependency graph in
+registration order. A system depends on every earlier system it
+conflicts with: one of them writes something the other reads or
+writes. Systems whose dependencies are done run on a thread pool, so
+systems that release the GIL (NumPy batches, meshing) overlap. Systems
+that conflict always run in registration order, and systems that do
+not conflict cannot observe each other, so the result does not depend
+on thread timing.
+
+With `verify=True` systems run one at a time in registration order, and
+each declared system is checked against its declaration: the
+components it fetched with `Entity.get_component`, the components whose
+attributes or objects changed, and whether the entity structure
+changed. Mismatches are logged and kept in `violations`.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from time import perf_counter
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from simplex.ecs.ecs import Entity
+from simplex.utils.logger import log
+
+# access name for adding or removing entities and components
+STRUCTURE = "entities"
+
+
+class _Node:
+    __slots__ = ("index", "system", "reads", "writes", "deps", "dependents")
+
+    def __init__(self, index: int, system, access: Optional[Tuple[FrozenSet[str], FrozenSet[str]]]):
+        self.index = index
+        self.system = system
+        if access is None:
+            self.reads = self.writes = None
+        else:
+            reads, writes = access
+            self.writes = frozenset(writes)
+            self.reads = frozenset(reads) | frozenset(system.required_components) | {STRUCTURE}
+        self.deps: List[int] = []
+        self.dependents: List[int] = []
+
+    @property
+    def declared(self) -> bool:
+        return self.writes is not None
+
+    def conflicts(self, other: "_Node") -> bool:
+        if not (self.declared and other.declared):
+            return True
+        return bool(
+            self.writes & other.reads or self.writes & other.writes or other.writes & self.reads
+        )
+
+
+class SystemScheduler:
+    """Run an ECS's systems on `workers` threads (see module docstring)."""
+
+    def __init__(self, ecs, workers: int = 0, verify: bool = False):
+        self.ecs = ecs
+        self.workers = max(0, int(workers))
+        self.verify = bool(verify)
+        # (system name, kind, access name); kind is "read", "write" or "structure"
+        self.violations: List[Tuple[str, str, str]] = []
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def plan(self, systems) -> List[_Node]:
+        """The frame's dependency graph: one node per system, in registration order."""
+        nodes = [_Node(i, system, system.access()) for i, system in enumerate(systems)]
+        for node in nodes:
+            for earlier in nodes[: node.index]:
+                if node.conflicts(earlier):
+                    node.deps.append(earlier.index)
+                    earlier.dependents.append(node.index)
+        return nodes
+
+    def stages(self, systems) -> List[List[str]]:
+        """System names grouped by dependency depth (systems in a stage may overlap)."""
+        nodes = self.plan(systems)
+        depth: List[int] = []
+        for node in nodes:
+            depth.append(1 + max((depth[i] for i in node.deps), default=-1))
+        grouped: Dict[int, List[str]] = {}
+        for node, d in zip(nodes, depth):
+            grouped.setdefault(d, []).append(node.system.name)
+        return [grouped[d] for d in sorted(grouped)]
+
+    def run(self, systems) -> None:
+        if self.verify:
+            for system in systems:
+                self._run_verified(system)
+            return
+        if self.workers == 0:
+            for system in systems:
+                self.ecs._run_system(system)
+            return
+
+        nodes = self.plan(systems)
+        waiting = [len(node.deps) for node in nodes]
+        ready = [node.index for node in nodes if not node.deps]
+        running: Dict[object, int] = {}
+        counts = [0] * len(nodes)
+        profiler = self.ecs.profiler
+
+        def finish(index: int, error: Optional[BaseException], ms: float) -> None:
+            if profiler is not None:
+                profiler.record(nodes[index].system.name, ms, counts[index])
+            if error is not None:
+                self.ecs._report_system_error(nodes[index].system, error)
+            for dependent in nodes[index].dependents:
+                waiting[dependent] -= 1
+                if not waiting[dependent]:
+                    ready.append(dependent)
+
+        while ready or running:
+            ready.sort()
+            while ready:
+                node = nodes[ready.pop(0)]
+                entities = self.ecs._entities_for(node.system)
+                counts[node.index] = len(entities)
+                # undeclared systems, and a lone ready system, run on this thread
+                if not node.declared or (not running and not ready):
+                    finish(node.index, *self._call(node.system, entities))
+                    break
+                running[self._executor().submit(self._call, node.system, entities)] = node.index
+            else:
+                if running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for index, future in sorted((running.pop(f), f) for f in done):
+                        finish(index, *future.result())
+
+    @staticmethod
+    def _call(system, entities) -> Tuple[Optional[BaseException], float]:
+        """Run one system; returns (error or None, wall time in ms)."""
+        start = perf_counter()
+        error = None
+        try:
+            system.update(entities)
+        except Exception as e:
+            error = e
+        return error, (perf_counter() - start) * 1000.0
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ecs-system")
+        return self._pool
+
+    def _run_verified(self, system) -> None:
+        access = system.access()
+        if access is None:
+            self.ecs._run_system(system)
+            return
+        node = _Node(0, system, access)
+        allowed = node.reads | node.writes
+        fetched = set()
+        before = _snapshot(self.ecs)
+        version = self.ecs._structure_version
+        # record component reads for this system only
+        get_component = Entity.get_component
+
+        def probed(entity, name):
+            fetched.add(name)
+            return get_component(entity, name)
+
+        Entity.get_component = probed
+        try:
+            self.ecs._run_system(system)
+        finally:
+            Entity.get_component = get_component
+        found = [("read", name) for name in sorted(fetched - allowed)]
+        found += [("write", name) for name in sorted(_changed(before) - node.writes)]
+        if self.ecs._structure_version != version and STRUCTURE not in node.writes:
+            found.append(("structure", STRUCTURE))
+        for kind, name in found:
+            log(f"System {system.name} {kind}s undeclared '{name}'", level="WARNING")
+            self.violations.append((system.name, kind, name))
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+
+def _state(component) -> dict:
+    state = dict(vars(component))
+    if getattr(component, "_store", None) is not None:
+        # column-backed: the values live in the ColumnStore
+        state.update((name, getattr(component, name)) for name in component._fields)
+    return state
+
+
+def _snapshot(ecs) -> list:
+    return [
+        (entity, name, component, _state(component))
+        for entity in ecs.entities
+        for name, component in entity.components.items()
+    ]
+
+
+def _same(a, b) -> bool:
+    if a is b:
+        return True
+    try:
+        return bool(a == b)
+    except Exception:  # e.g. comparing NumPy arrays
+        return False
+
+
+def _changed(snapshot) -> set:
+    """Names of the components in `snapshot` that were replaced or modified since."""
+    changed = set()
+    for entity, name, component, state in snapshot:
+        if entity.components.get(name) is not component:
+            changed.add(name)
+            continue
+        now = _state(component)
+        if now.keys() != state.keys() or not all(_same(state[k], now[k]) for k in state):
+            changed.add(name)
+    return changed
@@ -0,0 +1,75 @@
+"""
+Struct-of-arrays storage for position and velocity components (opt-in).
+
+With `ECS(columns=True)` every entity that has a position or a velocity
+gets a row in a ColumnStore, stable for as long as the entity stays in
+that ECS (rows of removed entities are reused). `position` and
+`velocity` are (3, capacity) float64 arrays, so `position[0]` is the
+contiguous x column. The entity's PositionComponent / VelocityComponent
+objects stay in place but become views: reading or writing `.x` goes
+to the column. Systems can then work on every row at once, e.g.
+MovementSystem integrates all movers with one array expression.
+Requires NumPy.
+"""
+
+from typing import Dict, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class ColumnStore:
+    def __init__(self, capacity: int = 1024):
+        if np is None:
+            raise RuntimeError("numpy not available")
+        capacity = max(1, int(capacity))
+        self.position = np.zeros((3, capacity), dtype=np.float64)
+        self.velocity = np.zeros((3, capacity), dtype=np.float64)
+        self._free: List[int] = []
+        self._next = 0
+        # query key -> (EntityList it was built from, rows)
+        self._rows: Dict[frozenset, Tuple[list, "np.ndarray"]] = {}
+
+    @property
+    def capacity(self) -> int:
+        return self.position.shape[1]
+
+    def __len__(self) -> int:
+        return self._next - len(self._free)
+
+    def allocate(self) -> int:
+        """Reserve a zeroed row and return its index."""
+        if self._free:
+            return self._free.pop()
+        if self._next == self.capacity:
+            self._grow()
+        row = self._next
+        self._next += 1
+        return row
+
+    def release(self, row: int) -> None:
+        self.position[:, row] = 0.0
+        self.velocity[:, row] = 0.0
+        self._free.append(row)
+
+    def _grow(self) -> None:
+        extra = self.capacity
+        self.position = np.concatenate([self.position, np.zeros((3, extra))], axis=1)
+        self.velocity = np.concatenate([self.velocity, np.zeros((3, extra))], axis=1)
+
+    def rows(self, entities) -> "np.ndarray":
+        """Row indices of `entities` (bound entities, e.g. an ECS.query result).
+
+        Cached for ECS.query results until the query's entity set changes.
+        """
+        key = getattr(entities, "components", None)
+        if key is not None:
+            cached = self._rows.get(key)
+            if cached is not None and cached[0] is entities:
+                return cached[1]
+        rows = np.fromiter((entity._row for entity in entities), dtype=np.intp, count=len(entities))
+        if key is not None:
+            self._rows[key] = (entities, rows)
+        return rows
@@ -3,7 +3,7 @@ Core ECS systems for simplex-engine.
 Defines reusable systems for common game logic with proper component filtering.
 """
 
-from simplex.ecs.ecs import System
+from simplex.ecs.ecs import EntityList, System
 from simplex.utils.logger import log
 
 
@@ -15,9 +15,15 @@ class MovementSystem(System):
         self.event_system = event_system
         self.bounds_width, self.bounds_height = bounds
         self.required_components = ["position", "velocity"]
+        self.reads = {"collision"}
+        self.writes = {"position", "velocity"}
 
     def _process_entities(self, entities):
         """Update positions based on velocities for entities with both components."""
+        columns = self.ecs.columns if self.ecs is not None else None
+        if columns is not None and isinstance(entities, EntityList):
+            self._integrate_columns(columns, entities)
+            return
         for entity in entities:
             position_comp = entity.get_component("position")
             velocity_comp = entity.get_component("velocity")
@@ -45,6 +51,25 @@ class MovementSystem(System):
                     level="DEBUG",
                 )
 
+    def _integrate_columns(self, columns, entities):
+        """Move every entity at once through the ECS's ColumnStore."""
+        rows = columns.rows(entities)
+        columns.position[:, rows] += columns.velocity[:, rows]
+        log(f"MovementSystem: Updated {len(rows)} positions", level="DEBUG")
+        # keep paddles within bounds (same rule as the per-entity path)
+        for entity in self.ecs.query("position", "velocity", "collision"):
+            if "ball" in entity.name.lower():
+                continue
+            position_comp = entity.get_component("position")
+            velocity_comp = entity.get_component("velocity")
+            half_height = entity.get_component("collision").height / 2
+            if position_comp.y - half_height < 0:
+                position_comp.y = half_height
+                velocity_comp.vy = 0
+            elif position_comp.y + half_height > self.bounds_height:
+                position_comp.y = self.bounds_height - half_height
+                velocity_comp.vy = 0
+
 
 class CollisionSystem(System):
     """System that handles collision detection and response."""
@@ -54,6 +79,8 @@ class CollisionSystem(System):
         self.event_system = event_system
         self.bounds_width, self.bounds_height = bounds
         self.required_components = ["position", "collision"]
+        self.reads = set()
+        self.writes = {"position", "velocity", "events"}
 
     def _process_entities(self, entities):
         """Check for collisions between entities and boundaries."""
@@ -158,6 +185,8 @@ class InputSystem(System):
         self.bounds_width, self.bounds_height = bounds
         self.input_state = {}
         self.required_components = ["input", "velocity"]
+        self.reads = {"position"}
+        self.writes = {"velocity"}
 
         # Register for input events
         if self.event_system:
@@ -168,6 +197,9 @@ class InputSystem(System):
         filtered = self._filter_entities(entities)
         if not filtered:
             return
+        # the ECS passes only matching entities; the ball has no input component
+        if self.ecs is not None:
+            entities = self.ecs.entities
         for entity in filtered:
             input_comp = entity.get_component("input")
             velocity_comp = entity.get_component("velocity")
@@ -263,6 +295,8 @@ class ScoringSystem(System):
         self.required_components = [
             "position"
         ]  # Only need position to check for scoring
+        self.reads = set()
+        self.writes = {"position", "velocity", "events"}
 
     def _process_entities(self, entities):
         """Check for scoring conditions among ball entities."""
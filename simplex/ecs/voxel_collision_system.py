@@ -1,30 +1,48 @@
-"""Voxel grid collision and gravity for the player."""
+"""Voxel grid collision and gravity for every entity with a voxel collider.
 
+Each frame the system takes the displacement other systems applied to an
+entity since its last resolved position, adds gravity, and sweeps the
+entity's box through the grid for all entities at once
+(simplex.world.collision.sweep_boxes). An entity named "Player" without
+a collider gets a default player-sized one.
+"""
+
+import math
+
+from simplex.ecs.components import VoxelColliderComponent
 from simplex.ecs.ecs import System
+from simplex.ecs.scheduler import STRUCTURE
 from simplex.ecs.systems import InputSystem
-from simplex.world.world_query import (
-    feet_on_ground,
-    find_ground_height,
-    is_solid_at_world,
-)
+from simplex.world.collision import sweep_boxes
+from simplex.world.world_query import accessor_for
 
 
 class VoxelCollisionSystem(System):
-    """Keep the player on terrain with gravity and simple horizontal blocking."""
+    """Keep colliders out of solid voxels, with gravity and jumping for the player."""
 
     PLAYER_HEIGHT = 1.8
     PLAYER_RADIUS = 0.3
     GRAVITY = 24.0
     JUMP_SPEED = 8.0
+    MAX_FALL_SPEED = 60.0
+    # longer moves between two frames are teleports and are not swept
+    TELEPORT_DISTANCE = 16.0
 
     def __init__(self, event_system=None, engine=None):
         super().__init__("voxel_collision")
         self.event_system = event_system
         self.engine = engine
-        self.required_components = ["position"]
-        self._on_ground: dict[str, bool] = {}
+        self.required_components = ["position", "voxel_collider"]
+        self.reads = {"world"}
+        self.writes = {"position", "voxel_collider"}
         self._input_system = None
-        self._last_pos: dict[str, tuple] = {}
+
+    def access(self):
+        # attaching the player's collider changes the entity structure
+        player = self.ecs.get_entity("Player") if self.ecs is not None else None
+        if player is not None and not player.has_component("voxel_collider"):
+            return self.reads, self.writes | {STRUCTURE}
+        return self.reads, self.writes
 
     def _get_input_system(self):
         if self._input_system is not None:
@@ -45,69 +63,67 @@ class VoxelCollisionSystem(System):
             return float(self.engine._last_delta_time)
         return 1.0 / 60.0
 
+    def update(self, entities):
+        if self.ecs is not None:
+            player = self.ecs.get_entity("Player")
+        else:
+            player = next((entity for entity in entities if entity.name == "Player"), None)
+        if (
+            player is not None
+            and player.has_component("position")
+            and not player.has_component("voxel_collider")
+        ):
+            r = self.PLAYER_RADIUS
+            player.add_component(VoxelColliderComponent(2 * r, self.PLAYER_HEIGHT, 2 * r))
+            if self.ecs is not None:
+                # the query result we were given predates the new component
+                entities = self.ecs.query(*self.required_components)
+        super().update(entities)
+
     def _process_entities(self, entities):
         cm = getattr(self.engine, "chunk_manager", None) if self.engine else None
         if cm is None:
             return
+        world = accessor_for(cm)
 
         input_sys = self._get_input_system()
         input_state = getattr(input_sys, "input_state", {}) if input_sys else {}
+        jump = bool(input_state.get("SPACE") or input_state.get("JUMP"))
         dt = self._delta_time()
 
-        for entity in entities:
-            if entity.name != "Player":
-                continue
-
-            pos = entity.get_component("position")
-            if not pos:
-                continue
-
-            on_ground = self._on_ground.get(entity.name, False)
-
-            if input_state.get("SPACE") or input_state.get("JUMP"):
-                if on_ground:
-                    pos.y += self.JUMP_SPEED * dt
-                    on_ground = False
-
-            if not on_ground:
-                pos.y -= self.GRAVITY * dt
-
-            if on_ground and feet_on_ground(cm, pos.x, pos.y, pos.z):
-                pass
-            else:
-                ground_y = find_ground_height(
-                    cm, pos.x, pos.y, pos.z, self.PLAYER_RADIUS
-                )
-                if ground_y is not None and pos.y <= ground_y:
-                    pos.y = ground_y
-                    on_ground = True
-                elif not feet_on_ground(cm, pos.x, pos.y, pos.z):
-                    on_ground = False
-
-            current = (pos.x, pos.y, pos.z)
-            if current != self._last_pos.get(entity.name):
-                self._resolve_horizontal(cm, pos)
-                self._last_pos[entity.name] = current
-
-            head_y = pos.y + self.PLAYER_HEIGHT
-            if is_solid_at_world(cm, pos.x, head_y, pos.z):
-                pos.y -= 0.1
-
-            self._on_ground[entity.name] = on_ground
-
-    def _resolve_horizontal(self, chunk_manager, pos):
-        """Block horizontal movement into solid voxels at body height."""
-        body_y = pos.y + self.PLAYER_HEIGHT * 0.5
-        r = self.PLAYER_RADIUS
-        checks = (
-            (pos.x + r, body_y, pos.z),
-            (pos.x - r, body_y, pos.z),
-            (pos.x, body_y, pos.z + r),
-            (pos.x, body_y, pos.z - r),
-        )
-        for wx, wy, wz in checks:
-            if is_solid_at_world(chunk_manager, wx, wy, wz):
-                if abs(wx - pos.x) > abs(wz - pos.z):
-                    pos.x -= 0.05 if wx > pos.x else -0.05
-                else:
-                    pos.z -= 0.05 if wz > pos.z else -0.05
+        bodies = [(entity, entity.get_component("position"), entity.get_component("voxel_collider")) for entity in entities]
+        starts = [self._start(world, pos, col) for _, pos, col in bodies]
+        mins, sizes, deltas = [], [], []
+        for (entity, pos, col), (sx, sy, sz) in zip(bodies, starts):
+            dy = pos.y - sy
+            if col.gravity:
+                if jump and col.on_ground and entity.name == "Player":
+                    col.vy = self.JUMP_SPEED
+                col.vy = max(col.vy - self.GRAVITY * dt, -self.MAX_FALL_SPEED)
+                dy += col.vy * dt
+            mins.append((sx - col.width * 0.5, sy, sz - col.depth * 0.5))
+            sizes.append((col.width, col.height, col.depth))
+            deltas.append((pos.x - sx, dy, pos.z - sz))
+
+        moved, blocked = sweep_boxes(world, mins, sizes, deltas)
+        for (_, pos, col), lo, move, stop, delta in zip(bodies, mins, moved, blocked, deltas):
+            pos.x = float(lo[0] + move[0] + col.width * 0.5)
+            pos.y = float(lo[1] + move[1])
+            pos.z = float(lo[2] + move[2] + col.depth * 0.5)
+            if stop[1]:
+                col.vy = 0.0
+            col.on_ground = bool(stop[1]) and delta[1] < 0
+            col.last_position = (pos.x, pos.y, pos.z)
+
+    def _start(self, world, pos, col):
+        """Where the sweep starts: last frame's resolved position, unless the entity was placed."""
+        last = col.last_position
+        if last is not None and math.dist(last, (pos.x, pos.y, pos.z)) <= self.TELEPORT_DISTANCE:
+            return last
+        # placed (spawned, teleported): climb out if the feet ended up inside terrain
+        if world.is_solid_at(pos.x, pos.y, pos.z):
+            ground = world.ground_at(pos.x, pos.y + col.height, pos.z, math.ceil(col.height) + 1)
+            if ground is not None and ground > pos.y:
+                pos.y = float(ground)
+        col.vy = 0.0
+        return (pos.x, pos.y, pos.z)
@@ -36,7 +36,22 @@ class Engine:
 
         # Register common subsystem factories (idempotent)
         self.scheduler.register_factory('events', lambda eng: EventSystem(), requires=[])
-        self.scheduler.register_factory('ecs', lambda eng: ECS(event_system=getattr(eng, 'events', None) or EventSystem()), requires=['events'])
+        def _make_ecs(eng):
+            engine_config = eng.config.get("engine", {})
+            ecs = ECS(
+                event_system=getattr(eng, 'events', None) or EventSystem(),
+                columns=bool(engine_config.get("ecs_columns", False)),
+                workers=int(engine_config.get("ecs_workers", 0)),
+                verify_access=bool(engine_config.get("ecs_verify_access", False)),
+            )
+            if engine_config.get("ecs_profile", False):
+                ecs.enable_profiling(
+                    window=int(engine_config.get("ecs_profile_window", 300)),
+                    budget_ms=float(engine_config.get("ecs_profile_budget_ms", 0.0)),
+                )
+            return ecs
+
+        self.scheduler.register_factory('ecs', _make_ecs, requires=['events'])
         self.scheduler.register_factory('resource_manager', lambda eng: ResourceManager(), requires=[])
         self.scheduler.register_factory('renderer', lambda eng: Renderer(event_system=getattr(eng, 'events', None) or EventSystem(), resource_manager=getattr(eng, 'resource_manager', None) or ResourceManager()), requires=['events','resource_manager'])
         self.scheduler.register_factory('physics', lambda eng: Physics(event_system=getattr(eng, 'events', None) or EventSystem(), ecs=getattr(eng, 'ecs', None) or ECS()), requires=['events','ecs'])
@@ -48,14 +63,44 @@ class Engine:
         def _make_chunk_manager(eng):
             try:
                 from simplex.world.chunk_manager import ChunkManager
-                return ChunkManager(eng.ecs, event_system=getattr(eng, 'events', None), chunk_size=(16,16,16), cache_size=64)
+                from simplex.world.region import RegionStore
+                from simplex.world.terrain import make_generator
+                world_cfg = eng.config.get("world", {}) if getattr(eng, 'config', None) else {}
+                chunk_size = (16, 16, 16)
+                save_dir = str(world_cfg.get("save_dir", ""))
+                return ChunkManager(
+                    eng.ecs,
+                    event_system=getattr(eng, 'events', None),
+                    chunk_size=chunk_size,
+                    cache_size=int(world_cfg.get("chunk_cache_size", 64)),
+                    palette=bool(world_cfg.get("palette_chunks", False)),
+                    generator=make_generator(
+                        str(world_cfg.get("generator", "heightmap")),
+                        seed=int(world_cfg.get("seed", 0)),
+                        chunk_size=chunk_size,
+                    ),
+                    workers=int(world_cfg.get("generation_workers", 0)),
+                    worker_kind=str(world_cfg.get("generation_worker_kind", "process")),
+                    integrate_per_frame=int(world_cfg.get("chunk_integrations_per_frame", 4)),
+                    store=RegionStore(save_dir) if save_dir else None,
+                    memory_budget=int(float(world_cfg.get("chunk_memory_budget_mb", 0)) * 1024 * 1024),
+                    compressed_cache_bytes=int(float(world_cfg.get("compressed_cache_mb", 0)) * 1024 * 1024),
+                )
             except Exception:
                 return None
 
         def _make_vbo_helpers(eng):
             try:
-                from simplex.renderer.gl_utils import create_vbo_for_mesh, delete_vbo
-                return {'create_vbo_for_mesh': create_vbo_for_mesh, 'delete_vbo': delete_vbo}
+                from simplex.renderer.gl_utils import (
+                    create_vbo_for_mesh,
+                    create_vbo_for_packed_mesh,
+                    delete_vbo,
+                )
+                return {
+                    'create_vbo_for_mesh': create_vbo_for_mesh,
+                    'create_vbo_for_packed_mesh': create_vbo_for_packed_mesh,
+                    'delete_vbo': delete_vbo,
+                }
             except Exception:
                 return None
 
@@ -148,6 +193,9 @@ class Engine:
                     radius=streaming_radius,
                     horizontal_only=horizontal_streaming,
                     stream_y_chunk=stream_y_chunk,
+                    loads_per_frame=int(world_config.get("stream_loads_per_frame", 16)),
+                    budget_ms=float(world_config.get("stream_budget_ms", 0.0)),
+                    unload_radius=world_config.get("unload_radius"),
                 )
             )
             log("Engine: Voxel collision and chunk streaming registered", level="INFO")
@@ -163,6 +211,13 @@ class Engine:
             chunk_mesh_system = ChunkMeshSystem(
                 event_system=self.events,
                 max_chunks_per_frame=mesh_budget,
+                mesher=str(world_config.get("mesher", "greedy")),
+                engine=self,
+                vertex_format=str(world_config.get("mesh_vertex_format", "float")),
+                workers=int(world_config.get("mesh_workers", 0)),
+                worker_kind=str(world_config.get("mesh_worker_kind", "process")),
+                cache_size=int(world_config.get("mesh_cache_size", 256)),
+                budget_ms=float(world_config.get("mesh_budget_ms", 0.0)),
             )
             self.ecs.add_system(chunk_system)
             self.ecs.add_system(chunk_mesh_system)
@@ -332,14 +387,14 @@ class Engine:
                 return
             mesh_comp = event.get("mesh")
             entity = event.get("entity")
-            if not mesh_comp:
+            if not mesh_comp or getattr(mesh_comp, 'gpu', None) is not None:
                 return
 
             # Try immediate upload via vbo_manager
             vm = getattr(self, 'vbo_manager', None) or getattr(self.renderer, 'vbo_manager', None) or None
             if vm is not None:
                 try:
-                    handle = vm.create_vbo(mesh_comp.vertices, mesh_comp.colors)
+                    handle = vm.upload_mesh(mesh_comp)
                     if handle:
                         mesh_comp.gpu = handle
                         # log successful upload
@@ -363,8 +418,10 @@ class Engine:
             return
         remaining = []
         for entity, mesh_comp in list(self._pending_mesh_uploads):
+            if getattr(mesh_comp, 'gpu', None) is not None:
+                continue  # uploaded meanwhile (renderer) or shares a cached handle
             try:
-                handle = vm.create_vbo(mesh_comp.vertices, mesh_comp.colors)
+                handle = vm.upload_mesh(mesh_comp)
                 if handle:
                     mesh_comp.gpu = handle
                     log(f"Engine: Uploaded queued mesh for entity {getattr(entity, 'name', entity)} to GPU", level="DEBUG")
@@ -497,6 +554,17 @@ class Engine:
             log(f"Engine update error: {e}", level="ERROR")
             self.events.emit("system_error", {"system": "Engine", "error": str(e)})
 
+    def streaming_stats(self) -> dict:
+        """Per-frame cost (ms) of chunk streaming and meshing, with queue sizes."""
+        stats = {}
+        streaming = self.ecs.get_system("chunk_streaming") if hasattr(self, "ecs") else None
+        if streaming is not None:
+            stats["streaming"] = streaming.stats()
+        meshing = self.ecs.get_system("chunk_mesh") if hasattr(self, "ecs") else None
+        if meshing is not None:
+            stats["meshing"] = dict(meshing.frame_timer.stats(), pending_jobs=meshing.pending_jobs())
+        return stats
+
     def run(self):
         """
         Main loop for the engine - basic MVP implementation.
@@ -563,6 +631,8 @@ class Engine:
                 self.script_manager.shutdown()
             if hasattr(self, "ecs"):
                 self.ecs.shutdown()
+            if getattr(self, "chunk_manager", None) is not None:
+                self.chunk_manager.shutdown()
             if hasattr(self, "events"):
                 self.events.shutdown()
 
@@ -641,16 +711,21 @@ class Engine:
     camera_follow = None
 
     def spawn_player(self, name: str = "Player", position=(0, 2, 0)):
-        """Spawn a simple player entity with position and velocity and set camera_follow."""
+        """Spawn a player entity (position, velocity, voxel collider) and set camera_follow."""
         try:
             from simplex.ecs.ecs import Entity
-            from simplex.ecs.components import PositionComponent, VelocityComponent
+            from simplex.ecs.components import (
+                PositionComponent,
+                VelocityComponent,
+                VoxelColliderComponent,
+            )
 
             e = Entity(name)
             pos = PositionComponent(*position)
             vel = VelocityComponent(0.0, 0.0, 0.0)
             e.add_component(pos)
             e.add_component(vel)
+            e.add_component(VoxelColliderComponent())
             self.ecs.add_entity(e)
             # camera follow object is a lightweight container
             class CamObj:
@@ -14,6 +14,7 @@ mcp = FastMCP(
         "MCP server for simplex-engine (Python ECS voxel game engine). "
         "Read AGENTS.md via agent_instructions or simplex://agents. "
         "Use health_check before PRs; world_probe for headless voxel state; "
+        "ecs_profile for per-system frame timings; "
         "good_first_issues for contributor tasks. Demos need a display except world_probe."
     ),
 )
@@ -87,6 +88,20 @@ def world_probe(
     )
 
 
+@mcp.tool()
+def ecs_profile(
+    frames: int = 120,
+    radius: int = 1,
+    speed: float = 0.25,
+    budget_ms: float = 16.7,
+) -> str:
+    """Headless per-system frame timings (p50/p95/p99 ms, entities, over-budget frames)."""
+    return json.dumps(
+        tools.ecs_profile(frames=frames, radius=radius, speed=speed, budget_ms=budget_ms),
+        indent=2,
+    )
+
+
 @mcp.resource("simplex://agents")
 def resource_agents() -> str:
     """AI agent guide (AGENTS.md)."""
@@ -190,9 +190,53 @@ def world_probe(
         "loaded_count": len(loaded),
         "ground_y": ground,
         "on_ground": on_ground,
+        "streaming": streaming.stats(),
     }
 
 
+def ecs_profile(
+    frames: int = 120,
+    radius: int = 1,
+    speed: float = 0.25,
+    budget_ms: float = 16.7,
+) -> dict[str, Any]:
+    """Headless per-system timings: a player walking +x through a streamed voxel world."""
+    from simplex.ecs.chunk_streaming_system import ChunkStreamingSystem
+    from simplex.ecs.chunk_system import ChunkMeshSystem, ChunkSystem
+    from simplex.ecs.components import PositionComponent
+    from simplex.ecs.ecs import ECS, Entity
+    from simplex.ecs.voxel_collision_system import VoxelCollisionSystem
+    from simplex.world.chunk_manager import ChunkManager
+
+    ecs = ECS()
+    cm = ChunkManager(ecs, chunk_size=(16, 16, 16), cache_size=64)
+
+    class _Engine:
+        pass
+
+    engine = _Engine()
+    engine.ecs = ecs
+    engine.chunk_manager = cm
+
+    ecs.add_system(VoxelCollisionSystem(engine=engine))
+    ecs.add_system(ChunkStreamingSystem(engine=engine, radius=radius, horizontal_only=True))
+    ecs.add_system(ChunkSystem())
+    ecs.add_system(ChunkMeshSystem(engine=engine, cache_size=0))
+    player = Entity("Player")
+    position = PositionComponent(0.5, 12.0, 0.5)
+    player.add_component(position)
+    ecs.add_entity(player)
+
+    profiler = ecs.enable_profiling(window=max(1, frames), budget_ms=budget_ms)
+    for _ in range(max(1, frames)):
+        position.x += speed
+        ecs.update()
+    stats = profiler.stats()
+    stats["slowest"] = [name for name, _ in profiler.slowest()]
+    stats["loaded_chunks"] = len(cm.list_loaded())
+    return stats
+
+
 _DEMO_CONTROLS: dict[str, dict[str, str | bool]] = {
     "minecraft_player": {
         "run": "uv run python3 examples/minecraft-like/run_player.py",
@@ -240,6 +284,7 @@ def agent_instructions() -> dict[str, Any]:
             "health_check",
             "engine_capabilities",
             "world_probe",
+            "ecs_profile",
             "demo_instructions",
             "good_first_issues",
             "run_tests",
@@ -169,25 +169,23 @@ class Physics(PhysicsInterface):
             log("Simulating ECS-integrated physics...", level="INFO")
 
             # Get entities with position and velocity components
-            moving_entities = ecs_instance.get_entities_with("position", "velocity")
+            columns = getattr(ecs_instance, "columns", None)
+            if columns is not None:
+                # struct-of-arrays store: integrate every entity in one expression
+                moving_entities = ecs_instance.query("position", "velocity")
+                rows = columns.rows(moving_entities)
+                columns.position[:, rows] += columns.velocity[:, rows]
+            else:
+                moving_entities = ecs_instance.get_entities_with("position", "velocity")
+                for entity in moving_entities:
+                    position_comp = entity.get_component("position")
+                    velocity_comp = entity.get_component("velocity")
 
-            # Apply physics simulation to ECS entities
-            for entity in moving_entities:
-                position_comp = entity.get_component("position")
-                velocity_comp = entity.get_component("velocity")
-                collision_comp = entity.get_component("collision")
-
-                if position_comp and velocity_comp:
                     # Simple physics integration (position += velocity)
                     position_comp.x += velocity_comp.vx
                     position_comp.y += velocity_comp.vy
                     position_comp.z += velocity_comp.vz
 
-                    # Apply basic physics constraints
-                    if collision_comp and not collision_comp.is_static:
-                        # Apply gravity, friction, etc. here if needed
-                        pass
-
             # Emit physics update event
             if self.event_system:
                 self.event_system.emit(
@@ -1,7 +1,8 @@
 """OpenGL helper utilities for creating VBOs/VAOs and uploading mesh data.
 
 This module provides minimal helpers used by the OpenGL renderer to
-upload vertex and color buffers. It uses PyOpenGL functions and ctypes
+upload vertex and color buffers, plus packed meshes (one interleaved
+buffer per mesh, indexed through a shared quad index buffer). It uses PyOpenGL functions and ctypes
 to create typed buffers acceptable by glBufferData.
 """
 
@@ -22,11 +23,15 @@ except Exception:
 # Track allocated handles so we can cleanup on shutdown
 _ALLOCATED_HANDLES = []
 
+# One quad index buffer (0,1,2, 0,2,3 per quad) shared by all packed meshes;
+# grown on demand. {'ibo': int, 'quads': int, 'type': GL enum}
+_SHARED_QUAD_IBO: Dict[str, Any] = {}
+
 
 def create_vbo_for_mesh(vertices: List[float], colors: List[float]) -> Dict[str, Any]:
     """Create VBOs for vertex and color arrays and return a small handle dict.
 
-    Returns: {'vbo': int, 'vbo_color': int, 'count': int}
+    Returns: {'vbo': int, 'vbo_color': int, 'count': int, 'nbytes': int}
     """
     if not gl:
         raise RuntimeError("PyOpenGL not available")
@@ -61,7 +66,63 @@ def create_vbo_for_mesh(vertices: List[float], colors: List[float]) -> Dict[str,
     # Unbind
     gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
 
-    handle = {'vbo': vbo, 'vbo_color': vbo_color, 'count': vert_count}
+    handle = {'vbo': vbo, 'vbo_color': vbo_color, 'count': vert_count, 'nbytes': vert_bytes + col_bytes}
+    _ALLOCATED_HANDLES.append(handle)
+    return handle
+
+
+def shared_quad_ibo(quad_count: int) -> Dict[str, Any]:
+    """Return the shared quad index buffer, growing it to cover `quad_count` quads."""
+    if not gl:
+        raise RuntimeError("PyOpenGL not available")
+    from simplex.voxel.mesh_packing import index_type_for, quad_indices
+
+    if _SHARED_QUAD_IBO and _SHARED_QUAD_IBO['quads'] >= quad_count:
+        return _SHARED_QUAD_IBO
+
+    # grow geometrically so streaming in slightly bigger meshes doesn't re-upload every time
+    quads = max(quad_count, 2 * _SHARED_QUAD_IBO.get('quads', 0), 1024)
+    index_type = index_type_for(quads)
+    data = quad_indices(quads, index_type)
+    ibo = _SHARED_QUAD_IBO.get('ibo') or gl.glGenBuffers(1)
+    gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, ibo)
+    payload = np.frombuffer(data, dtype=np.uint8) if np is not None else data
+    gl.glBufferData(gl.GL_ELEMENT_ARRAY_BUFFER, len(data), payload, gl.GL_STATIC_DRAW)
+    gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, 0)
+    _SHARED_QUAD_IBO.update(
+        ibo=ibo,
+        quads=quads,
+        type=gl.GL_UNSIGNED_SHORT if index_type == 'uint16' else gl.GL_UNSIGNED_INT,
+    )
+    return _SHARED_QUAD_IBO
+
+
+def create_vbo_for_packed_mesh(packed) -> Dict[str, Any]:
+    """Upload a PackedMesh as a single interleaved VBO drawn via the shared quad index buffer.
+
+    Returns: {'vbo': int, 'count': int (indices), 'packed': True, 'stride': int,
+              'color_offset': int, 'position_type': str, 'nbytes': int}
+    """
+    if not gl:
+        raise RuntimeError("PyOpenGL not available")
+
+    shared_quad_ibo(packed.quad_count)
+    payload = np.frombuffer(packed.data, dtype=np.uint8) if np is not None else packed.data
+
+    vbo = gl.glGenBuffers(1)
+    gl.glBindBuffer(gl.GL_ARRAY_BUFFER, vbo)
+    gl.glBufferData(gl.GL_ARRAY_BUFFER, len(packed.data), payload, gl.GL_STATIC_DRAW)
+    gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+
+    handle = {
+        'vbo': vbo,
+        'count': packed.index_count,
+        'packed': True,
+        'stride': packed.stride,
+        'color_offset': packed.color_offset,
+        'position_type': packed.position_type,
+        'nbytes': len(packed.data),
+    }
     _ALLOCATED_HANDLES.append(handle)
     return handle
 
@@ -93,3 +154,9 @@ def delete_all_vbos() -> None:
         except Exception:
             pass
     _ALLOCATED_HANDLES.clear()
+    if _SHARED_QUAD_IBO.get('ibo'):
+        try:
+            gl.glDeleteBuffers(1, [_SHARED_QUAD_IBO['ibo']])
+        except Exception:
+            pass
+    _SHARED_QUAD_IBO.clear()
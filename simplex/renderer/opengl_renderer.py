@@ -6,6 +6,7 @@ Provides 3D rendering capabilities for voxel/world rendering (Minecraft-like).
 from simplex.renderer.interface import RendererInterface
 from simplex.renderer.material import Material, Shader
 from simplex.utils.logger import log
+from simplex.voxel.mesh_packing import unpack_mesh
 
 try:
     import OpenGL.GL as gl
@@ -16,13 +17,21 @@ except ImportError:
     gl = None
     glu = None
     pygame = None
+import ctypes
 import math
 
 try:
-    from .gl_utils import create_vbo_for_mesh, delete_vbo
+    from .gl_utils import (
+        create_vbo_for_mesh,
+        create_vbo_for_packed_mesh,
+        delete_vbo,
+        shared_quad_ibo,
+    )
 except Exception:
     create_vbo_for_mesh = None
+    create_vbo_for_packed_mesh = None
     delete_vbo = None
+    shared_quad_ibo = None
 
 
 class OpenGLRenderer(RendererInterface):
@@ -287,13 +296,42 @@ class OpenGLRenderer(RendererInterface):
             return self.engine.vbo_manager
         return None
 
+    def _release_gpu(self, handle):
+        """Drop a mesh's reference to `handle` (refs, see ChunkMeshSystem); delete it with the last one."""
+        handle["refs"] = handle.get("refs", 1) - 1
+        if handle["refs"] > 0:
+            return
+        vm = self._get_vbo_manager()
+        if vm:
+            vm.delete_vbo(handle)
+            return
+        helpers = self._get_vbo_helpers()
+        if helpers and helpers.get('delete_vbo'):
+            try:
+                helpers['delete_vbo'](handle)
+            except Exception as e:
+                log(f"OpenGLRenderer: Failed to delete VBO: {e}", level="DEBUG")
+
     def _get_vbo_helpers(self):
         if hasattr(self, 'engine') and getattr(self.engine, 'vbo_helpers', None):
             return self.engine.vbo_helpers
         if create_vbo_for_mesh and delete_vbo:
-            return {'create_vbo_for_mesh': create_vbo_for_mesh, 'delete_vbo': delete_vbo}
+            return {
+                'create_vbo_for_mesh': create_vbo_for_mesh,
+                'create_vbo_for_packed_mesh': create_vbo_for_packed_mesh,
+                'delete_vbo': delete_vbo,
+            }
         return None
 
+    @staticmethod
+    def _upload_with_helpers(helpers, mesh_comp):
+        """Upload via raw gl_utils helpers, using the packed path when the mesh has one."""
+        packed = getattr(mesh_comp, 'packed', None)
+        if packed is not None:
+            create_fn = helpers.get('create_vbo_for_packed_mesh')
+            return create_fn(packed) if create_fn else None
+        return helpers['create_vbo_for_mesh'](mesh_comp.vertices, mesh_comp.colors)
+
     def _ensure_mesh_gpu(self, mesh_comp):
         """Upload mesh data to GPU when a VBO manager or helpers are available."""
         if getattr(mesh_comp, 'gpu', None) is not None:
@@ -302,7 +340,7 @@ class OpenGLRenderer(RendererInterface):
         vm = self._get_vbo_manager()
         if vm:
             try:
-                mesh_comp.gpu = vm.create_vbo(mesh_comp.vertices, mesh_comp.colors)
+                mesh_comp.gpu = vm.upload_mesh(mesh_comp)
                 log(
                     f"OpenGLRenderer: Uploaded mesh to GPU (count={mesh_comp.gpu.get('count') if mesh_comp.gpu else 'N/A'})",
                     level="DEBUG",
@@ -314,11 +352,9 @@ class OpenGLRenderer(RendererInterface):
         helpers = self._get_vbo_helpers()
         if helpers and helpers.get('create_vbo_for_mesh'):
             try:
-                mesh_comp.gpu = helpers['create_vbo_for_mesh'](
-                    mesh_comp.vertices, mesh_comp.colors
-                )
+                mesh_comp.gpu = self._upload_with_helpers(helpers, mesh_comp)
                 log(
-                    f"OpenGLRenderer: Uploaded mesh to GPU (count={mesh_comp.gpu.get('count')})",
+                    f"OpenGLRenderer: Uploaded mesh to GPU (count={mesh_comp.gpu.get('count') if mesh_comp.gpu else 'N/A'})",
                     level="DEBUG",
                 )
             except Exception as e:
@@ -331,9 +367,10 @@ class OpenGLRenderer(RendererInterface):
             return False
 
         drawn = False
-        for entity in ecs.get_entities_with('mesh'):
+        entities = ecs.query('mesh') if hasattr(ecs, 'query') else ecs.get_entities_with('mesh')
+        for entity in entities:
             mesh_comp = entity.get_component('mesh')
-            if not mesh_comp or not getattr(mesh_comp, 'vertices', None):
+            if not mesh_comp or not mesh_comp.has_geometry():
                 continue
             self._ensure_mesh_gpu(mesh_comp)
             self._draw_mesh(mesh_comp)
@@ -380,6 +417,8 @@ class OpenGLRenderer(RendererInterface):
         try:
             gl.glEnableClientState(gl.GL_VERTEX_ARRAY)
             gl.glEnableClientState(gl.GL_COLOR_ARRAY)
+            if handle.get("packed"):
+                return self._draw_packed_vbo(handle)
             gl.glBindBuffer(gl.GL_ARRAY_BUFFER, handle["vbo"])
             gl.glVertexPointer(3, gl.GL_FLOAT, 0, None)
             gl.glBindBuffer(gl.GL_ARRAY_BUFFER, handle["vbo_color"])
@@ -389,20 +428,34 @@ class OpenGLRenderer(RendererInterface):
         except Exception as e:
             log(f"OpenGLRenderer: VBO draw failed, falling back to immediate mode: {e}", level="DEBUG")
             mesh_comp.gpu = None
+            self._release_gpu(handle)
             return False
         finally:
             try:
                 gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+                gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, 0)
                 gl.glDisableClientState(gl.GL_VERTEX_ARRAY)
                 gl.glDisableClientState(gl.GL_COLOR_ARRAY)
             except Exception:
                 pass
 
+    def _draw_packed_vbo(self, handle) -> bool:
+        """Draw an interleaved packed mesh through the shared quad index buffer."""
+        # glVertexPointer has no unsigned-byte type; uint8 positions need a shader pipeline
+        if handle.get("position_type") != "int16":
+            raise ValueError(f"fixed-function path cannot draw {handle.get('position_type')} positions")
+        ibo = shared_quad_ibo(handle["count"] // 6)
+        stride = handle["stride"]
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, handle["vbo"])
+        gl.glVertexPointer(3, gl.GL_SHORT, stride, ctypes.c_void_p(0))
+        gl.glColorPointer(4, gl.GL_UNSIGNED_BYTE, stride, ctypes.c_void_p(handle["color_offset"]))
+        gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, ibo["ibo"])
+        gl.glDrawElements(gl.GL_TRIANGLES, handle["count"], ibo["type"], None)
+        return True
+
     def _draw_mesh(self, mesh_comp):
         """Draw meshes stored in MeshComponent (VBO path with immediate-mode fallback)."""
-        verts = mesh_comp.vertices or []
-        cols = mesh_comp.colors or []
-        if not verts or not gl:
+        if not gl or not mesh_comp.has_geometry():
             return
 
         gl.glPushMatrix()
@@ -414,6 +467,10 @@ class OpenGLRenderer(RendererInterface):
             if getattr(mesh_comp, "gpu", None) and self._draw_mesh_vbo(mesh_comp):
                 return
 
+            verts = mesh_comp.vertices if mesh_comp.vertices is not None else []
+            cols = mesh_comp.colors if mesh_comp.colors is not None else []
+            if not len(verts) and mesh_comp.packed is not None:
+                verts, cols = unpack_mesh(mesh_comp.packed)
             self._draw_mesh_immediate(verts, cols)
         finally:
             try:
@@ -538,7 +595,7 @@ class OpenGLRenderer(RendererInterface):
             vm = getattr(self, 'vbo_manager', None) or (hasattr(self, 'engine') and getattr(self.engine, 'vbo_manager', None)) or None
             if vm is not None:
                 try:
-                    handle = vm.create_vbo(mesh_comp.vertices, mesh_comp.colors)
+                    handle = vm.upload_mesh(mesh_comp)
                     if handle:
                         mesh_comp.gpu = handle
                         log(f"OpenGLRenderer: Uploaded mesh for entity {getattr(entity, 'name', entity)} via VBOManager", level="DEBUG")
@@ -547,15 +604,11 @@ class OpenGLRenderer(RendererInterface):
                     log(f"OpenGLRenderer: VBOManager upload failed: {e}", level="DEBUG")
 
             # Fallback to engine-provided helpers or module-level helpers
-            helpers = None
-            if hasattr(self, 'engine') and getattr(self.engine, 'vbo_helpers', None):
-                helpers = getattr(self.engine, 'vbo_helpers')
-            elif create_vbo_for_mesh and delete_vbo:
-                helpers = {'create_vbo_for_mesh': create_vbo_for_mesh, 'delete_vbo': delete_vbo}
+            helpers = self._get_vbo_helpers()
 
             if helpers and helpers.get('create_vbo_for_mesh'):
                 try:
-                    mesh_comp.gpu = helpers['create_vbo_for_mesh'](mesh_comp.vertices, mesh_comp.colors)
+                    mesh_comp.gpu = self._upload_with_helpers(helpers, mesh_comp)
                     log(f"OpenGLRenderer: Uploaded mesh for entity {getattr(entity, 'name', entity)} via helpers", level="DEBUG")
                     return
                 except Exception as e:
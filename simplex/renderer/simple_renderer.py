@@ -24,6 +24,8 @@ class SimpleRenderer(RendererInterface):
         self.initialized = False
         self.entities_to_render = []
         self.engine_events = None  # Reference to engine event system
+        self.ecs = None  # profiled while F4 profiling is on
+        self._profiling_ecs = False
 
         # Debug and development tools
         self.debug_overlay = DebugOverlay()
@@ -61,6 +63,26 @@ class SimpleRenderer(RendererInterface):
         """Set reference to engine event system for input forwarding."""
         self.engine_events = engine_events
 
+    def set_ecs(self, ecs):
+        """Set the ECS whose system timings the debug overlay shows (F4)."""
+        self.ecs = ecs
+
+    def _update_system_profile(self):
+        """Follow the F4 profiling toggle: time the ECS and show its slowest systems."""
+        ecs = self.ecs
+        if ecs is None:
+            return
+        if self.dev_tools.profiling_enabled:
+            if ecs.profiler is None:
+                ecs.enable_profiling()
+                self._profiling_ecs = True
+            self.debug_overlay.update_system_profile(ecs.profile_stats())
+        else:
+            if self._profiling_ecs:
+                ecs.disable_profiling()
+                self._profiling_ecs = False
+            self.debug_overlay.update_system_profile({})
+
     def render(self):
         """Render the current frame."""
         if not self.initialized:
@@ -80,6 +102,7 @@ class SimpleRenderer(RendererInterface):
             stats.update(self.dev_tools.get_dev_stats())
             stats["Entities"] = len(self.entities_to_render)
             self.debug_overlay.update_stats(stats)
+            self._update_system_profile()
 
             # Clear previous debug lines
             self.debug_overlay.clear_debug_lines()
@@ -9,6 +9,7 @@ from typing import Any, Dict, List, Optional
 class VBOManager:
     def __init__(self, helpers: Optional[Dict[str, Any]] = None):
         # helpers expected to be {'create_vbo_for_mesh': func, 'delete_vbo': func}
+        # and optionally 'create_vbo_for_packed_mesh': func
         self.helpers = helpers or {}
         self._handles: List[Dict[str, Any]] = []
 
@@ -28,6 +29,26 @@ class VBOManager:
         except Exception:
             return None
 
+    def create_packed_vbo(self, packed) -> Optional[Dict[str, Any]]:
+        """Create a VBO for a PackedMesh and track the handle (None on failure)."""
+        create_fn = self.helpers.get('create_vbo_for_packed_mesh')
+        if not create_fn:
+            return None
+        try:
+            handle = create_fn(packed)
+            if handle:
+                self._handles.append(handle)
+            return handle
+        except Exception:
+            return None
+
+    def upload_mesh(self, mesh_comp) -> Optional[Dict[str, Any]]:
+        """Upload a MeshComponent using its packed data when present, else the float lists."""
+        packed = getattr(mesh_comp, 'packed', None)
+        if packed is not None:
+            return self.create_packed_vbo(packed)
+        return self.create_vbo(mesh_comp.vertices, mesh_comp.colors)
+
     def delete_vbo(self, handle: Dict[str, Any]) -> None:
         """Delete a single VBO handle using the helper and remove it from tracking."""
         delete_fn = self.helpers.get('delete_vbo')
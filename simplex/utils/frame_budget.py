@@ -0,0 +1,63 @@
+"""
+Per-frame work budgets for systems that spread work over several frames
+(chunk streaming, meshing).
+
+A budget is either a time limit in milliseconds, measured with
+`time.perf_counter` from `start()`, or a plain item count when no time
+limit is set. A time budget always admits at least one item per frame,
+so an expensive item still makes progress; whatever does not fit is
+left for the next frame by the caller.
+"""
+
+from time import perf_counter
+from typing import Optional
+
+
+class FrameBudget:
+    def __init__(self, budget_ms: Optional[float] = None, max_items: int = 1):
+        self.budget_ms = float(budget_ms) if budget_ms else None
+        self.max_items = max(1, int(max_items))
+        self.items = 0
+        self._start = perf_counter()
+
+    def start(self) -> "FrameBudget":
+        """Reset for a new frame and return self."""
+        self.items = 0
+        self._start = perf_counter()
+        return self
+
+    def elapsed_ms(self) -> float:
+        return (perf_counter() - self._start) * 1000.0
+
+    def charge(self, items: int = 1) -> None:
+        self.items += items
+
+    def expired(self) -> bool:
+        """True once a time budget has run out (never for count budgets)."""
+        return self.budget_ms is not None and self.elapsed_ms() >= self.budget_ms
+
+    def exhausted(self) -> bool:
+        """True when no further item should be started this frame."""
+        if self.budget_ms is None:
+            return self.items >= self.max_items
+        return self.items > 0 and self.expired()
+
+
+class FrameTimer:
+    """Last and smoothed per-frame cost of a system, in milliseconds."""
+
+    def __init__(self, smoothing: float = 0.1):
+        self.smoothing = float(smoothing)
+        self.last_ms = 0.0
+        self.avg_ms = 0.0
+        self.max_ms = 0.0
+        self.frames = 0
+
+    def record(self, ms: float) -> None:
+        self.last_ms = ms
+        self.avg_ms = ms if self.frames == 0 else self.avg_ms + self.smoothing * (ms - self.avg_ms)
+        self.max_ms = max(self.max_ms, ms)
+        self.frames += 1
+
+    def stats(self) -> dict:
+        return {"last_ms": self.last_ms, "avg_ms": self.avg_ms, "max_ms": self.max_ms, "frames": self.frames}
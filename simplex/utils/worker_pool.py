@@ -0,0 +1,83 @@
+"""
+Executor wrapper shared by the background job systems (meshing, chunk
+generation, region I/O).
+
+`WorkerPool` prefers a `ProcessPoolExecutor`, so CPU-bound pure-Python
+work does not contend for the GIL, and falls back to a
+`ThreadPoolExecutor` where process pools are unavailable or break
+(restricted sandboxes, platforms without working semaphores). Submitted
+callables and their arguments must be picklable for the process pool.
+"""
+
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from simplex.utils.logger import log
+
+
+def _mp_context():
+    # forking a process that already runs render/audio threads can deadlock
+    # the child, so prefer a fork server where the platform has one
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context()
+
+
+class WorkerPool:
+    """Process pool first, threads as fallback."""
+
+    def __init__(self, workers: int = 2, kind: str = "process", name: str = "worker"):
+        if kind not in ("process", "thread"):
+            raise ValueError(f"Unknown worker kind '{kind}', expected 'process' or 'thread'")
+        self.workers = max(1, int(workers))
+        self.kind = kind
+        self.name = name
+        self._executor = None
+
+    def _ensure_executor(self):
+        if self._executor is not None:
+            return self._executor
+        if self.kind == "process":
+            try:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_mp_context())
+                return self._executor
+            except (OSError, NotImplementedError, ImportError) as exc:
+                log(f"WorkerPool[{self.name}]: process pool unavailable ({exc}), using threads", level="WARNING")
+                self.kind = "thread"
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name)
+        return self._executor
+
+    def start(self) -> None:
+        """Create the executor and start a worker now rather than on the first real job.
+
+        Starting worker processes takes a few hundred milliseconds, which
+        is better spent at load time than in the first streaming frame.
+        """
+        try:
+            self._ensure_executor().submit(int)
+        except (BrokenProcessPool, RuntimeError):
+            self.fall_back_to_threads()
+
+    def fall_back_to_threads(self) -> None:
+        """Replace a broken process pool with a thread pool."""
+        if self.kind == "thread":
+            return
+        log(f"WorkerPool[{self.name}]: process pool broke, switching to threads", level="WARNING")
+        old = self._executor
+        self._executor = None
+        self.kind = "thread"
+        if old is not None:
+            old.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, fn, *args) -> Future:
+        try:
+            return self._ensure_executor().submit(fn, *args)
+        except (BrokenProcessPool, RuntimeError):
+            self.fall_back_to_threads()
+            return self._ensure_executor().submit(fn, *args)
+
+    def shutdown(self, wait: bool = False) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
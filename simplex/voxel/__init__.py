@@ -5,13 +5,22 @@ This package contains lightweight block definitions, chunk storage,
 and a naive mesh generator used by early renderer integration.
 
 The code intentionally avoids heavy third-party dependencies so it
-can be used in tests and early development. Later we will add
-optimized meshers (greedy meshing) and VBO upload helpers.
+can be used in tests and early development. NumPy-backed paths
+(`Chunk.block_array`, `generate_vectorized_mesh`) are used when numpy
+is installed.
 """
 
 from .voxel import BLOCK_AIR, Block, PALETTE, is_solid, get_block_color
 from .chunk import Chunk
-from .meshgen import generate_naive_mesh, generate_greedy_mesh
+from .palette import PalettedStorage
+from .meshgen import (
+    MESHERS,
+    generate_naive_mesh,
+    generate_greedy_mesh,
+    generate_vectorized_mesh,
+    get_mesher,
+)
+from .mesh_packing import PackedMesh, pack_mesh, unpack_mesh, quad_indices
 
 __all__ = [
     "BLOCK_AIR",
@@ -20,6 +29,14 @@ __all__ = [
     "is_solid",
     "get_block_color",
     "Chunk",
+    "PalettedStorage",
     "generate_naive_mesh",
     "generate_greedy_mesh",
+    "generate_vectorized_mesh",
+    "MESHERS",
+    "get_mesher",
+    "PackedMesh",
+    "pack_mesh",
+    "unpack_mesh",
+    "quad_indices",
 ]
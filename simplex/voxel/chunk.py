@@ -2,29 +2,110 @@
 Chunk storage for voxel worlds.
 
 This module provides a compact, dependency-light Chunk implementation used
-by the early voxel systems. It intentionally avoids numpy for portability
-in tests and uses a flat list internally.
+by the early voxel systems. Block ids live in a flat uint16 `array` (one
+entry per cell) and per-block metadata is kept in a sparse side table, so
+a chunk costs two bytes per cell instead of one Python object per cell.
+Passing `palette=True` swaps the flat array for a `PalettedStorage`
+(bit-packed indices into a per-chunk palette), which brings typical
+terrain chunks down to 1-2 bits per cell. NumPy is optional: when
+installed, `block_array()` exposes the ids as an (sx, sy, sz) array.
+
+A chunk that holds a single block id (all air above the terrain, all
+stone deep below it) is stored as just that id and only allocates its
+backing store on the first write of a different id.
+
+Each chunk also remembers which of its six border layers were written
+since the last mesh (`dirty_borders`), so the world can re-mesh only the
+neighbours whose shared face actually changed. `version` increases on
+every write or `mark_dirty()`, which lets background mesh jobs built from
+a `snapshot()` detect that the chunk changed while they were running.
+`modified` is set by block writes only (not by `mark_dirty()`) and tells
+the world whether the chunk has to be saved before it is dropped.
+
+`column_height()` / `heightmap()` give the top of the solid blocks in
+every (x, z) column. The map is built on first use with one pass over the
+block ids and then kept up to date by `set_block` / `set_block_id` (only
+removing the top block of a column rescans it); bulk writes and
+`blocks_changed()` drop it for a rebuild.
 """
 
-from typing import Tuple, List
-from .voxel import Voxel, BLOCK_AIR
+from array import array
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from .voxel import Voxel, BLOCK_AIR, is_solid
+from .palette import PalettedStorage
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 CHUNK_DEFAULT_SIZE = (16, 16, 16)
 
+# face key -> (axis, high side?) using the mesher naming (px = +x side, ...)
+FACE_AXES = {
+    "px": (0, True),
+    "nx": (0, False),
+    "py": (1, True),
+    "ny": (1, False),
+    "pz": (2, True),
+    "nz": (2, False),
+}
+OPPOSITE_FACE = {
+    "px": "nx",
+    "nx": "px",
+    "py": "ny",
+    "ny": "py",
+    "pz": "nz",
+    "nz": "pz",
+}
+# face key -> chunk-coordinate offset of the neighbour on that side
+FACE_OFFSETS = {
+    "px": (1, 0, 0),
+    "nx": (-1, 0, 0),
+    "py": (0, 1, 0),
+    "ny": (0, -1, 0),
+    "pz": (0, 0, 1),
+    "nz": (0, 0, -1),
+}
+
+
+class ChunkSnapshot(NamedTuple):
+    """Picklable copy of a chunk's block ids (and, on request, its metadata)."""
+
+    position: Tuple[int, int, int]
+    size: Tuple[int, int, int]
+    uniform_id: Optional[int]
+    blocks: Optional[bytes]  # uint16 ids in x-major order, None when uniform
+    meta: Optional[Dict[int, dict]] = None  # flat index -> data, see snapshot(include_meta=True)
+
 
 class Chunk:
     def __init__(
         self,
         position: Tuple[int, int, int],
         size: Tuple[int, int, int] = CHUNK_DEFAULT_SIZE,
+        palette: bool = False,
     ):
         self.position = tuple(position)
         self.size = tuple(size)
         self._sx, self._sy, self._sz = self.size
-        self._blocks: List[Voxel] = [
-            Voxel(BLOCK_AIR) for _ in range(self._sx * self._sy * self._sz)
-        ]
+        self._volume = self._sx * self._sy * self._sz
+        self._palette = bool(palette)
+        # block ids in x-major order (see _index); None while the chunk is
+        # uniform, in which case every cell holds `_uniform_id`
+        self._blocks = None
+        self._uniform_id = BLOCK_AIR
+        # sparse per-block metadata: flat index -> data dict
+        self._meta: Dict[int, dict] = {}
+        # column heights (see column_height) indexed x * sz + z; None until needed
+        self._heights: Optional[array] = None
         self.dirty = True
+        self.version = 0
+        # blocks written since the chunk was generated, loaded or saved
+        self.modified = False
+        # border layers written since the neighbours were last told about it
+        self.dirty_borders: Set[str] = set(FACE_AXES)
 
     def _index(self, x: int, y: int, z: int) -> int:
         return (x * self._sy * self._sz) + (y * self._sz) + z
@@ -32,28 +113,341 @@ class Chunk:
     def in_bounds(self, x: int, y: int, z: int) -> bool:
         return 0 <= x < self._sx and 0 <= y < self._sy and 0 <= z < self._sz
 
-    def get_block(self, x: int, y: int, z: int) -> Voxel:
+    def _touch_border(self, x: int, y: int, z: int) -> None:
+        if x == 0:
+            self.dirty_borders.add("nx")
+        if x == self._sx - 1:
+            self.dirty_borders.add("px")
+        if y == 0:
+            self.dirty_borders.add("ny")
+        if y == self._sy - 1:
+            self.dirty_borders.add("py")
+        if z == 0:
+            self.dirty_borders.add("nz")
+        if z == self._sz - 1:
+            self.dirty_borders.add("pz")
+
+    def _materialize(self) -> None:
+        """Allocate per-cell storage filled with the current uniform id."""
+        fill = self._uniform_id
+        if self._palette:
+            self._blocks = PalettedStorage(self._volume, fill)
+        else:
+            self._blocks = array("H", [fill]) * self._volume
+
+    @property
+    def uniform_id(self):
+        """Block id shared by every cell, or None once the chunk is heterogeneous."""
+        return self._uniform_id if self._blocks is None else None
+
+    def is_uniform(self) -> bool:
+        return self._blocks is None
+
+    def fill(self, block_id: int) -> None:
+        """Set every cell to `block_id`, releasing per-cell storage and metadata."""
+        self._blocks = None
+        self._uniform_id = int(block_id)
+        self._meta.clear()
+        self._heights = None
+        self.dirty = True
+        self.modified = True
+        self.version += 1
+        self.dirty_borders.update(FACE_AXES)
+
+    def load_blocks(self, ids) -> None:
+        """Replace every block id at once and drop all metadata.
+
+        `ids` is an (sx, sy, sz) NumPy array or a flat x-major sequence of
+        `sx * sy * sz` ids. Single-id input collapses to a uniform chunk.
+        """
+        if np is not None and isinstance(ids, np.ndarray):
+            flat = np.ascontiguousarray(ids, dtype=np.uint16).reshape(-1)
+            if flat.size != self._volume:
+                raise ValueError(f"Expected {self._volume} block ids, got {flat.size}")
+            first = int(flat[0])
+            if (flat == first).all():
+                self.fill(first)
+                return
+            if self._palette:
+                blocks = PalettedStorage.from_numpy(flat)
+            else:
+                blocks = array("H")
+                blocks.frombytes(flat.tobytes())
+        else:
+            flat = array("H", ids)
+            if len(flat) != self._volume:
+                raise ValueError(f"Expected {self._volume} block ids, got {len(flat)}")
+            first = flat[0]
+            if flat.count(first) == self._volume:
+                self.fill(first)
+                return
+            if self._palette:
+                blocks = PalettedStorage(self._volume, first)
+                for i, bid in enumerate(flat):
+                    if bid != first:
+                        blocks[i] = bid
+            else:
+                blocks = flat
+        self._blocks = blocks
+        self._meta.clear()
+        self._heights = None
+        self.dirty = True
+        self.modified = True
+        self.version += 1
+        self.dirty_borders.update(FACE_AXES)
+
+    def get_block_id(self, x: int, y: int, z: int) -> int:
+        """Return the block id at (x, y, z) without allocating a Voxel."""
         if not self.in_bounds(x, y, z):
             raise IndexError("Block coordinates out of chunk bounds")
+        if self._blocks is None:
+            return self._uniform_id
         return self._blocks[self._index(x, y, z)]
 
+    def get_block(self, x: int, y: int, z: int) -> Voxel:
+        if not self.in_bounds(x, y, z):
+            raise IndexError("Block coordinates out of chunk bounds")
+        idx = self._index(x, y, z)
+        if self._blocks is None:
+            return Voxel(self._uniform_id, self._meta.get(idx))
+        return Voxel(self._blocks[idx], self._meta.get(idx))
+
     def set_block(self, x: int, y: int, z: int, block: Voxel) -> None:
         if not self.in_bounds(x, y, z):
             raise IndexError("Block coordinates out of chunk bounds")
-        self._blocks[self._index(x, y, z)] = block
+        idx = self._index(x, y, z)
+        if self._blocks is None and block.block_id != self._uniform_id:
+            self._materialize()
+        if self._blocks is not None:
+            self._blocks[idx] = block.block_id
+        if block.data:
+            self._meta[idx] = block.data
+        else:
+            self._meta.pop(idx, None)
+        if self._heights is not None:
+            self._update_height(x, y, z, block.block_id)
         self.dirty = True
+        self.modified = True
+        self.version += 1
+        self._touch_border(x, y, z)
 
     def set_block_id(self, x: int, y: int, z: int, block_id: int) -> None:
-        self.set_block(x, y, z, Voxel(block_id))
+        """Set the block id at (x, y, z), dropping any metadata on that cell."""
+        if not self.in_bounds(x, y, z):
+            raise IndexError("Block coordinates out of chunk bounds")
+        idx = self._index(x, y, z)
+        if self._blocks is None:
+            if block_id != self._uniform_id:
+                self._materialize()
+                self._blocks[idx] = block_id
+        else:
+            self._blocks[idx] = block_id
+        if self._meta:
+            self._meta.pop(idx, None)
+        if self._heights is not None:
+            self._update_height(x, y, z, block_id)
+        self.dirty = True
+        self.modified = True
+        self.version += 1
+        if (
+            x == 0 or y == 0 or z == 0
+            or x == self._sx - 1 or y == self._sy - 1 or z == self._sz - 1
+        ):
+            self._touch_border(x, y, z)
+
+    def _scan_column(self, x: int, z: int, top: int) -> int:
+        """Height of column (x, z) counting only cells at or below local y `top`."""
+        if self._blocks is None:
+            return top + 1 if top >= 0 and is_solid(self._uniform_id) else 0
+        blocks = self._blocks
+        for y in range(top, -1, -1):
+            if is_solid(blocks[self._index(x, y, z)]):
+                return y + 1
+        return 0
+
+    def _build_heights(self) -> array:
+        sx, sy, sz = self.size
+        if self._blocks is None:
+            return array("H", [sy if is_solid(self._uniform_id) else 0]) * (sx * sz)
+        if np is not None:
+            ids = self.block_array()
+            solid_ids = [bid for bid in np.unique(ids).tolist() if is_solid(bid)]
+            solid = np.isin(ids, solid_ids)
+            # first solid cell from the top, turned back into a height
+            top = sy - np.argmax(solid[:, ::-1, :], axis=1)
+            top[~solid.any(axis=1)] = 0
+            heights = array("H")
+            heights.frombytes(top.astype(np.uint16).tobytes())
+            return heights
+        heights = array("H", bytes(2 * sx * sz))
+        for x in range(sx):
+            for z in range(sz):
+                heights[x * sz + z] = self._scan_column(x, z, sy - 1)
+        return heights
+
+    def _update_height(self, x: int, y: int, z: int, block_id: int) -> None:
+        i = x * self._sz + z
+        height = self._heights[i]
+        if is_solid(block_id):
+            if y >= height:
+                self._heights[i] = y + 1
+        elif y + 1 == height:
+            self._heights[i] = self._scan_column(x, z, y - 1)
+
+    def column_height(self, x: int, z: int, top: Optional[int] = None) -> int:
+        """Local y of the highest solid block in column (x, z) plus one, 0 if it has none.
+
+        With `top`, only cells at or below local y `top` count; the column
+        is scanned only when the stored height lies above `top`.
+        """
+        if self._heights is None:
+            self._heights = self._build_heights()
+        height = self._heights[x * self._sz + z]
+        if top is not None and height > top + 1:
+            return self._scan_column(x, z, min(top, self._sy - 1))
+        return height
+
+    def heightmap(self):
+        """Column heights for the whole chunk (see column_height).
+
+        An (sx, sz) uint16 NumPy array (a copy) when NumPy is installed,
+        otherwise nested lists indexed [x][z].
+        """
+        if self._heights is None:
+            self._heights = self._build_heights()
+        if np is not None:
+            return np.frombuffer(self._heights, dtype=np.uint16).reshape(self._sx, self._sz).copy()
+        sz = self._sz
+        return [self._heights[x * sz:(x + 1) * sz].tolist() for x in range(self._sx)]
 
     def iter_blocks(self):
         """Yield (x,y,z, Voxel) for all non-air blocks."""
-        for x in range(self._sx):
-            for y in range(self._sy):
-                for z in range(self._sz):
-                    v = self.get_block(x, y, z)
-                    if not v.is_air():
-                        yield (x, y, z, v)
+        blocks = self._blocks
+        if blocks is None:
+            if self._uniform_id == BLOCK_AIR:
+                return
+            blocks = array("H", [self._uniform_id]) * self._volume
+        meta = self._meta
+        syz = self._sy * self._sz
+        sz = self._sz
+        for idx, bid in enumerate(blocks):
+            if bid == BLOCK_AIR:
+                continue
+            x, rem = divmod(idx, syz)
+            y, z = divmod(rem, sz)
+            yield (x, y, z, Voxel(bid, meta.get(idx)))
+
+    def border_layer(self, face_key: str) -> List[List[int]]:
+        """Return the block ids of the outermost layer on side `face_key`.
+
+        The layer is a nested list indexed by the two remaining axes in
+        increasing order: [y][z] for x faces, [x][z] for y faces and
+        [x][y] for z faces. Callers must treat it as read-only.
+        """
+        axis, high = FACE_AXES[face_key]
+        dims = [self._sx, self._sy, self._sz]
+        layer_index = dims[axis] - 1 if high else 0
+        na, nb = [dims[a] for a in range(3) if a != axis]
+        if self._blocks is None:
+            row = [self._uniform_id] * nb
+            return [row] * na
+        if np is not None:
+            return np.take(self.block_array(), layer_index, axis=axis).tolist()
+        layer = []
+        for a in range(na):
+            row = []
+            for b in range(nb):
+                coords = [a, b]
+                coords.insert(axis, layer_index)
+                row.append(self._blocks[self._index(*coords)])
+            layer.append(row)
+        return layer
+
+    @property
+    def is_paletted(self) -> bool:
+        return self._palette
+
+    def block_array(self):
+        """Return block ids as a (sx, sy, sz) uint16 NumPy array (requires numpy).
+
+        For flat storage this is a view that shares memory with the chunk;
+        writes through it bypass the chunk's bookkeeping, so callers that
+        mutate it must call `blocks_changed()`. Uniform and paletted chunks return a copy.
+        """
+        if np is None:
+            raise RuntimeError("numpy not available")
+        if self._blocks is None:
+            return np.full(self.size, self._uniform_id, dtype=np.uint16)
+        if self._palette:
+            return self._blocks.to_numpy().reshape(self.size)
+        return np.frombuffer(self._blocks, dtype=np.uint16).reshape(self.size)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate bytes held by block storage (excluding metadata)."""
+        if self._blocks is None:
+            return 0
+        if self._palette:
+            return self._blocks.nbytes
+        return len(self._blocks) * self._blocks.itemsize
+
+    def snapshot(self, include_meta: bool = False) -> ChunkSnapshot:
+        """Return a compact copy of the block ids for meshing off the main thread.
+
+        `include_meta` also copies the per-block metadata (needed for saving,
+        not for meshing).
+        """
+        meta = {idx: dict(data) for idx, data in self._meta.items()} if include_meta and self._meta else None
+        if self._blocks is None:
+            return ChunkSnapshot(self.position, self.size, self._uniform_id, None, meta)
+        blocks = self._blocks.to_array() if self._palette else self._blocks
+        return ChunkSnapshot(self.position, self.size, None, blocks.tobytes(), meta)
+
+    def update_hash(self, h) -> None:
+        """Feed the block ids into a hashlib object `h` (metadata is not included).
+
+        Equal digests mean equal contents; a flat and a paletted copy of the
+        same blocks may still hash differently.
+        """
+        if self._blocks is None:
+            h.update(b"u%d" % self._uniform_id)
+        elif self._palette:
+            h.update(b"p")
+            self._blocks.update_hash(h)
+        else:
+            h.update(b"f")
+            h.update(self._blocks)
+
+    @classmethod
+    def from_snapshot(cls, snap: ChunkSnapshot, palette: bool = False) -> "Chunk":
+        chunk = cls(snap.position, size=snap.size, palette=palette)
+        if snap.blocks is None:
+            chunk._uniform_id = snap.uniform_id
+        elif palette and np is not None:
+            chunk.load_blocks(np.frombuffer(snap.blocks, dtype=np.uint16))
+        else:
+            ids = array("H")
+            ids.frombytes(snap.blocks)
+            if palette:
+                chunk.load_blocks(ids)
+            else:
+                chunk._blocks = ids
+        if snap.meta:
+            chunk._meta.update(snap.meta)
+        chunk.modified = False
+        return chunk
+
+    def blocks_changed(self) -> None:
+        """Record writes made through the `block_array()` view (all sides may have changed)."""
+        self._heights = None
+        self.dirty = True
+        self.modified = True
+        self.version += 1
+        self.dirty_borders.update(FACE_AXES)
+
+    def mark_dirty(self):
+        self.dirty = True
+        self.version += 1
 
     def mark_clean(self):
         self.dirty = False
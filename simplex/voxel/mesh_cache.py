@@ -0,0 +1,98 @@
+"""
+Content-addressed cache of chunk meshes.
+
+Meshes are built in chunk-local coordinates, so two chunks with the same
+block ids and the same neighbour border layers produce the same mesh no
+matter where they are in the world. Generated terrain repeats a lot
+(all-air sky chunks, all-stone bedrock, identical flat columns), so
+`ChunkMeshSystem` keys meshes by `mesh_cache_key()` (a BLAKE2 digest of
+the chunk's block storage plus its border context) and reuses the
+vertex data, and the GPU handle once one is uploaded, for every
+duplicate chunk.
+"""
+
+import hashlib
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Callable, Dict, Optional
+
+from .chunk import FACE_AXES
+
+_NO_NEIGHBOR = b"\xff"
+
+
+@dataclass
+class CachedMesh:
+    vertices: Any
+    colors: Any
+    packed: Any = None
+    gpu: Optional[Dict[str, Any]] = None
+
+
+def mesh_cache_key(chunk, neighbors: Optional[Dict[str, list]] = None, *extra) -> bytes:
+    """Digest of everything a mesher reads: block ids, border layers and `extra` (e.g. mesher name)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((chunk.size, extra)).encode())
+    chunk.update_hash(h)
+    for face_key in FACE_AXES:
+        layer = neighbors.get(face_key) if neighbors else None
+        if layer is None:
+            h.update(_NO_NEIGHBOR)
+        else:
+            h.update(array("H", chain.from_iterable(layer)).tobytes())
+    return h.digest()
+
+
+class MeshCache:
+    """LRU map from `mesh_cache_key` digests to CachedMesh entries."""
+
+    def __init__(self, capacity: int = 256, on_evict: Optional[Callable[[CachedMesh], None]] = None):
+        self.capacity = max(1, int(capacity))
+        self.on_evict = on_evict
+        self._entries: "OrderedDict[bytes, CachedMesh]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._entries
+
+    def get(self, key: bytes) -> Optional[CachedMesh]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: bytes, entry: CachedMesh) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            _, old = self._entries.popitem(last=False)
+            self.evictions += 1
+            if self.on_evict:
+                self.on_evict(old)
+
+    def clear(self) -> None:
+        while self._entries:
+            _, old = self._entries.popitem(last=False)
+            if self.on_evict:
+                self.on_evict(old)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "capacity": self.capacity,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
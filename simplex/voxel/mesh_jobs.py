@@ -0,0 +1,58 @@
+"""
+Background chunk meshing.
+
+`MeshWorkerPool` runs meshers on `Chunk.snapshot()` copies on a
+`WorkerPool` (process pool with a thread fallback), so meshing no longer
+blocks the frame. On the thread fallback NumPy's vectorized mesher still
+releases the GIL for most of its work.
+
+Jobs only receive plain data (the snapshot, the neighbours' border layers
+and the mesher name), so results can be computed in any order and the
+caller decides whether a result is still current.
+"""
+
+from concurrent.futures import Future
+from typing import Dict, Optional
+
+from simplex.utils.worker_pool import WorkerPool
+from .chunk import Chunk, ChunkSnapshot
+from .meshgen import generate_naive_mesh, get_mesher
+from .mesh_packing import pack_mesh
+
+
+def mesh_snapshot(
+    snapshot: ChunkSnapshot,
+    mesher: str = "greedy",
+    neighbors: Optional[Dict[str, list]] = None,
+    vertex_format: str = "float",
+):
+    """Mesh a chunk snapshot; runs inside a worker.
+
+    Returns (vertices, colors, packed). With a packed `vertex_format` the
+    float lists are returned empty so only the packed bytes cross the
+    process boundary.
+    """
+    chunk = Chunk.from_snapshot(snapshot)
+    try:
+        verts, cols = get_mesher(mesher)(chunk, neighbors)
+    except Exception:
+        verts, cols = generate_naive_mesh(chunk, neighbors)
+    if vertex_format != "float":
+        return [], [], pack_mesh(verts, cols, vertex_format)
+    return verts, cols, None
+
+
+class MeshWorkerPool(WorkerPool):
+    """WorkerPool that runs `mesh_snapshot` jobs."""
+
+    def __init__(self, workers: int = 2, kind: str = "process"):
+        super().__init__(workers, kind, name="mesh")
+
+    def submit(
+        self,
+        snapshot: ChunkSnapshot,
+        mesher: str,
+        neighbors: Optional[Dict[str, list]] = None,
+        vertex_format: str = "float",
+    ) -> Future:
+        return super().submit(mesh_snapshot, snapshot, mesher, neighbors, vertex_format)
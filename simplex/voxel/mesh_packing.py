@@ -0,0 +1,162 @@
+"""
+Packed, indexed vertex format for chunk meshes.
+
+The meshers emit 6 unindexed float vertices per quad (3 position floats
+plus 4 color floats, 28 bytes per vertex). `pack_mesh` converts that
+output into 4 vertices per quad in a single interleaved buffer:
+
+    int16 x, y, z, pad | uint32 RGBA8 color   (12 bytes, "int16")
+    uint8 x, y, z, pad | uint32 RGBA8 color   (8 bytes, "uint8")
+
+Chunk-local positions are small integers, so they pack losslessly. The
+color already has the face light applied by the mesher and is stored as
+four bytes (r, g, b, a) in one uint32. Triangles come from a shared quad
+index pattern (0,1,2, 0,2,3 per quad), see `quad_indices`, so one index
+buffer serves every chunk mesh. `int16` positions work with the
+fixed-function `glVertexPointer(GL_SHORT)`; `uint8` is for shader-based
+pipelines using generic vertex attributes.
+"""
+
+import struct
+from array import array
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# position type -> (struct format, stride, color offset)
+_FORMATS = {
+    "int16": ("<3hxxI", 12, 8),
+    "uint8": ("<3BxI", 8, 4),
+}
+_POSITION_RANGE = {"int16": (-32768, 32767), "uint8": (0, 255)}
+
+# flat vertex slots of the quad corners in the 6-vertex (0,1,2)(0,2,3) layout
+_QUAD_CORNERS = (0, 1, 2, 5)
+
+
+@dataclass
+class PackedMesh:
+    data: bytes
+    vertex_count: int
+    quad_count: int
+    position_type: str = "int16"
+    stride: int = 12
+    color_offset: int = 8
+
+    @property
+    def index_count(self) -> int:
+        return self.quad_count * 6
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data)
+
+
+def _pack_color(r: float, g: float, b: float, a: float) -> int:
+    def _byte(c):
+        return max(0, min(255, int(round(c * 255))))
+
+    return _byte(r) | (_byte(g) << 8) | (_byte(b) << 16) | (_byte(a) << 24)
+
+
+def pack_mesh(vertices, colors, position_type: str = "int16") -> PackedMesh:
+    """Pack mesher output (6 vertices per quad) into an indexed interleaved buffer."""
+    if position_type not in _FORMATS:
+        raise ValueError(f"Unknown position type '{position_type}', expected one of {sorted(_FORMATS)}")
+    fmt, stride, color_offset = _FORMATS[position_type]
+    lo, hi = _POSITION_RANGE[position_type]
+    quad_count = len(vertices) // 18
+
+    if np is not None:
+        data = _pack_numpy(vertices, colors, quad_count, position_type, lo, hi)
+    else:
+        data = _pack_python(vertices, colors, quad_count, fmt, lo, hi)
+
+    return PackedMesh(
+        data=data,
+        vertex_count=quad_count * 4,
+        quad_count=quad_count,
+        position_type=position_type,
+        stride=stride,
+        color_offset=color_offset,
+    )
+
+
+def _vertex_dtype(position_type: str):
+    pos = np.int16 if position_type == "int16" else np.uint8
+    return np.dtype([("pos", pos, 3), ("pad", pos), ("color", "<u4")])
+
+
+def _pack_numpy(vertices, colors, quad_count, position_type, lo, hi) -> bytes:
+    verts = np.asarray(vertices, dtype=np.float32).reshape(quad_count, 6, 3)
+    cols = np.asarray(colors, dtype=np.float32).reshape(quad_count, 6, 4)
+    corners = list(_QUAD_CORNERS)
+    pos = verts[:, corners].reshape(-1, 3)
+    if pos.size and (pos.min() < lo or pos.max() > hi):
+        raise ValueError(f"Vertex positions out of range for {position_type}")
+    rgba = np.clip(np.rint(cols[:, corners].reshape(-1, 4) * 255), 0, 255).astype(np.uint8)
+
+    out = np.zeros(quad_count * 4, dtype=_vertex_dtype(position_type))
+    out["pos"] = pos
+    out["color"] = rgba.view("<u4").reshape(-1)
+    return out.tobytes()
+
+
+def _pack_python(vertices, colors, quad_count, fmt, lo, hi) -> bytes:
+    packer = struct.Struct(fmt)
+    buf = bytearray(packer.size * quad_count * 4)
+    offset = 0
+    for q in range(quad_count):
+        for corner in _QUAD_CORNERS:
+            vi = (q * 6 + corner) * 3
+            ci = (q * 6 + corner) * 4
+            x, y, z = (int(vertices[vi + k]) for k in range(3))
+            if not (lo <= x <= hi and lo <= y <= hi and lo <= z <= hi):
+                raise ValueError("Vertex positions out of range for packed format")
+            packer.pack_into(buf, offset, x, y, z, _pack_color(*colors[ci : ci + 4]))
+            offset += packer.size
+    return bytes(buf)
+
+
+def unpack_mesh(packed: PackedMesh) -> Tuple[List[float], List[float]]:
+    """Expand a PackedMesh back to the meshers' 6-vertex float lists.
+
+    Used for immediate-mode fallback drawing and tests; colors come back
+    quantized to 8 bits per channel.
+    """
+    fmt = _FORMATS[packed.position_type][0]
+    verts: List[float] = []
+    cols: List[float] = []
+    corners = [v[:4] for v in struct.iter_unpack(fmt, packed.data)]
+    for q in range(packed.quad_count):
+        quad = corners[q * 4 : q * 4 + 4]
+        for idx in (0, 1, 2, 0, 2, 3):
+            x, y, z, color = quad[idx]
+            verts.extend([float(x), float(y), float(z)])
+            cols.extend([((color >> shift) & 0xFF) / 255.0 for shift in (0, 8, 16, 24)])
+    return verts, cols
+
+
+def index_type_for(quad_count: int) -> str:
+    """Smallest index type ('uint16' or 'uint32') that can address `quad_count` quads."""
+    return "uint16" if quad_count * 4 <= 0x10000 else "uint32"
+
+
+def quad_indices(quad_count: int, index_type: Optional[str] = None) -> bytes:
+    """Shared triangle index data for `quad_count` quads (0,1,2, 0,2,3 per quad)."""
+    index_type = index_type or index_type_for(quad_count)
+    typecode = "H" if index_type == "uint16" else "I"
+    if np is not None:
+        base = (np.arange(quad_count, dtype=np.uint32) * 4)[:, None]
+        idx = base + np.array([0, 1, 2, 0, 2, 3], dtype=np.uint32)
+        dtype = np.uint16 if typecode == "H" else np.uint32
+        return idx.astype(dtype).tobytes()
+    out = array(typecode)
+    for q in range(quad_count):
+        b = q * 4
+        out.extend((b, b + 1, b + 2, b, b + 2, b + 3))
+    return out.tobytes()
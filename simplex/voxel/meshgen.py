@@ -1,13 +1,21 @@
 """
-Naive mesh generator for Chunk data.
+Mesh generators for Chunk data.
 
 Produces a list of quads (as 6-vertex triangles) suitable for a simple
-immediate-mode renderer. This is a reference implementation used in
-unit tests and early renderer integration.
+immediate-mode renderer. The naive mesher is a reference implementation
+used in unit tests and early renderer integration; the greedy mesher
+merges coplanar faces, and the vectorized mesher does the same work with
+NumPy array operations when numpy is installed. `get_mesher()` selects
+one by name.
 """
 
 from typing import List, Tuple
-from .voxel import get_block_color
+from .voxel import BLOCK_AIR, PALETTE, get_block_color
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 # Cube faces with vertex offsets (each face is two triangles, 6 vertices)
@@ -24,28 +32,38 @@ _FACE_DELTAS = {
 _TRI_IDX = [(0, 1, 2), (0, 2, 3)]
 
 
-def generate_naive_mesh(chunk) -> Tuple[List[float], List[float]]:
+def generate_naive_mesh(chunk, neighbors=None) -> Tuple[List[float], List[float]]:
     """Generate a naive mesh for the given chunk.
 
     Returns (vertices, colors) where vertices is a flat list of floats
     (x,y,z) per vertex and colors is a matching flat list of floats
     (r,g,b,a) per vertex.
+
+    `neighbors` optionally maps face keys ("px", "nx", ...) to the facing
+    border layer of the adjacent chunk (see `Chunk.border_layer`); faces
+    against solid neighbour cells are culled. Missing entries are air.
     """
     verts: List[float] = []
     cols: List[float] = []
 
     sx, sy, sz = chunk.size
 
+    uniform = getattr(chunk, "uniform_id", None)
+    if uniform == BLOCK_AIR:
+        return verts, cols
+    if uniform is not None:
+        _naive_uniform_shell(chunk, uniform, verts, cols, neighbors)
+        return verts, cols
+
     for x in range(sx):
         for y in range(sy):
             for z in range(sz):
-                v = chunk.get_block(x, y, z)
-                if v.is_air():
+                bid = chunk.get_block_id(x, y, z)
+                if bid == BLOCK_AIR:
                     continue
-                bid = v.block_id
                 color = get_block_color(bid)
                 # For each face, check neighbor; if neighbor is air, emit face
-                neighbors = [
+                adjacent = [
                     (x + 1, y, z, "px"),
                     (x - 1, y, z, "nx"),
                     (x, y + 1, z, "py"),
@@ -53,53 +71,141 @@ def generate_naive_mesh(chunk) -> Tuple[List[float], List[float]]:
                     (x, y, z + 1, "pz"),
                     (x, y, z - 1, "nz"),
                 ]
-                for nx, ny, nz, face_key in neighbors:
+                for nx, ny, nz, face_key in adjacent:
                     if 0 <= nx < sx and 0 <= ny < sy and 0 <= nz < sz:
-                        n = chunk.get_block(nx, ny, nz)
-                        if not n.is_air():
+                        if chunk.get_block_id(nx, ny, nz) != BLOCK_AIR:
                             continue
-                    # neighbor out of bounds is treated as air
-                    # emit quad for this face
-                    quad = _FACE_DELTAS[face_key][0]
-                    # simple face-based lighting: top faces brighter, bottom darker, sides intermediate
-                    if face_key == "py":
-                        intensity = 1.0
-                    elif face_key == "ny":
-                        intensity = 0.6
-                    else:
-                        intensity = 0.8
-                    for tri in _TRI_IDX:
-                        for idx in tri:
-                            ox, oy, oz = quad[idx]
-                            vx = x + ox
-                            vy = y + oy
-                            vz = z + oz
-                            verts.extend([vx, vy, vz])
-                            # apply intensity to rgb, keep alpha
-                            r, g, b, a = color
-                            cols.extend([r * intensity, g * intensity, b * intensity, a])
+                    elif neighbors and _outside_id(neighbors, chunk.size, nx, ny, nz) != BLOCK_AIR:
+                        continue
+                    # neighbor out of bounds (and not loaded) is treated as air
+                    _emit_unit_face(verts, cols, x, y, z, face_key, color)
 
     return verts, cols
 
 
-def generate_greedy_mesh(chunk) -> Tuple[List[float], List[float]]:
+def _outside_id(neighbors, size, x, y, z) -> int:
+    """Block id of a cell one step outside the chunk, read from neighbour layers."""
+    sx, sy, sz = size
+    if x >= sx:
+        layer, a, b = neighbors.get("px"), y, z
+    elif x < 0:
+        layer, a, b = neighbors.get("nx"), y, z
+    elif y >= sy:
+        layer, a, b = neighbors.get("py"), x, z
+    elif y < 0:
+        layer, a, b = neighbors.get("ny"), x, z
+    elif z >= sz:
+        layer, a, b = neighbors.get("pz"), x, y
+    else:
+        layer, a, b = neighbors.get("nz"), x, y
+    if layer is None:
+        return BLOCK_AIR
+    return layer[a][b]
+
+
+def _layer_state(layer):
+    """Classify a neighbour layer as 'air', 'solid' (no air cells) or 'mixed'."""
+    if layer is None:
+        return "air"
+    has_air = False
+    has_solid = False
+    for row in layer:
+        for block_id in row:
+            if block_id == BLOCK_AIR:
+                has_air = True
+            else:
+                has_solid = True
+            if has_air and has_solid:
+                return "mixed"
+    return "solid" if has_solid else "air"
+
+
+def _face_intensity(face_key: str) -> float:
+    """Simple face-based lighting: top faces brighter, bottom darker, sides intermediate."""
+    if face_key == "py":
+        return 1.0
+    if face_key == "ny":
+        return 0.6
+    return 0.8
+
+
+def _emit_unit_face(verts, cols, x, y, z, face_key, color) -> None:
+    """Append the two triangles of one block face at (x, y, z)."""
+    quad = _FACE_DELTAS[face_key][0]
+    intensity = _face_intensity(face_key)
+    r, g, b, a = color
+    for tri in _TRI_IDX:
+        for idx in tri:
+            ox, oy, oz = quad[idx]
+            verts.extend([x + ox, y + oy, z + oz])
+            # apply intensity to rgb, keep alpha
+            cols.extend([r * intensity, g * intensity, b * intensity, a])
+
+
+def _naive_uniform_shell(chunk, block_id, verts, cols, neighbors=None) -> None:
+    """Naive mesh of a chunk filled with one solid id: only border cells have faces.
+
+    Visits cells in the same order as the full scan so output is identical,
+    but skips the interior of each x/y column.
+    """
+    sx, sy, sz = chunk.size
+    if neighbors:
+        states = {face: _layer_state(neighbors.get(face)) for face in _FACE_ORDER}
+        if all(state == "solid" for state in states.values()):
+            return  # fully enclosed
+    color = get_block_color(block_id)
+
+    def _emit(x, y, z, face_key, ox, oy, oz):
+        if neighbors and _outside_id(neighbors, chunk.size, x + ox, y + oy, z + oz) != BLOCK_AIR:
+            return
+        _emit_unit_face(verts, cols, x, y, z, face_key, color)
+
+    edge_z = (0, sz - 1) if sz > 1 else (0,)
+    for x in range(sx):
+        edge_x = x == 0 or x == sx - 1
+        for y in range(sy):
+            zs = range(sz) if edge_x or y == 0 or y == sy - 1 else edge_z
+            for z in zs:
+                if x == sx - 1:
+                    _emit(x, y, z, "px", 1, 0, 0)
+                if x == 0:
+                    _emit(x, y, z, "nx", -1, 0, 0)
+                if y == sy - 1:
+                    _emit(x, y, z, "py", 0, 1, 0)
+                if y == 0:
+                    _emit(x, y, z, "ny", 0, -1, 0)
+                if z == sz - 1:
+                    _emit(x, y, z, "pz", 0, 0, 1)
+                if z == 0:
+                    _emit(x, y, z, "nz", 0, 0, -1)
+
+
+def generate_greedy_mesh(chunk, neighbors=None) -> Tuple[List[float], List[float]]:
     """Greedy meshing implementation adapted for axis-aligned block grids.
 
     Produces the same output format as generate_naive_mesh (flat vertex and
     color lists) but merges adjacent faces into larger quads to significantly
     reduce vertex count. This implementation follows the standard 3-pass
-    greedy meshing algorithm (one pass per axis).
+    greedy meshing algorithm (one pass per axis). `neighbors` works as in
+    generate_naive_mesh.
     """
-    verts: List[float] = []
-    cols: List[float] = []
-
     sx, sy, sz = chunk.size
 
-    # Helper to safely get block id at coords, returns 0 for air/out-of-bounds
+    uniform = getattr(chunk, "uniform_id", None)
+    if uniform == BLOCK_AIR:
+        return [], []
+    if uniform is not None:
+        shell = _uniform_shell_faces(chunk.size, uniform, neighbors)
+        if shell is not None:
+            return _flatten_faces(shell)
+
+    # Helper to safely get block id at coords; out-of-bounds cells come from
+    # the neighbour layers when given, otherwise they are air
     def _block_id(x, y, z):
         if 0 <= x < sx and 0 <= y < sy and 0 <= z < sz:
-            v = chunk.get_block(x, y, z)
-            return 0 if v.is_air() else v.block_id
+            return chunk.get_block_id(x, y, z)
+        if neighbors:
+            return _outside_id(neighbors, chunk.size, x, y, z)
         return 0
 
     # collect faces as tuples (face_key, quad_verts, color)
@@ -131,10 +237,12 @@ def generate_greedy_mesh(chunk) -> Tuple[List[float], List[float]]:
                     b[v] = j
                     ida = _block_id(a[0], a[1], a[2])
                     idb = _block_id(b[0], b[1], b[2])
-                    # face exists when one side is filled and other empty
-                    if ida != 0 and idb == 0:
+                    # face exists when one side is filled and other empty;
+                    # faces of neighbour blocks (q == 0 front, q == dd back)
+                    # belong to the neighbour's mesh
+                    if ida != 0 and idb == 0 and q > 0:
                         mask[i + j * du] = ida  # front face
-                    elif ida == 0 and idb != 0:
+                    elif ida == 0 and idb != 0 and q < dd:
                         mask[i + j * du] = -idb  # back face (negative marker)
                     else:
                         mask[i + j * du] = 0
@@ -163,55 +271,9 @@ def generate_greedy_mesh(chunk) -> Tuple[List[float], List[float]]:
                                 break
                         if not done:
                             h += 1
-                    # Emit quad for this run
-                    # base coordinate in 3D
-                    base = [0.0, 0.0, 0.0]
-                    base[d] = float(q) if mval > 0 else float(q)  # plane position
-                    base[u] = float(i)
-                    base[v] = float(j)
-
-                    block_id = abs(mval)
-                    color = get_block_color(block_id)
-
-                    # Compute four corners of the quad in world space
-                    # Corners are ordered to form two triangles
-                    # We need to map (du, dv) extents into (x,y,z)
-                    # corner offsets (0,0), (w,0), (w,h), (0,h)
-                    def _corner(off_u, off_v):
-                        c = [0.0, 0.0, 0.0]
-                        c[d] = base[d]
-                        c[u] = base[u] + off_u
-                        c[v] = base[v] + off_v
-                        # shift face along normal if front face so it sits on voxel face
-                        if mval > 0:
-                            # front face corresponds to side where a was filled and b empty -> at q
-                            c[d] = float(q)
-                        else:
-                            # back face corresponds to side where b was filled -> at q
-                            c[d] = float(q)
-                        return tuple(c)
-
-                    c0 = _corner(0, 0)
-                    c1 = _corner(w, 0)
-                    c2 = _corner(w, h)
-                    c3 = _corner(0, h)
-
-                    # For correct winding, flip order for back faces
-                    if mval > 0:
-                        quad_verts = [c0, c1, c2, c3]
-                    else:
-                        quad_verts = [c1, c0, c3, c2]
-
-                    # Determine face key mapping to match naive mesher ordering
-                    if d == 0:
-                        face_key = 'px' if mval > 0 else 'nx'
-                    elif d == 1:
-                        face_key = 'py' if mval > 0 else 'ny'
-                    else:
-                        face_key = 'pz' if mval > 0 else 'nz'
 
                     # store face (we will sort and flatten later to match naive ordering)
-                    faces.append((face_key, quad_verts, color, mval))
+                    faces.append(_greedy_face(d, q, i, j, w, h, mval))
 
                     # Zero out mask for covered area
                     for jj in range(h):
@@ -223,9 +285,77 @@ def generate_greedy_mesh(chunk) -> Tuple[List[float], List[float]]:
                 # advance i after finishing the column
                 i += 1
 
-    # Flatten faces in a deterministic order matching naive neighbor order
-    order = {'px': 0, 'nx': 1, 'py': 2, 'ny': 3, 'pz': 4, 'nz': 5}
-    # sort by face order then by centroid to have predictable ordering
+    return _flatten_faces(faces)
+
+
+_AXIS_FACE_KEYS = (("px", "nx"), ("py", "ny"), ("pz", "nz"))
+_FACE_ORDER = {"px": 0, "nx": 1, "py": 2, "ny": 3, "pz": 4, "nz": 5}
+
+
+def _greedy_face(d, q, i, j, w, h, mval):
+    """Build a (face_key, quad_verts, color, mval) record for a merged quad.
+
+    The quad lies in plane `q` of axis `d` and spans (w, h) cells from
+    (i, j) along the two other axes. Positive `mval` marks a front face
+    (filled cell on the q-1 side), negative a back face.
+    """
+    u = (d + 1) % 3
+    v = (d + 2) % 3
+
+    # corner offsets (0,0), (w,0), (w,h), (0,h) mapped into (x,y,z)
+    def _corner(off_u, off_v):
+        c = [0.0, 0.0, 0.0]
+        c[d] = float(q)
+        c[u] = float(i) + off_u
+        c[v] = float(j) + off_v
+        return tuple(c)
+
+    c0 = _corner(0, 0)
+    c1 = _corner(w, 0)
+    c2 = _corner(w, h)
+    c3 = _corner(0, h)
+
+    # For correct winding, flip order for back faces
+    if mval > 0:
+        quad_verts = [c0, c1, c2, c3]
+    else:
+        quad_verts = [c1, c0, c3, c2]
+
+    face_key = _AXIS_FACE_KEYS[d][0 if mval > 0 else 1]
+    return (face_key, quad_verts, get_block_color(abs(mval)), mval)
+
+
+def _uniform_shell_faces(size, block_id, neighbors=None):
+    """Greedy faces of a chunk filled with one solid id: one quad per side.
+
+    Sides facing a fully solid neighbour layer are dropped (a fully
+    enclosed chunk yields no faces). Returns None when some neighbour
+    layer is partly solid, in which case the caller needs the full scan.
+    """
+    dims = list(size)
+    faces = []
+    for d in range(3):
+        du = dims[(d + 1) % 3]
+        dv = dims[(d + 2) % 3]
+        back_key, front_key = _AXIS_FACE_KEYS[d][1], _AXIS_FACE_KEYS[d][0]
+        for face_key, q, mval in ((back_key, 0, -block_id), (front_key, dims[d], block_id)):
+            state = _layer_state(neighbors.get(face_key)) if neighbors else "air"
+            if state == "mixed":
+                return None
+            if state == "air":
+                faces.append(_greedy_face(d, q, 0, 0, du, dv, mval))
+    return faces
+
+
+def _flatten_faces(faces) -> Tuple[List[float], List[float]]:
+    """Flatten greedy face records into (vertices, colors) lists.
+
+    Faces are emitted in a deterministic order matching the naive
+    neighbor order, then by centroid.
+    """
+    verts: List[float] = []
+    cols: List[float] = []
+
     def _centroid(quad):
         qv = quad
         cx = (qv[0][0] + qv[1][0] + qv[2][0] + qv[3][0]) / 4.0
@@ -233,21 +363,159 @@ def generate_greedy_mesh(chunk) -> Tuple[List[float], List[float]]:
         cz = (qv[0][2] + qv[1][2] + qv[2][2] + qv[3][2]) / 4.0
         return (cx, cy, cz)
 
-    faces.sort(key=lambda f: (order.get(f[0], 99), _centroid(f[1])))
+    faces.sort(key=lambda f: (_FACE_ORDER.get(f[0], 99), _centroid(f[1])))
 
     # Now flatten using the same triangle ordering and intensity mapping as naive
-    for face_key, quad_verts, color, mval in faces:
-        if face_key == 'py':
-            intensity = 1.0
-        elif face_key == 'ny':
-            intensity = 0.6
-        else:
-            intensity = 0.8
-        for tri in [(0, 1, 2), (0, 2, 3)]:
+    for face_key, quad_verts, color, _mval in faces:
+        intensity = _face_intensity(face_key)
+        r, g, b, a = color
+        for tri in _TRI_IDX:
             for idx_tri in tri:
                 vx, vy, vz = quad_verts[idx_tri]
                 verts.extend([vx, vy, vz])
-                r, g, b, a = color
                 cols.extend([r * intensity, g * intensity, b * intensity, a])
 
     return verts, cols
+
+
+def _color_table():
+    """(max_id + 1, 4) float32 lookup of palette colors; unknown ids map to air."""
+    size = max(PALETTE) + 1
+    table = np.zeros((size, 4), dtype=np.float32)
+    for block_id in range(size):
+        table[block_id] = get_block_color(block_id)
+    return table
+
+
+# Face intensity per axis as (front, back): x, y, z
+_AXIS_INTENSITY = ((0.8, 0.8), (1.0, 0.6), (0.8, 0.8))
+
+
+def _neighbor_plane(neighbors, face_key, d, shape):
+    """Neighbour border layer for `face_key` as a (1, du, dv) int32 array."""
+    layer = neighbors.get(face_key) if neighbors else None
+    if layer is None:
+        return np.zeros((1,) + shape, dtype=np.int32)
+    plane = np.asarray(layer, dtype=np.int32)
+    # layers are indexed by the remaining axes in increasing order; the
+    # y axis frame is (z, x), so its layer needs a transpose
+    if d == 1:
+        plane = plane.T
+    return plane.reshape((1,) + shape)
+
+
+def _axis_quads(ids, d, neighbors=None):
+    """Return merged quads for faces perpendicular to axis `d`.
+
+    Builds the face mask for every slice of the axis at once by comparing
+    the block grid with a copy shifted by one cell (out-of-bounds cells
+    come from the neighbour layers, or are air), then merges faces into
+    rectangles: first runs along the v axis, then identical runs in
+    consecutive u rows. Returns arrays (q, i, j, w, h, val) in the
+    axis-local (d, u, v) frame.
+    """
+    u = (d + 1) % 3
+    v = (d + 2) % 3
+    # Reorder to (d, u, v) so slices are the leading axis
+    grid = np.transpose(ids, (d, u, v)).astype(np.int32)
+    front_key, back_key = _AXIS_FACE_KEYS[d]
+    low = _neighbor_plane(neighbors, back_key, d, grid.shape[1:])
+    high = _neighbor_plane(neighbors, front_key, d, grid.shape[1:])
+    a = np.concatenate((low, grid))  # cell on side q-1
+    b = np.concatenate((grid, high))  # cell on side q
+    mask = np.where((a != 0) & (b == 0), a, 0) - np.where((a == 0) & (b != 0), b, 0)
+    # faces of neighbour blocks belong to the neighbour's mesh
+    mask[0][mask[0] > 0] = 0
+    mask[-1][mask[-1] < 0] = 0
+
+    nonzero = mask != 0
+    same_prev = np.zeros_like(nonzero)
+    same_prev[:, :, 1:] = mask[:, :, 1:] == mask[:, :, :-1]
+    same_next = np.zeros_like(nonzero)
+    same_next[:, :, :-1] = same_prev[:, :, 1:]
+    q, i, j = np.nonzero(nonzero & ~same_prev)
+    _, _, j_end = np.nonzero(nonzero & ~same_next)
+    h = j_end - j + 1
+    val = mask[q, i, j]
+    if q.size == 0:
+        return q, i, j, h, h, val
+
+    # Merge runs with the same (q, j, h, val) in consecutive rows i
+    order = np.lexsort((i, val, h, j, q))
+    q, i, j, h, val = q[order], i[order], j[order], h[order], val[order]
+    new_rect = np.ones(q.size, dtype=bool)
+    new_rect[1:] = ~(
+        (q[1:] == q[:-1])
+        & (j[1:] == j[:-1])
+        & (h[1:] == h[:-1])
+        & (val[1:] == val[:-1])
+        & (i[1:] == i[:-1] + 1)
+    )
+    starts = np.flatnonzero(new_rect)
+    w = np.diff(np.append(starts, q.size))
+    return q[starts], i[starts], j[starts], w, h[starts], val[starts]
+
+
+def generate_vectorized_mesh(chunk, neighbors=None):
+    """NumPy greedy mesher working on the chunk's raw block-id array.
+
+    Returns (vertices, colors) as flat float32 arrays in the same layout as
+    generate_greedy_mesh (x,y,z and r,g,b,a per vertex, 6 vertices per
+    quad). Quads are merged row-by-row rather than with the exact greedy
+    sweep, so the quad set can differ while covering the same area.
+    `neighbors` works as in generate_naive_mesh. Requires numpy.
+    """
+    if np is None:
+        raise RuntimeError("numpy not available")
+    if getattr(chunk, "uniform_id", None) == BLOCK_AIR:
+        return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32)
+
+    ids = chunk.block_array()
+    colors = _color_table()
+    vert_parts = []
+    col_parts = []
+    for d in range(3):
+        q, i, j, w, h, val = _axis_quads(ids, d, neighbors)
+        if q.size == 0:
+            continue
+        front = val > 0
+        # corners (q,i,j), (q,i+w,j), (q,i+w,j+h), (q,i,j+h) in the (d,u,v) frame
+        cu = np.stack((i, i + w, i + w, i), axis=1)
+        cv = np.stack((j, j, j + h, j + h), axis=1)
+        # back faces use the flipped winding [c1, c0, c3, c2]
+        flip = np.array([1, 0, 3, 2])
+        cu[~front] = cu[~front][:, flip]
+        cv[~front] = cv[~front][:, flip]
+        tri = np.array([0, 1, 2, 0, 2, 3])
+        quad = np.empty((q.size, 6, 3), dtype=np.float32)
+        quad[:, :, d] = q[:, None]
+        quad[:, :, (d + 1) % 3] = cu[:, tri]
+        quad[:, :, (d + 2) % 3] = cv[:, tri]
+        vert_parts.append(quad.reshape(-1))
+
+        block_ids = np.abs(val)
+        block_ids[block_ids >= len(colors)] = BLOCK_AIR
+        rgba = colors[block_ids].copy()
+        front_i, back_i = _AXIS_INTENSITY[d]
+        rgba[:, :3] *= np.where(front, front_i, back_i).astype(np.float32)[:, None]
+        col_parts.append(np.repeat(rgba, 6, axis=0).reshape(-1))
+
+    if not vert_parts:
+        return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32)
+    return np.concatenate(vert_parts), np.concatenate(col_parts)
+
+
+# Meshers selectable by name (e.g. ChunkMeshSystem(mesher="vectorized"))
+MESHERS = {
+    "naive": generate_naive_mesh,
+    "greedy": generate_greedy_mesh,
+    "vectorized": generate_vectorized_mesh,
+}
+
+
+def get_mesher(name: str):
+    """Return the mesher function registered under `name`."""
+    try:
+        return MESHERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown mesher '{name}', expected one of {sorted(MESHERS)}")
@@ -0,0 +1,172 @@
+"""
+Palette-compressed block storage for chunks.
+
+Most chunks only contain a handful of distinct block ids, so instead of a
+uint16 per cell we keep a small per-chunk palette of ids and store each
+cell as a bit-packed index into it. Index width grows through 1/2/4/8/16
+bits as new ids are written, which keeps a typical terrain chunk (air +
+a few solids) at 1-2 bits per cell.
+
+`PalettedStorage` supports the same `storage[i]` / `storage[i] = id` /
+`len()` / iteration protocol as `array('H')`, so `Chunk` can use either
+backing store without branching on every access.
+"""
+
+from array import array
+from typing import Dict, Iterator, List
+
+from .voxel import BLOCK_AIR
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Supported index widths; each divides 8 (or is 16) so no index straddles a byte.
+_WIDTHS = (1, 2, 4, 8, 16)
+
+
+def _bits_for(palette_len: int) -> int:
+    for bits in _WIDTHS:
+        if palette_len <= (1 << bits):
+            return bits
+    raise ValueError(f"Palette too large: {palette_len} entries")
+
+
+class PalettedStorage:
+    """Flat block-id storage using a local palette and bit-packed indices."""
+
+    def __init__(self, volume: int, fill: int = BLOCK_AIR):
+        self._volume = int(volume)
+        self.palette: List[int] = [int(fill)]
+        self._lookup: Dict[int, int] = {int(fill): 0}
+        self.bits = _WIDTHS[0]
+        self._mask = (1 << self.bits) - 1
+        self._data = self._allocate(self.bits)
+
+    @classmethod
+    def from_numpy(cls, ids) -> "PalettedStorage":
+        """Build storage from a flat NumPy array of block ids in one pass."""
+        if np is None:
+            raise RuntimeError("numpy not available")
+        ids = np.asarray(ids).reshape(-1)
+        palette, inverse = np.unique(ids, return_inverse=True)
+        store = cls(len(ids), int(palette[0]))
+        store.palette = [int(p) for p in palette]
+        store._lookup = {bid: i for i, bid in enumerate(store.palette)}
+        store.bits = _bits_for(len(store.palette))
+        store._mask = (1 << store.bits) - 1
+        if store.bits == 16:
+            store._data = array("H", inverse.astype(np.uint16).tobytes())
+        elif store.bits == 8:
+            store._data = bytearray(inverse.astype(np.uint8).tobytes())
+        else:
+            shifts = np.arange(store.bits, dtype=np.uint8)
+            bitplanes = (inverse.astype(np.uint8)[:, None] >> shifts) & 1
+            store._data = bytearray(np.packbits(bitplanes.reshape(-1), bitorder="little").tobytes())
+        return store
+
+    def _allocate(self, bits: int):
+        if bits == 16:
+            return array("H", bytes(2 * self._volume))
+        return bytearray((self._volume * bits + 7) // 8)
+
+    def __len__(self) -> int:
+        return self._volume
+
+    def __getitem__(self, i: int) -> int:
+        bits = self.bits
+        if bits == 16:
+            return self.palette[self._data[i]]
+        off = i * bits
+        return self.palette[(self._data[off >> 3] >> (off & 7)) & self._mask]
+
+    def __setitem__(self, i: int, block_id: int) -> None:
+        pi = self._lookup.get(block_id)
+        if pi is None:
+            pi = self._add_to_palette(block_id)
+        bits = self.bits
+        if bits == 16:
+            self._data[i] = pi
+            return
+        off = i * bits
+        byte = off >> 3
+        shift = off & 7
+        data = self._data
+        data[byte] = (data[byte] & ~(self._mask << shift)) | (pi << shift)
+
+    def __iter__(self) -> Iterator[int]:
+        palette = self.palette
+        for pi in self.iter_indices():
+            yield palette[pi]
+
+    def iter_indices(self) -> Iterator[int]:
+        """Yield raw palette indices in cell order."""
+        bits = self.bits
+        if bits == 16:
+            yield from self._data
+            return
+        mask = self._mask
+        per_byte = 8 // bits
+        remaining = self._volume
+        for byte in self._data:
+            for k in range(min(per_byte, remaining)):
+                yield (byte >> (k * bits)) & mask
+            remaining -= per_byte
+            if remaining <= 0:
+                break
+
+    def _add_to_palette(self, block_id: int) -> int:
+        block_id = int(block_id)
+        pi = len(self.palette)
+        if pi + 1 > (1 << self.bits):
+            self._resize(_bits_for(pi + 1))
+        self.palette.append(block_id)
+        self._lookup[block_id] = pi
+        return pi
+
+    def _resize(self, bits: int) -> None:
+        """Re-pack all indices at a new width."""
+        indices = list(self.iter_indices())
+        self.bits = bits
+        self._mask = (1 << bits) - 1
+        if bits == 16:
+            self._data = array("H", indices)
+            return
+        data = self._data = self._allocate(bits)
+        for i, pi in enumerate(indices):
+            if pi:
+                off = i * bits
+                data[off >> 3] |= pi << (off & 7)
+
+    def to_array(self) -> array:
+        """Return the decoded block ids as a new array('H')."""
+        return array("H", iter(self))
+
+    def to_numpy(self):
+        """Return the decoded block ids as a flat uint16 NumPy array."""
+        if np is None:
+            raise RuntimeError("numpy not available")
+        lut = np.asarray(self.palette, dtype=np.uint16)
+        if self.bits == 16:
+            indices = np.frombuffer(self._data, dtype=np.uint16)
+        elif self.bits == 8:
+            indices = np.frombuffer(self._data, dtype=np.uint8)
+        else:
+            raw = np.unpackbits(np.frombuffer(self._data, dtype=np.uint8), bitorder="little")
+            weights = (1 << np.arange(self.bits, dtype=np.uint8)).astype(np.uint8)
+            indices = raw.reshape(-1, self.bits) @ weights
+        return lut[indices[: self._volume]]
+
+    def update_hash(self, h) -> None:
+        """Feed the palette and packed indices into a hashlib object `h`."""
+        h.update(b"%d:" % self.bits)
+        h.update(array("H", self.palette).tobytes())
+        h.update(self._data)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate bytes held by the packed indices and the palette."""
+        data = self._data
+        packed = len(data) * (data.itemsize if isinstance(data, array) else 1)
+        return packed + 2 * len(self.palette)
@@ -3,35 +3,256 @@
 Provides a minimal API to create/load/unload chunks and attach them to the ECS
 as entities with ChunkComponent. Intended as a starting point for Minecraft-like
 streaming workflows.
+
+With `workers > 0`, `ensure_loaded`/`preload_area` only queue generation on
+a WorkerPool and the position is PENDING until `integrate_pending()` (called
+once per frame by ChunkStreamingSystem) attaches finished chunks to the ECS,
+at most `integrate_per_frame` per call. `create_chunk` always generates
+synchronously.
+
+With a `store` (see simplex.world.region), chunks whose blocks were
+edited are written to region files when they are evicted or unloaded,
+and a chunk found on disk is loaded instead of generated. Writes (and
+the loads behind `request_chunk`) run on a single background I/O thread,
+which also keeps them ordered; a chunk requested again while its write
+is still queued is reattached from memory.
+
+Positions in the pinned set (the streaming load area, see `pin_area`)
+are never chosen by LRU eviction; if everything loaded is pinned the
+cache is allowed to exceed `cache_size`. `stats()` counts evictions and
+regenerations (chunks loaded again shortly after being dropped), which
+together show how much the cache thrashes.
+
+Besides the `cache_size` chunk count, the cache can be bounded in bytes
+with `memory_budget`: block storage, the CPU mesh data on the chunk's
+MeshComponent and its uploaded GPU buffers are accounted per chunk
+(meshes shared between identical chunks count once), and the least
+recently used unpinned chunks are evicted until the total fits. The
+totals are kept up to date as chunks load and unload and as
+ChunkMeshSystem attaches meshes (`account_chunk`), and the budget is
+checked again after every meshing pass. `memory_usage()` reports them.
+Unloading a chunk emits `chunk_unloaded` so the mesh system can release
+its GPU buffers.
+
+With `compressed_cache_bytes`, every dropped chunk also goes into a
+CompressedChunkCache (zlib, byte-bounded LRU); `create_chunk` checks it
+before the region store and the generator, so a chunk that comes back
+soon after leaving is restored by decompressing it.
 """
 
 from collections import OrderedDict
-from typing import Tuple, Dict, Optional
+from concurrent.futures.process import BrokenProcessPool
+from typing import Tuple, Dict, List, Optional
 
+from simplex.utils.frame_budget import FrameBudget
 from simplex.utils.logger import log
-from simplex.voxel.chunk import Chunk
+from simplex.utils.worker_pool import WorkerPool
+from simplex.voxel.chunk import Chunk, FACE_OFFSETS, OPPOSITE_FACE
 from simplex.ecs.ecs import Entity
 from simplex.ecs.components import ChunkComponent
+from simplex.world.compressed_cache import CompressedChunkCache
+from simplex.world.region import RegionStore
+from simplex.world.world_query import WorldAccessor
+from simplex.world.terrain import SimpleHeightmapGenerator, TerrainGenerator, generate_snapshot
+
+# chunk_state() values
+UNLOADED = "unloaded"
+PENDING = "pending"
+LOADED = "loaded"
 
 
 class ChunkManager:
-    def __init__(self, ecs, event_system=None, chunk_size: Tuple[int, int, int] = (16, 16, 16), cache_size: int = 64):
+    def __init__(
+        self,
+        ecs,
+        event_system=None,
+        chunk_size: Tuple[int, int, int] = (16, 16, 16),
+        cache_size: int = 64,
+        palette: bool = False,
+        generator: Optional[TerrainGenerator] = None,
+        workers: int = 0,
+        worker_kind: str = "process",
+        integrate_per_frame: int = 4,
+        store: Optional[RegionStore] = None,
+        memory_budget: int = 0,
+        compressed_cache_bytes: int = 0,
+    ):
         self.ecs = ecs
         self.event_system = event_system
         self.chunk_size = tuple(chunk_size)
         self.cache_size = int(cache_size)
-        # maps chunk_pos -> {'chunk': Chunk, 'entity_name': str}
+        # bytes (blocks + CPU mesh + GPU mesh) the loaded chunks may hold; 0 disables
+        self.memory_budget = int(memory_budget)
+        # store generated chunks palette-compressed (smaller, slower per-cell access)
+        self.palette = bool(palette)
+        # fills new chunks from their position (see simplex.world.terrain)
+        self.generator = generator or SimpleHeightmapGenerator(self.chunk_size[1])
+        # maps chunk_pos -> {'chunk': Chunk, 'entity_id': int (ECS handle)}
         self._chunks: Dict[Tuple[int, int, int], Dict] = {}
         # LRU ordering of positions (most recent at end)
         self._lru = OrderedDict()
+        # background generation: chunk_pos -> Future[ChunkSnapshot]
+        self._pool = WorkerPool(workers, worker_kind, name="chunkgen") if workers > 0 else None
+        if self._pool is not None:
+            self._pool.start()
+        self._pending: Dict[Tuple[int, int, int], object] = {}
+        self.integrate_per_frame = max(1, int(integrate_per_frame))
+        # region-file persistence: one I/O thread; chunk_pos -> (Future, Chunk) for queued writes
+        self.store = store
+        self._io = WorkerPool(1, "thread", name="chunkio") if store is not None else None
+        self._writes: Dict[Tuple[int, int, int], Tuple[object, Chunk]] = {}
+        # positions in _pending whose future is a region load rather than generation
+        self._loading = set()
+        # second tier: compressed copies of recently dropped chunks
+        self.compressed = CompressedChunkCache(compressed_cache_bytes) if compressed_cache_bytes > 0 else None
+        # positions LRU eviction must not pick
+        self._pinned = set()
+        # recently dropped positions (bounded), to spot chunks that come straight back
+        self._dropped = OrderedDict()
+        self._dropped_limit = max(256, 4 * self.cache_size)
+        # bumped whenever a chunk is attached or dropped (see WorldAccessor)
+        self.residency_version = 0
+        self._accessor = None
+        # running memory totals (see account_chunk): pos -> (block bytes,
+        # [(mesh part key, bytes)]), plus owner counts so shared parts count once
+        self._memory = {"blocks": 0, "mesh_cpu": 0, "mesh_gpu": 0}
+        self._memory_chunks: Dict[Tuple[int, int, int], Tuple[int, list]] = {}
+        self._memory_owners: Dict[tuple, int] = {}
+        self._memory_sizes: Dict[tuple, int] = {}
+        self.loads = 0
+        self.unloads = 0
+        self.evictions = 0
+        self.regenerations = 0
         log(f"ChunkManager created (chunk_size={self.chunk_size}, cache_size={self.cache_size})", level="INFO")
 
-    def _evict_if_needed(self):
-        while len(self._chunks) > self.cache_size:
-            # pop oldest
-            pos, _ = self._lru.popitem(last=False)
-            log(f"ChunkManager: Evicting chunk at {pos}", level="DEBUG")
-            self.unload_chunk(pos)
+    def _evict_if_needed(self, keep: Optional[Tuple[int, int, int]] = None):
+        # `keep` (the chunk just loaded) is spared like a pinned one
+        excess = len(self._chunks) - self.cache_size
+        if excess > 0:
+            # oldest unpinned first
+            victims = [pos for pos in self._lru if pos not in self._pinned and pos != keep][:excess]
+            for pos in victims:
+                self._evict(pos)
+        self.enforce_memory_budget(keep)
+
+    def _evict(self, pos: Tuple[int, int, int]) -> None:
+        log(f"ChunkManager: Evicting chunk at {pos}", level="DEBUG")
+        self.evictions += 1
+        self.unload_chunk(pos)
+
+    def enforce_memory_budget(self, keep: Optional[Tuple[int, int, int]] = None) -> int:
+        """Evict least recently used unpinned chunks until `memory_budget` fits; returns evictions.
+
+        The chunk at `keep` is never evicted. When pinned and kept chunks
+        alone exceed the budget, usage stays over it (see memory_usage).
+        """
+        if self.memory_budget <= 0 or self._memory_total() <= self.memory_budget:
+            return 0
+        evicted = 0
+        for pos in [pos for pos in self._lru if pos not in self._pinned and pos != keep]:
+            if self._memory_total() <= self.memory_budget:
+                break
+            # unloading releases the chunk's share, so a mesh shared with
+            # chunks still loaded stops counting only with its last owner
+            self._evict(pos)
+            evicted += 1
+        return evicted
+
+    def _mesh_of(self, info):
+        entity = self.ecs.get(info["entity_id"])
+        return entity.get_component("mesh") if entity is not None else None
+
+    def _measure(self, info) -> Tuple[int, List[Tuple[tuple, int]]]:
+        """(block bytes, [(mesh part key, bytes)]) of one loaded chunk."""
+        parts = []
+        mesh = self._mesh_of(info)
+        if mesh is not None:
+            cpu = mesh.packed if mesh.packed is not None else mesh.vertices
+            parts.append((("cpu", id(cpu)), mesh.cpu_nbytes()))
+            if mesh.gpu is not None:
+                parts.append((("gpu", id(mesh.gpu)), mesh.gpu_nbytes()))
+        return info["chunk"].nbytes, parts
+
+    def account_chunk(self, position: Tuple[int, int, int]) -> None:
+        """Re-measure the loaded chunk at `position` after its blocks or mesh changed.
+
+        ChunkMeshSystem calls this whenever it attaches a mesh; the block
+        bytes are refreshed at the same time, since edited chunks re-mesh.
+        Does not evict (see enforce_memory_budget).
+        """
+        pos = tuple(position)
+        info = self._chunks.get(pos)
+        if info is None:
+            return
+        self._forget_memory(pos)
+        blocks, parts = self._measure(info)
+        self._memory_chunks[pos] = (blocks, parts)
+        self._memory["blocks"] += blocks
+        for key, nbytes in parts:
+            owners = self._memory_owners.get(key, 0)
+            if not owners:
+                self._memory_sizes[key] = nbytes
+                self._memory["mesh_" + key[0]] += nbytes
+            self._memory_owners[key] = owners + 1
+
+    def _forget_memory(self, pos: Tuple[int, int, int]) -> None:
+        entry = self._memory_chunks.pop(pos, None)
+        if entry is None:
+            return
+        blocks, parts = entry
+        self._memory["blocks"] -= blocks
+        for key, _ in parts:
+            owners = self._memory_owners[key] - 1
+            if owners:
+                self._memory_owners[key] = owners
+            else:
+                del self._memory_owners[key]
+                self._memory["mesh_" + key[0]] -= self._memory_sizes.pop(key)
+
+    def _memory_total(self) -> int:
+        return self._memory["blocks"] + self._memory["mesh_cpu"] + self._memory["mesh_gpu"]
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Bytes held by loaded chunks: blocks, mesh_cpu, mesh_gpu, total, plus the budget."""
+        totals = dict(self._memory)
+        totals["total"] = self._memory_total()
+        totals["budget"] = self.memory_budget
+        totals["chunks"] = len(self._chunks)
+        # not part of `total`: the budget covers loaded chunks only
+        totals["compressed"] = self.compressed.nbytes if self.compressed is not None else 0
+        return totals
+
+    def pin_area(
+        self,
+        center: Tuple[int, int, int],
+        radius: int = 1,
+        horizontal_only: bool = False,
+    ) -> None:
+        """Replace the pinned set with the area around center (see area_positions)."""
+        self._pinned = set(self.area_positions(center, radius, horizontal_only))
+
+    def pinned(self) -> List[Tuple[int, int, int]]:
+        return list(self._pinned)
+
+    def stats(self) -> Dict[str, object]:
+        """Cache counters: loads, unloads, evictions, regenerations and thrash_rate.
+
+        `thrash_rate` is the share of loads that brought back a chunk
+        dropped shortly before.
+        """
+        return {
+            "loaded": len(self._chunks),
+            "pending": len(self._pending),
+            "pinned": len(self._pinned),
+            "cache_size": self.cache_size,
+            "loads": self.loads,
+            "unloads": self.unloads,
+            "evictions": self.evictions,
+            "regenerations": self.regenerations,
+            "thrash_rate": self.regenerations / self.loads if self.loads else 0.0,
+            "memory": self.memory_usage(),
+            "compressed": self.compressed.stats() if self.compressed is not None else {},
+        }
 
     def _register_access(self, pos: Tuple[int, int, int]):
         # move pos to end
@@ -43,52 +264,221 @@ class ChunkManager:
         self._lru[pos] = True
 
     def _generate_chunk(self, position: Tuple[int, int, int]) -> Chunk:
-        """Create and populate a Chunk instance with a simple heightmap."""
-        chunk = Chunk(position, size=self.chunk_size)
-        sx, sy, sz = chunk.size
-        # simple deterministic heightmap based on chunk coords
-        cx, cy, cz = position
-        base_height = sy // 4
-        # fill with dirt up to base_height
-        for x in range(sx):
-            for z in range(sz):
-                height = base_height
-                # small variation using coordinates
-                height += (abs(cx) + abs(cz) + x + z) % (max(1, sy // 8))
-                if height >= sy:
-                    height = sy - 1
-                for y in range(height):
-                    chunk.set_block_id(x, y, z, 1)  # dirt
+        """Create a Chunk instance and let the terrain generator populate it."""
+        chunk = Chunk(position, size=self.chunk_size, palette=self.palette)
+        self.generator.generate(chunk)
+        chunk.dirty = True
+        chunk.modified = False
+        return chunk
+
+    def _restore_chunk(self, pos: Tuple[int, int, int]) -> Chunk:
+        """Chunk for `pos` from a queued write, the region store, or the generator."""
+        queued = self._writes.get(pos)
+        if queued is not None:
+            if self.compressed is not None:
+                self.compressed.discard(pos)
+            chunk = queued[1]
+            chunk.mark_dirty()
+            return chunk
+        if self.compressed is not None:
+            snapshot = self.compressed.pop(pos)
+            if snapshot is not None:
+                return self._chunk_from_snapshot(snapshot)
+        if self.store is not None:
+            try:
+                snapshot = self.store.load(pos)
+            except Exception as exc:
+                log(f"ChunkManager: loading chunk {pos} failed, regenerating: {exc}", level="ERROR")
+                snapshot = None
+            if snapshot is not None:
+                return self._chunk_from_snapshot(snapshot)
+        return self._generate_chunk(pos)
+
+    def _chunk_from_snapshot(self, snapshot) -> Chunk:
+        chunk = Chunk.from_snapshot(snapshot, palette=self.palette)
         chunk.dirty = True
         return chunk
 
+    def _write_back(self, pos: Tuple[int, int, int], chunk: Chunk, snapshot=None) -> bool:
+        """Queue a save of `chunk` if its blocks changed since it was generated, loaded or saved."""
+        if self.store is None or not chunk.modified:
+            return False
+        self._prune_writes()
+        future = self._io.submit(self.store.save, snapshot or chunk.snapshot(include_meta=True))
+        chunk.modified = False
+        self._writes[pos] = (future, chunk)
+        return True
+
+    def _prune_writes(self) -> None:
+        for pos, (future, chunk) in list(self._writes.items()):
+            if not future.done():
+                continue
+            del self._writes[pos]
+            exc = future.exception()
+            if exc is not None:
+                log(f"ChunkManager: saving chunk {pos} failed: {exc}", level="ERROR")
+                chunk.modified = True
+
+    def pending_writes(self) -> int:
+        """Number of chunk saves queued or running on the I/O thread."""
+        self._prune_writes()
+        return len(self._writes)
+
+    def flush(self) -> None:
+        """Save every loaded chunk with unsaved edits and wait for all queued writes."""
+        if self.store is None:
+            return
+        for pos, info in list(self._chunks.items()):
+            self._write_back(pos, info["chunk"])
+        for future, _ in list(self._writes.values()):
+            try:
+                future.result()
+            except Exception:
+                pass
+        self._prune_writes()
+        self.store.flush()
+
     def create_chunk(self, position: Tuple[int, int, int]) -> Optional[Entity]:
-        """Create a chunk, attach a ChunkComponent on an ECS entity, and return the entity."""
+        """Create a chunk, attach a ChunkComponent on an ECS entity, and return the entity.
+
+        Loads (or generates) synchronously, replacing any pending background
+        job for the position.
+        """
         pos = tuple(position)
         if pos in self._chunks:
             # ensure LRU updated
             self._register_access(pos)
             info = self._chunks[pos]
-            return self.ecs.get_entity(info.get("entity_name"))
+            return self.ecs.get(info["entity_id"])
 
+        self._cancel_pending(pos)
         try:
-            chunk = self._generate_chunk(pos)
-            entity_name = f"chunk_{pos[0]}_{pos[1]}_{pos[2]}"
-            e = Entity(entity_name)
-            chunk_comp = ChunkComponent(position=pos, size=chunk.size, chunk=chunk)
-            e.add_component(chunk_comp)
-            self.ecs.add_entity(e)
-            # register
-            self._chunks[pos] = {"chunk": chunk, "entity_name": entity_name}
-            self._register_access(pos)
-            log(f"ChunkManager: Created and registered chunk entity {entity_name}", level="DEBUG")
-            self._evict_if_needed()
-            return e
+            return self._register_chunk(pos, self._restore_chunk(pos))
         except Exception as exc:
             log(f"ChunkManager.create_chunk failed: {exc}", level="ERROR")
             return None
 
+    def _register_chunk(self, pos: Tuple[int, int, int], chunk: Chunk) -> Entity:
+        """Attach a populated chunk to a new ECS entity and start tracking it."""
+        entity_name = f"chunk_{pos[0]}_{pos[1]}_{pos[2]}"
+        e = Entity(entity_name)
+        chunk_comp = ChunkComponent(position=pos, size=chunk.size, chunk=chunk)
+        e.add_component(chunk_comp)
+        self.ecs.add_entity(e)
+        # register
+        self._chunks[pos] = {"chunk": chunk, "entity_id": e.id}
+        self.account_chunk(pos)
+        self.residency_version += 1
+        self._register_access(pos)
+        self.loads += 1
+        if self._dropped.pop(pos, None) is not None:
+            self.regenerations += 1
+        # already-meshed neighbours treated this side as air until now
+        self.invalidate_neighbors(pos, FACE_OFFSETS, only_if_solid=True)
+        chunk.dirty_borders.clear()
+        log(f"ChunkManager: Created and registered chunk entity {entity_name}", level="DEBUG")
+        self._evict_if_needed(keep=pos)
+        return e
+
+    def request_chunk(self, position: Tuple[int, int, int]) -> Optional[Entity]:
+        """Return the loaded chunk entity, or queue generation and return None.
+
+        Without a worker pool this is `create_chunk`. With a store, the
+        region load runs first (on the I/O thread) and generation is only
+        queued if the chunk was never saved.
+        """
+        pos = tuple(position)
+        if (
+            pos in self._chunks
+            or self._pool is None
+            or pos in self._writes
+            or (self.compressed is not None and pos in self.compressed)
+        ):
+            # cheap to restore right away
+            return self.create_chunk(pos)
+        if pos not in self._pending:
+            if self.store is not None:
+                self._pending[pos] = self._io.submit(self.store.load, pos)
+                self._loading.add(pos)
+            else:
+                self._submit_generation(pos)
+        return None
+
+    def _submit_generation(self, pos: Tuple[int, int, int]) -> None:
+        self._pending[pos] = self._pool.submit(generate_snapshot, self.generator, pos, self.chunk_size)
+
+    def integrate_pending(self, budget: Optional[int] = None, time_budget_ms: Optional[float] = None) -> int:
+        """Attach finished background chunks to the ECS; returns how many were attached.
+
+        At most `budget` chunks (default `integrate_per_frame`), or, with
+        `time_budget_ms`, as many as fit in that many milliseconds (at
+        least one).
+        """
+        if not self._pending:
+            return 0
+        frame = FrameBudget(time_budget_ms, self.integrate_per_frame if budget is None else budget)
+        attached = 0
+        for pos, future in list(self._pending.items()):
+            if frame.exhausted():
+                break
+            if not future.done():
+                continue
+            del self._pending[pos]
+            if pos in self._loading:
+                self._loading.discard(pos)
+                try:
+                    snapshot = future.result()
+                except Exception as exc:
+                    log(f"ChunkManager: loading chunk {pos} failed, regenerating: {exc}", level="ERROR")
+                    snapshot = None
+                if snapshot is None:
+                    self._submit_generation(pos)
+                    continue
+                self._register_chunk(pos, self._chunk_from_snapshot(snapshot))
+                attached += 1
+                frame.charge()
+                continue
+            try:
+                snapshot = future.result()
+            except BrokenProcessPool:
+                self._pool.fall_back_to_threads()
+                self.request_chunk(pos)
+                continue
+            except Exception as exc:
+                log(f"ChunkManager: generating chunk {pos} failed: {exc}", level="ERROR")
+                continue
+            self._register_chunk(pos, self._chunk_from_snapshot(snapshot))
+            attached += 1
+            frame.charge()
+        if self._writes:
+            self._prune_writes()
+        return attached
+
+    def _cancel_pending(self, pos: Tuple[int, int, int]) -> bool:
+        future = self._pending.pop(pos, None)
+        if future is None:
+            return False
+        self._loading.discard(pos)
+        future.cancel()
+        return True
+
+    def chunk_state(self, position: Tuple[int, int, int]) -> str:
+        """LOADED, PENDING (queued or generating in the background) or UNLOADED."""
+        pos = tuple(position)
+        if pos in self._chunks:
+            return LOADED
+        if pos in self._pending:
+            return PENDING
+        return UNLOADED
+
+    def is_pending(self, position: Tuple[int, int, int]) -> bool:
+        return tuple(position) in self._pending
+
+    def list_pending(self) -> List[Tuple[int, int, int]]:
+        return list(self._pending.keys())
+
     def get_chunk(self, position: Tuple[int, int, int]) -> Optional[Chunk]:
+        """Return the loaded Chunk, or None; use chunk_state() to tell pending from unloaded."""
         pos = tuple(position)
         info = self._chunks.get(pos)
         if info:
@@ -96,9 +486,66 @@ class ChunkManager:
             return info.get("chunk")
         return None
 
+    def accessor(self) -> WorldAccessor:
+        """Shared WorldAccessor for read-only world-space block queries."""
+        if self._accessor is None:
+            self._accessor = WorldAccessor(self)
+        return self._accessor
+
+    def peek_chunk(self, position: Tuple[int, int, int]) -> Optional[Chunk]:
+        """Like get_chunk, but without touching the LRU order."""
+        info = self._chunks.get(tuple(position))
+        return info.get("chunk") if info else None
+
+    def neighbor_borders(self, position: Tuple[int, int, int]) -> Dict[str, list]:
+        """Facing border layers of the loaded neighbours of `position`.
+
+        Returns {face_key: layer} for the meshers' `neighbors` argument;
+        sides without a loaded neighbour are omitted (treated as air).
+        """
+        px, py, pz = position
+        borders = {}
+        for face_key, (dx, dy, dz) in FACE_OFFSETS.items():
+            neighbor = self.peek_chunk((px + dx, py + dy, pz + dz))
+            if neighbor is not None:
+                borders[face_key] = neighbor.border_layer(OPPOSITE_FACE[face_key])
+        return borders
+
+    def invalidate_neighbors(self, position: Tuple[int, int, int], faces, only_if_solid: bool = False) -> int:
+        """Mark loaded neighbours across `faces` of the chunk at `position` for re-meshing.
+
+        With `only_if_solid`, a side whose border layer is all air is
+        skipped, since the neighbour already meshed against air there.
+        Neighbours that are already dirty are marked again (bumping their
+        version so an in-flight background mesh is discarded) but not
+        counted. Returns the number of neighbours newly marked.
+        """
+        chunk = self.peek_chunk(position)
+        px, py, pz = position
+        marked = 0
+        for face_key in faces:
+            dx, dy, dz = FACE_OFFSETS[face_key]
+            neighbor = self.peek_chunk((px + dx, py + dy, pz + dz))
+            if neighbor is None:
+                continue
+            if only_if_solid and chunk is not None:
+                layer = chunk.border_layer(face_key)
+                if not any(any(row) for row in layer):
+                    continue
+            was_dirty = neighbor.dirty
+            neighbor.mark_dirty()
+            if not was_dirty:
+                marked += 1
+        return marked
+
     def unload_chunk(self, position: Tuple[int, int, int]) -> bool:
         pos = tuple(position)
+        self._cancel_pending(pos)
+        if pos in self._chunks:
+            # meshed neighbours culled their faces against this chunk's blocks
+            self.invalidate_neighbors(pos, FACE_OFFSETS, only_if_solid=True)
         info = self._chunks.pop(pos, None)
+        self._forget_memory(pos)
         try:
             if pos in self._lru:
                 try:
@@ -106,9 +553,22 @@ class ChunkManager:
                 except KeyError:
                     pass
             if info:
-                entity_name = info.get("entity_name")
-                if entity_name and self.ecs.get_entity(entity_name):
-                    self.ecs.remove_entity(entity_name)
+                self.residency_version += 1
+                self.unloads += 1
+                self._dropped[pos] = True
+                if len(self._dropped) > self._dropped_limit:
+                    self._dropped.popitem(last=False)
+                chunk = info["chunk"]
+                snapshot = None
+                if self.compressed is not None:
+                    snapshot = chunk.snapshot(include_meta=True)
+                    self.compressed.put(snapshot)
+                self._write_back(pos, chunk, snapshot)
+                entity = self.ecs.get(info["entity_id"])
+                if entity is not None:
+                    if self.event_system is not None:
+                        self.event_system.emit("chunk_unloaded", {"position": pos, "entity": entity})
+                    self.ecs.remove_entity(entity)
                 log(f"ChunkManager: Unloaded chunk at {pos}", level="DEBUG")
                 return True
             return False
@@ -117,14 +577,29 @@ class ChunkManager:
             return False
 
     def ensure_loaded(self, position: Tuple[int, int, int]) -> Optional[Entity]:
-        """Ensure chunk at position is loaded and return the entity."""
-        if position in self._chunks:
-            return self.create_chunk(position)
-        return self.create_chunk(position)
+        """Ensure chunk at position is loaded and return the entity (None while pending)."""
+        return self.request_chunk(position)
 
     def list_loaded(self):
         return list(self._chunks.keys())
 
+    @staticmethod
+    def area_positions(
+        center: Tuple[int, int, int],
+        radius: int = 1,
+        horizontal_only: bool = False,
+    ) -> List[Tuple[int, int, int]]:
+        """Chunk positions within `radius` (Chebyshev) of center, center first."""
+        cx, cy, cz = center
+        positions = [(cx, cy, cz)]
+        dys = (0,) if horizontal_only else range(-radius, radius + 1)
+        for dx in range(-radius, radius + 1):
+            for dy in dys:
+                for dz in range(-radius, radius + 1):
+                    if dx or dy or dz:
+                        positions.append((cx + dx, cy + dy, cz + dz))
+        return positions
+
     def preload_area(
         self,
         center: Tuple[int, int, int],
@@ -136,31 +611,17 @@ class ChunkManager:
         When `horizontal_only` is True, only the center Y slice is loaded (flat worlds).
         """
         cx, cy, cz = center
-
-        positions = [(cx, cy, cz)]
-        if horizontal_only:
-            for dx in range(-radius, radius + 1):
-                for dz in range(-radius, radius + 1):
-                    pos = (cx + dx, cy, cz + dz)
-                    if pos != (cx, cy, cz):
-                        positions.append(pos)
-        else:
-            for dx in range(-radius, radius + 1):
-                for dy in range(-radius, radius + 1):
-                    for dz in range(-radius, radius + 1):
-                        pos = (cx + dx, cy + dy, cz + dz)
-                        if pos != (cx, cy, cz):
-                            positions.append(pos)
+        positions = self.area_positions(center, radius, horizontal_only)
 
         for pos in positions:
             try:
-                self.create_chunk(pos)
+                self.request_chunk(pos)
             except Exception:
                 # ignore generation failures for individual positions
                 pass
 
         # If center somehow wasn't created (e.g., failures), try once more
-        if (cx, cy, cz) not in self._chunks:
+        if (cx, cy, cz) not in self._chunks and (cx, cy, cz) not in self._pending:
             try:
                 self.create_chunk((cx, cy, cz))
             except Exception:
@@ -173,7 +634,7 @@ class ChunkManager:
             pass
 
         # after loading, ensure we don't exceed cache
-        self._evict_if_needed()
+        self._evict_if_needed(keep=(cx, cy, cz))
 
     def unload_outside_area(
         self,
@@ -184,7 +645,7 @@ class ChunkManager:
         """Unload chunks outside the streaming radius around center."""
         cx, cy, cz = center
         to_unload = []
-        for pos in list(self._chunks.keys()):
+        for pos in list(self._chunks.keys()) + list(self._pending.keys()):
             dx = abs(pos[0] - cx)
             dy = abs(pos[1] - cy)
             dz = abs(pos[2] - cz)
@@ -202,7 +663,28 @@ class ChunkManager:
         center: Tuple[int, int, int],
         radius: int = 1,
         horizontal_only: bool = False,
+        unload_radius: Optional[int] = None,
     ):
-        """Convenience: preload area then unload outside it."""
+        """Convenience: pin and preload the area, then unload outside `unload_radius`.
+
+        `unload_radius` (default `radius`) larger than `radius` keeps a
+        ring of chunks loaded around the area so stepping back and forth
+        across a boundary does not reload them.
+        """
+        unload_radius = radius if unload_radius is None else max(int(unload_radius), radius)
+        self.pin_area(center, radius, horizontal_only=horizontal_only)
         self.preload_area(center, radius, horizontal_only=horizontal_only)
-        self.unload_outside_area(center, radius, horizontal_only=horizontal_only)
+        self.unload_outside_area(center, unload_radius, horizontal_only=horizontal_only)
+
+    def shutdown(self) -> None:
+        """Cancel pending generation, save unsaved edits and stop the worker pools."""
+        for pos in list(self._pending):
+            self._cancel_pending(pos)
+        if self._pool is not None:
+            self._pool.shutdown()
+        if self.store is not None:
+            self.flush()
+            self._io.shutdown(wait=True)
+            self.store.close()
+        if self.compressed is not None:
+            self.compressed.clear()
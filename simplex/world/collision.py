@@ -0,0 +1,128 @@
+"""Swept axis-aligned boxes against the voxel grid.
+
+`sweep_boxes` moves a batch of boxes by a displacement each, one axis at
+a time (y, then x, then z). For every axis it looks only at the cells the
+box would newly enter: the slab between its leading face and where that
+face ends up, across the cells the box overlaps on the other two axes.
+A box stops flush against the nearest solid cell in that slab, so fast
+movers cannot tunnel through thin walls. With NumPy the cells of all
+boxes are gathered into one `WorldAccessor.solid_at` call per axis.
+"""
+
+import math
+from typing import List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# faces closer than this to a cell boundary do not count as overlapping the cell
+EPS = 1e-7
+# y first so that landing is resolved before sliding along the ground
+AXIS_ORDER = (1, 0, 2)
+
+
+def sweep_boxes(world, mins, sizes, deltas):
+    """Move boxes through `world` (a WorldAccessor) without entering solid cells.
+
+    `mins` are the boxes' minimum corners, `sizes` their extents and
+    `deltas` the requested displacements, each (N, 3). Boxes are assumed
+    not to overlap solid cells at the start. Returns `(moved, blocked)`:
+    the displacement each box actually made and, per axis, whether it
+    was cut short. Both are NumPy arrays ((N, 3) float64 and bool) when
+    NumPy is installed, lists of lists otherwise.
+    """
+    if np is None:
+        return _sweep_python(world, mins, sizes, deltas)
+    mins = np.array(mins, dtype=np.float64).reshape(-1, 3)
+    sizes = np.asarray(sizes, dtype=np.float64).reshape(-1, 3)
+    moved = np.array(deltas, dtype=np.float64).reshape(-1, 3)
+    blocked = np.zeros(moved.shape, dtype=bool)
+    for axis in AXIS_ORDER:
+        _sweep_axis(world, mins, sizes, moved, blocked, axis)
+        mins[:, axis] += moved[:, axis]
+    return moved, blocked
+
+
+def _sweep_axis(world, mins, sizes, moved, blocked, axis: int) -> None:
+    b, c = [i for i in range(3) if i != axis]
+    rows = np.flatnonzero(moved[:, axis])
+    if not len(rows):
+        return
+    lo, size, delta = mins[rows], sizes[rows], moved[rows, axis]
+    forward = delta > 0
+    face = np.where(forward, lo[:, axis] + size[:, axis], lo[:, axis])
+    first = np.where(forward, np.ceil(face - EPS), np.floor(face + EPS) - 1).astype(np.int64)
+    last = np.where(forward, np.floor(face + delta - EPS), np.floor(face + delta + EPS)).astype(np.int64)
+    step = np.where(forward, 1, -1)
+    n_a = np.maximum((last - first) * step + 1, 0)
+    lo_b = np.floor(lo[:, b] + EPS).astype(np.int64)
+    lo_c = np.floor(lo[:, c] + EPS).astype(np.int64)
+    n_b = np.floor(lo[:, b] + size[:, b] - EPS).astype(np.int64) - lo_b + 1
+    n_c = np.floor(lo[:, c] + size[:, c] - EPS).astype(np.int64) - lo_c + 1
+    counts = n_a * n_b * n_c
+    total = int(counts.sum())
+    if not total:
+        return
+    # enumerate every box's slab of cells as (ia, ib, ic) offsets, all boxes in one array
+    owner = np.repeat(np.arange(len(rows)), counts)
+    offset = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    per_layer = (n_b * n_c)[owner]
+    ia, rest = np.divmod(offset, per_layer)
+    ib, ic = np.divmod(rest, n_c[owner])
+    cells = np.empty((total, 3), dtype=np.int64)
+    cells[:, axis] = first[owner] + step[owner] * ia
+    cells[:, b] = lo_b[owner] + ib
+    cells[:, c] = lo_c[owner] + ic
+    solid = world.solid_at(cells)
+    if not solid.any():
+        return
+    nearest = np.full(len(rows), np.iinfo(np.int64).max)
+    np.minimum.at(nearest, owner[solid], ia[solid])
+    hit = nearest != np.iinfo(np.int64).max
+    cell = first[hit] + step[hit] * nearest[hit]
+    fwd = forward[hit]
+    allowed = np.where(fwd, np.maximum(cell - face[hit], 0.0), np.minimum(cell + 1 - face[hit], 0.0))
+    hit_rows = rows[hit]
+    moved[hit_rows, axis] = np.where(fwd, np.minimum(delta[hit], allowed), np.maximum(delta[hit], allowed))
+    blocked[hit_rows, axis] = True
+
+
+def _sweep_python(world, mins, sizes, deltas) -> Tuple[List[List[float]], List[List[bool]]]:
+    moved = [[float(v) for v in d] for d in deltas]
+    blocked = [[False, False, False] for _ in moved]
+    for lo, size, delta, stop in zip(mins, sizes, moved, blocked):
+        lo = [float(v) for v in lo]
+        for axis in AXIS_ORDER:
+            d = delta[axis]
+            if d:
+                allowed = _sweep_one(world, lo, size, d, axis)
+                if allowed is not None and abs(allowed) < abs(d):
+                    delta[axis] = allowed
+                    stop[axis] = True
+            lo[axis] += delta[axis]
+    return moved, blocked
+
+
+def _sweep_one(world, lo: Sequence[float], size: Sequence[float], d: float, axis: int):
+    """Displacement that stops at the nearest solid cell along `axis`, None if clear."""
+    b, c = [i for i in range(3) if i != axis]
+    if d > 0:
+        face = lo[axis] + size[axis]
+        cells = range(math.ceil(face - EPS), math.floor(face + d - EPS) + 1)
+    else:
+        face = lo[axis]
+        cells = range(math.floor(face + EPS) - 1, math.floor(face + d + EPS) - 1, -1)
+    span_b = range(math.floor(lo[b] + EPS), math.floor(lo[b] + size[b] - EPS) + 1)
+    span_c = range(math.floor(lo[c] + EPS), math.floor(lo[c] + size[c] - EPS) + 1)
+    point = [0, 0, 0]
+    for cell in cells:
+        point[axis] = cell
+        for pb in span_b:
+            point[b] = pb
+            for pc in span_c:
+                point[c] = pc
+                if world.is_solid_at(*point):
+                    return max(cell - face, 0.0) if d > 0 else min(cell + 1 - face, 0.0)
+    return None
@@ -0,0 +1,81 @@
+"""
+Compressed in-memory tier for chunks that were just evicted.
+
+ChunkManager keeps a zlib copy (fastest level; generated terrain
+compresses to a few hundred bytes per chunk) of every chunk it drops in a
+byte-bounded LRU. A chunk that comes back while its copy is still here is
+rebuilt by decompressing, which takes microseconds, instead of being
+regenerated or read from a region file. Payloads use the region file
+encoding (see simplex.world.region), so block metadata survives too.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from simplex.voxel.chunk import ChunkSnapshot
+from simplex.world.region import decode_chunk, encode_chunk
+
+COMPRESSION_LEVEL = 1
+
+
+class CompressedChunkCache:
+    """LRU of compressed chunk snapshots holding at most `max_bytes` of payload."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries: "OrderedDict[Tuple[int, int, int], bytes]" = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, position) -> bool:
+        return tuple(position) in self._entries
+
+    def put(self, snapshot: ChunkSnapshot) -> None:
+        pos = tuple(snapshot.position)
+        self.discard(pos)
+        payload = encode_chunk(snapshot, COMPRESSION_LEVEL)
+        if len(payload) > self.max_bytes:
+            return
+        self._entries[pos] = payload
+        self.nbytes += len(payload)
+        while self.nbytes > self.max_bytes:
+            _, old = self._entries.popitem(last=False)
+            self.nbytes -= len(old)
+            self.evictions += 1
+
+    def pop(self, position) -> Optional[ChunkSnapshot]:
+        """Remove and return the snapshot for `position`, or None."""
+        pos = tuple(position)
+        payload = self._entries.pop(pos, None)
+        if payload is None:
+            self.misses += 1
+            return None
+        self.nbytes -= len(payload)
+        self.hits += 1
+        return decode_chunk(pos, payload)
+
+    def discard(self, position) -> None:
+        payload = self._entries.pop(tuple(position), None)
+        if payload is not None:
+            self.nbytes -= len(payload)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,261 @@
+"""
+Region files: on-disk storage for chunks that left the in-memory cache.
+
+Chunks are grouped into regions of REGION_SIZE x REGION_SIZE chunk
+columns (one file per region and chunk layer y), so a streaming world
+touches a handful of files instead of one file per chunk. A region file
+is a sequence of SECTOR_SIZE byte sectors:
+
+    sector 0..HEADER_SECTORS-1  header: magic, format version and an
+                                offset table with one (first sector,
+                                payload length) entry per chunk slot
+    following sectors           zlib-compressed chunk payloads, each
+                                starting on a sector boundary
+
+Rewriting a chunk reuses its old sectors when the new payload fits and
+otherwise takes the first free run large enough (sectors released by
+other chunks included) before growing the file. `RegionStore` is safe to
+call from one I/O thread while the main thread keeps running; ChunkManager
+does all of its region I/O that way.
+"""
+
+import json
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from simplex.voxel.chunk import ChunkSnapshot
+
+REGION_SIZE = 32
+SECTOR_SIZE = 4096
+MAGIC = b"SXRG"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHH")  # magic, format version, reserved
+_ENTRY = struct.Struct("<II")  # first sector, payload bytes (0 = empty slot)
+_SLOTS = REGION_SIZE * REGION_SIZE
+HEADER_SECTORS = -(-(_HEADER.size + _SLOTS * _ENTRY.size) // SECTOR_SIZE)
+
+_CHUNK_HEADER = struct.Struct("<BHHHHI")  # flags, sx, sy, sz, uniform id, meta bytes
+_UNIFORM = 1
+
+
+def region_coords(position: Tuple[int, int, int]) -> Tuple[Tuple[int, int, int], int]:
+    """Return ((rx, cy, rz), slot) for chunk `position`."""
+    cx, cy, cz = position
+    return (cx // REGION_SIZE, cy, cz // REGION_SIZE), (cz % REGION_SIZE) * REGION_SIZE + cx % REGION_SIZE
+
+
+def encode_chunk(snapshot: ChunkSnapshot, level: int = -1) -> bytes:
+    """Serialize a snapshot (block ids and metadata) into a zlib payload (`level` as for zlib)."""
+    sx, sy, sz = snapshot.size
+    meta = json.dumps(snapshot.meta, separators=(",", ":")).encode() if snapshot.meta else b""
+    if snapshot.blocks is None:
+        head = _CHUNK_HEADER.pack(_UNIFORM, sx, sy, sz, snapshot.uniform_id, len(meta))
+        return zlib.compress(head + meta, level)
+    blocks = snapshot.blocks
+    if sys.byteorder == "big":
+        ids = array("H")
+        ids.frombytes(blocks)
+        ids.byteswap()
+        blocks = ids.tobytes()
+    head = _CHUNK_HEADER.pack(0, sx, sy, sz, 0, len(meta))
+    return zlib.compress(head + meta + blocks, level)
+
+
+def decode_chunk(position: Tuple[int, int, int], payload: bytes) -> ChunkSnapshot:
+    """Inverse of `encode_chunk`."""
+    raw = zlib.decompress(payload)
+    flags, sx, sy, sz, uniform_id, meta_len = _CHUNK_HEADER.unpack_from(raw)
+    offset = _CHUNK_HEADER.size
+    meta = None
+    if meta_len:
+        meta = {int(idx): data for idx, data in json.loads(raw[offset:offset + meta_len]).items()}
+        offset += meta_len
+    if flags & _UNIFORM:
+        return ChunkSnapshot(tuple(position), (sx, sy, sz), uniform_id, None, meta)
+    blocks = raw[offset:]
+    if len(blocks) != 2 * sx * sy * sz:
+        raise ValueError(f"Chunk payload for {position} has {len(blocks)} block bytes, expected {2 * sx * sy * sz}")
+    if sys.byteorder == "big":
+        ids = array("H")
+        ids.frombytes(blocks)
+        ids.byteswap()
+        blocks = ids.tobytes()
+    return ChunkSnapshot(tuple(position), (sx, sy, sz), None, bytes(blocks), meta)
+
+
+class RegionFile:
+    """One region file: offset table plus sector allocation. Not thread-safe."""
+
+    def __init__(self, path: str):
+        self.path = path
+        exists = os.path.exists(path) and os.path.getsize(path) >= HEADER_SECTORS * SECTOR_SIZE
+        self._file = open(path, "r+b" if exists else "w+b")
+        self._table = [(0, 0)] * _SLOTS
+        if exists:
+            self._read_header()
+        else:
+            self._file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0))
+            self._file.write(bytes(HEADER_SECTORS * SECTOR_SIZE - _HEADER.size))
+        total = -(-os.path.getsize(path) // SECTOR_SIZE)
+        # one flag per sector; header sectors are always taken
+        self._used = bytearray(max(total, HEADER_SECTORS))
+        self._used[:HEADER_SECTORS] = b"\x01" * HEADER_SECTORS
+        for first, length in self._table:
+            if length:
+                self._used[first:first + self._sectors(length)] = b"\x01" * self._sectors(length)
+
+    def _read_header(self) -> None:
+        self._file.seek(0)
+        raw = self._file.read(_HEADER.size + _SLOTS * _ENTRY.size)
+        magic, version, _ = _HEADER.unpack_from(raw)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{self.path} is not a version {FORMAT_VERSION} region file")
+        self._table = [_ENTRY.unpack_from(raw, _HEADER.size + i * _ENTRY.size) for i in range(_SLOTS)]
+
+    @staticmethod
+    def _sectors(length: int) -> int:
+        return -(-length // SECTOR_SIZE)
+
+    def _write_entry(self, slot: int, first: int, length: int) -> None:
+        self._table[slot] = (first, length)
+        self._file.seek(_HEADER.size + slot * _ENTRY.size)
+        self._file.write(_ENTRY.pack(first, length))
+
+    def _allocate(self, count: int) -> int:
+        run = 0
+        for i in range(HEADER_SECTORS, len(self._used)):
+            run = run + 1 if not self._used[i] else 0
+            if run == count:
+                return i - count + 1
+        # grow the file, extending a free run at the end if there is one
+        first = len(self._used) - run
+        self._used.extend(bytes(first + count - len(self._used)))
+        return first
+
+    def __contains__(self, slot: int) -> bool:
+        return self._table[slot][1] > 0
+
+    def read(self, slot: int) -> Optional[bytes]:
+        first, length = self._table[slot]
+        if not length:
+            return None
+        self._file.seek(first * SECTOR_SIZE)
+        return self._file.read(length)
+
+    def write(self, slot: int, payload: bytes) -> None:
+        count = self._sectors(len(payload))
+        first, length = self._table[slot]
+        old = self._sectors(length) if length else 0
+        if count > old:
+            self._used[first:first + old] = bytes(old)
+            first = self._allocate(count)
+        else:
+            # shrink in place, releasing the tail
+            self._used[first + count:first + old] = bytes(old - count)
+        self._used[first:first + count] = b"\x01" * count
+        self._file.seek(first * SECTOR_SIZE)
+        self._file.write(payload)
+        self._file.write(bytes(count * SECTOR_SIZE - len(payload)))
+        self._write_entry(slot, first, len(payload))
+
+    def delete(self, slot: int) -> bool:
+        first, length = self._table[slot]
+        if not length:
+            return False
+        self._used[first:first + self._sectors(length)] = bytes(self._sectors(length))
+        self._write_entry(slot, 0, 0)
+        return True
+
+    def free_sectors(self) -> int:
+        """Sectors inside the file not used by any chunk (available for reuse)."""
+        return self._used.count(0)
+
+    def sector_count(self) -> int:
+        return len(self._used)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class RegionStore:
+    """Chunk snapshots stored in region files under `directory`.
+
+    Keeps at most `max_open` region files open (least recently used are
+    closed first). All methods take an internal lock, so one background
+    I/O thread and the main thread may share a store.
+    """
+
+    def __init__(self, directory: str, max_open: int = 16):
+        self.directory = directory
+        self.max_open = max(1, int(max_open))
+        os.makedirs(directory, exist_ok=True)
+        self._files: "OrderedDict[Tuple[int, int, int], RegionFile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def region_path(self, region: Tuple[int, int, int]) -> str:
+        rx, ry, rz = region
+        return os.path.join(self.directory, f"r.{rx}.{ry}.{rz}.sxr")
+
+    def _region(self, region: Tuple[int, int, int], create: bool) -> Optional[RegionFile]:
+        rf = self._files.get(region)
+        if rf is not None:
+            self._files.move_to_end(region)
+            return rf
+        path = self.region_path(region)
+        if not create and not os.path.exists(path):
+            return None
+        rf = RegionFile(path)
+        self._files[region] = rf
+        while len(self._files) > self.max_open:
+            _, old = self._files.popitem(last=False)
+            old.close()
+        return rf
+
+    def contains(self, position: Tuple[int, int, int]) -> bool:
+        region, slot = region_coords(position)
+        with self._lock:
+            rf = self._region(region, create=False)
+            return rf is not None and slot in rf
+
+    def load(self, position: Tuple[int, int, int]) -> Optional[ChunkSnapshot]:
+        """Return the stored snapshot for `position`, or None if it was never saved."""
+        region, slot = region_coords(position)
+        with self._lock:
+            rf = self._region(region, create=False)
+            payload = rf.read(slot) if rf is not None else None
+        if payload is None:
+            return None
+        return decode_chunk(position, payload)
+
+    def save(self, snapshot: ChunkSnapshot) -> None:
+        payload = encode_chunk(snapshot)
+        region, slot = region_coords(snapshot.position)
+        with self._lock:
+            self._region(region, create=True).write(slot, payload)
+
+    def delete(self, position: Tuple[int, int, int]) -> bool:
+        region, slot = region_coords(position)
+        with self._lock:
+            rf = self._region(region, create=False)
+            return rf is not None and rf.delete(slot)
+
+    def flush(self) -> None:
+        with self._lock:
+            for rf in self._files.values():
+                rf.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            while self._files:
+                _, rf = self._files.popitem(last=False)
+                rf.close()
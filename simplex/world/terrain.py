@@ -0,0 +1,216 @@
+"""
+Terrain generators used by ChunkManager to populate new chunks.
+
+A generator fills a freshly created Chunk in place from nothing but its
+position, so chunks can be generated in any order (or on a worker) and
+the same seed always yields the same world. Heightmap generators compute
+a (sx, sz) grid of world-space surface heights for the chunk's XZ
+footprint and fill the whole block array in one broadcast operation with
+NumPy; without NumPy they build the same flat id array column by column.
+
+`generate_snapshot` is the worker entry point used by ChunkManager's
+background generation. Generators are selectable by name (`[world] generator` in the engine
+config), see GENERATORS / make_generator.
+"""
+
+import math
+from array import array
+from typing import Optional
+
+from simplex.voxel.chunk import Chunk, ChunkSnapshot
+from simplex.voxel.voxel import BLOCK_AIR, BLOCK_DIRT, BLOCK_GRASS, BLOCK_STONE
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TerrainGenerator:
+    """Interface: populate `chunk` (a new, all-air Chunk) in place."""
+
+    def generate(self, chunk) -> None:
+        raise NotImplementedError
+
+
+class HeightmapGenerator(TerrainGenerator):
+    """Layered column terrain from a surface heightmap.
+
+    Each column is `top_block` at its surface, `filler_block` for the next
+    `filler_depth` blocks and `base_block` below that. Subclasses provide
+    `heights()`, returning an (sx, sz) int array with NumPy and nested
+    lists ([x][z]) without it.
+    """
+
+    top_block = BLOCK_GRASS
+    filler_block = BLOCK_DIRT
+    base_block = BLOCK_STONE
+    filler_depth = 3
+
+    def heights(self, cx: int, cz: int, sx: int, sz: int):
+        """World-space column heights (solid below) for chunk column (cx, cz)."""
+        raise NotImplementedError
+
+    def generate(self, chunk) -> None:
+        cx, cy, cz = chunk.position
+        sx, sy, sz = chunk.size
+        heights = self.heights(cx, cz, sx, sz)
+        if np is not None:
+            chunk.load_blocks(self._fill_numpy(heights, cy * sy, sy))
+        else:
+            chunk.load_blocks(self._fill_python(heights, cy * sy, chunk.size))
+
+    def _fill_numpy(self, heights, y0: int, sy: int):
+        wy = y0 + np.arange(sy)
+        # 0 at the surface block, negative above ground
+        depth = heights[:, None, :] - 1 - wy[None, :, None]
+        ids = np.full(depth.shape, self.base_block, dtype=np.uint16)
+        ids[depth <= self.filler_depth] = self.filler_block
+        ids[depth == 0] = self.top_block
+        ids[depth < 0] = BLOCK_AIR
+        return ids
+
+    def _column_id(self, depth: int) -> int:
+        if depth < 0:
+            return BLOCK_AIR
+        if depth == 0:
+            return self.top_block
+        if depth <= self.filler_depth:
+            return self.filler_block
+        return self.base_block
+
+    def _fill_python(self, heights, y0: int, size) -> array:
+        sx, sy, sz = size
+        out = array("H", bytes(2 * sx * sy * sz))
+        i = 0
+        for x in range(sx):
+            column_heights = heights[x]
+            for y in range(sy):
+                wy = y0 + y
+                for z in range(sz):
+                    out[i] = self._column_id(column_heights[z] - 1 - wy)
+                    i += 1
+        return out
+
+
+class SimpleHeightmapGenerator(HeightmapGenerator):
+    """The original test terrain: dirt up to a sawtooth height around sy // 4.
+
+    Heights are world-space (relative to chunk y 0), so chunks above the
+    surface are empty and chunks below it are solid.
+    """
+
+    top_block = filler_block = base_block = BLOCK_DIRT
+
+    def __init__(self, chunk_height: int = 16):
+        self.chunk_height = int(chunk_height)
+
+    def heights(self, cx, cz, sx, sz):
+        sy = self.chunk_height
+        base, period, cap = sy // 4, max(1, sy // 8), sy - 1
+        if np is None:
+            return [[min(base + (abs(cx) + abs(cz) + x + z) % period, cap) for z in range(sz)] for x in range(sx)]
+        x = np.arange(sx)[:, None]
+        z = np.arange(sz)[None, :]
+        return np.minimum(base + (abs(cx) + abs(cz) + x + z) % period, cap)
+
+
+def _hash01(ix, iz, seed):
+    """Lattice hash -> [0, 1]; works on Python ints and int64 NumPy arrays alike."""
+    h = (ix * 374761393 + iz * 668265263 + seed * 2147483647) & 0xFFFFFFFF
+    h = ((h ^ (h >> 13)) * 1274126177) & 0xFFFFFFFF
+    h = h ^ (h >> 16)
+    return h / 0xFFFFFFFF
+
+
+class NoiseTerrainGenerator(HeightmapGenerator):
+    """Rolling hills from seeded fractal value noise over world-space XZ."""
+
+    def __init__(
+        self,
+        seed: int = 0,
+        base_height: int = 2,
+        amplitude: int = 12,
+        scale: float = 48.0,
+        octaves: int = 3,
+        persistence: float = 0.5,
+    ):
+        self.seed = int(seed) & 0xFFFFFFFF
+        self.base_height = int(base_height)
+        self.amplitude = int(amplitude)
+        self.scale = float(scale)
+        self.octaves = max(1, int(octaves))
+        self.persistence = float(persistence)
+
+    def _octaves(self):
+        amp, freq = 1.0, 1.0 / self.scale
+        for i in range(self.octaves):
+            yield amp, freq, self.seed + 1013 * i
+            amp *= self.persistence
+            freq *= 2.0
+
+    def heights(self, cx, cz, sx, sz):
+        if np is None:
+            return [[self.height_at(cx * sx + x, cz * sz + z) for z in range(sz)] for x in range(sx)]
+        wx = (cx * sx + np.arange(sx, dtype=np.int64))[:, None].astype(np.float64)
+        wz = (cz * sz + np.arange(sz, dtype=np.int64))[None, :].astype(np.float64)
+        total = np.zeros((sx, sz))
+        norm = 0.0
+        for amp, freq, seed in self._octaves():
+            fx, fz = wx * freq, wz * freq
+            x0, z0 = np.floor(fx), np.floor(fz)
+            tx, tz = fx - x0, fz - z0
+            tx = tx * tx * (3.0 - 2.0 * tx)
+            tz = tz * tz * (3.0 - 2.0 * tz)
+            ix, iz = x0.astype(np.int64), z0.astype(np.int64)
+            n00 = _hash01(ix, iz, seed)
+            n10 = _hash01(ix + 1, iz, seed)
+            n01 = _hash01(ix, iz + 1, seed)
+            n11 = _hash01(ix + 1, iz + 1, seed)
+            top = n00 + (n10 - n00) * tx
+            bottom = n01 + (n11 - n01) * tx
+            total = total + amp * (top + (bottom - top) * tz)
+            norm += amp
+        return self.base_height + np.floor(self.amplitude * total / norm).astype(np.int64)
+
+    def height_at(self, wx: int, wz: int) -> int:
+        """Surface height of world column (wx, wz); the per-column form of `heights()`."""
+        total = 0.0
+        norm = 0.0
+        for amp, freq, seed in self._octaves():
+            fx, fz = float(wx) * freq, float(wz) * freq
+            x0, z0 = math.floor(fx), math.floor(fz)
+            tx, tz = fx - x0, fz - z0
+            tx = tx * tx * (3.0 - 2.0 * tx)
+            tz = tz * tz * (3.0 - 2.0 * tz)
+            n00 = _hash01(x0, z0, seed)
+            n10 = _hash01(x0 + 1, z0, seed)
+            n01 = _hash01(x0, z0 + 1, seed)
+            n11 = _hash01(x0 + 1, z0 + 1, seed)
+            top = n00 + (n10 - n00) * tx
+            bottom = n01 + (n11 - n01) * tx
+            total = total + amp * (top + (bottom - top) * tz)
+            norm += amp
+        return self.base_height + math.floor(self.amplitude * total / norm)
+
+
+def generate_snapshot(generator: TerrainGenerator, position, size) -> ChunkSnapshot:
+    """Generate the chunk at `position` and return its snapshot; runs inside a worker."""
+    chunk = Chunk(position, size=size)
+    generator.generate(chunk)
+    return chunk.snapshot()
+
+
+GENERATORS = {
+    "heightmap": SimpleHeightmapGenerator,
+    "noise": NoiseTerrainGenerator,
+}
+
+
+def make_generator(name: str, seed: int = 0, chunk_size: Optional[tuple] = None) -> TerrainGenerator:
+    """Build the generator registered under `name`."""
+    if name == "heightmap":
+        return SimpleHeightmapGenerator(chunk_size[1] if chunk_size else 16)
+    if name == "noise":
+        return NoiseTerrainGenerator(seed=seed)
+    raise ValueError(f"Unknown terrain generator '{name}', expected one of {sorted(GENERATORS)}")
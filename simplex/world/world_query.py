@@ -1,9 +1,30 @@
-"""World-space block queries via ChunkManager."""
+"""World-space block queries via ChunkManager.
+
+The module-level helpers take a ChunkManager (or a WorldAccessor) and go
+through the manager's shared `WorldAccessor`, which remembers the chunk
+it touched last and reads chunks without LRU bookkeeping, so runs of
+nearby queries (ground scans, collision probes) cost a few integer
+operations each. `WorldAccessor.block_ids_at()` answers a whole NumPy
+array of points in one call. Ground queries read the per-column
+heightmaps chunks keep (`Chunk.column_height`) instead of scanning down
+block by block; only a column with solid blocks above the query point
+(an overhang) is scanned below that point.
+
+`raycast()` walks the voxel grid along a ray (Amanatides & Woo) and
+crosses an unloaded chunk or a chunk uniformly filled with a non-solid
+block in a single step, so rays through open sky cost a few iterations
+per chunk rather than one per block.
+"""
 
 import math
-from typing import Tuple
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from simplex.voxel.voxel import BLOCK_AIR, PALETTE, is_solid
 
-from simplex.voxel.voxel import BLOCK_AIR, is_solid
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 def world_to_chunk_coords(
@@ -29,18 +50,242 @@ def world_to_local(
     )
 
 
+_KEY_BIAS = 1 << 20
+
+
+class RayHit(NamedTuple):
+    """First solid block along a ray."""
+
+    block: Tuple[int, int, int]  # world block coordinates
+    block_id: int
+    normal: Tuple[int, int, int]  # face the ray entered through, (0, 0, 0) if it started inside
+    distance: float  # along the (normalised) ray to the entry point
+
+
+def solid_lookup():
+    """(65536,) bool array: is_solid for every block id (requires numpy)."""
+    table = np.zeros(1 << 16, dtype=bool)
+    for block_id, block in PALETTE.items():
+        table[block_id] = block.solid
+    return table
+
+
+class WorldAccessor:
+    """Read-only world-space block lookups over a ChunkManager.
+
+    Caches the last chunk touched together with its origin, and finds
+    other chunks with `ChunkManager.peek_chunk` (no LRU reordering). The
+    cache is dropped whenever the manager loads or unloads a chunk
+    (`ChunkManager.residency_version`), so it never serves an unloaded
+    chunk. Unloaded chunks read as air.
+    """
+
+    def __init__(self, chunk_manager):
+        self.chunk_manager = chunk_manager
+        self.sx, self.sy, self.sz = chunk_manager.chunk_size
+        self._version = -1
+        self._key = None
+        self._chunk = None
+        self._origin = (0, 0, 0)
+        self._solid = None
+
+    def chunk_at(self, cx: int, cy: int, cz: int):
+        """Loaded chunk at chunk coordinates (cx, cy, cz), or None."""
+        cm = self.chunk_manager
+        if self._version != cm.residency_version:
+            self._version = cm.residency_version
+            self._key = None
+        elif self._key == (cx, cy, cz):
+            return self._chunk
+        chunk = cm.peek_chunk((cx, cy, cz))
+        if chunk is not None:
+            self._key = (cx, cy, cz)
+            self._chunk = chunk
+            self._origin = (cx * self.sx, cy * self.sy, cz * self.sz)
+        return chunk
+
+    def block_id_at(self, wx: float, wy: float, wz: float) -> int:
+        x, y, z = math.floor(wx), math.floor(wy), math.floor(wz)
+        ox, oy, oz = self._origin
+        lx, ly, lz = x - ox, y - oy, z - oz
+        if (
+            self._key is None
+            or self._version != self.chunk_manager.residency_version
+            or not (0 <= lx < self.sx and 0 <= ly < self.sy and 0 <= lz < self.sz)
+        ):
+            chunk = self.chunk_at(x // self.sx, y // self.sy, z // self.sz)
+            if chunk is None:
+                return BLOCK_AIR
+            ox, oy, oz = self._origin
+            lx, ly, lz = x - ox, y - oy, z - oz
+        return self._chunk.get_block_id(lx, ly, lz)
+
+    def is_solid_at(self, wx: float, wy: float, wz: float) -> bool:
+        return is_solid(self.block_id_at(wx, wy, wz))
+
+    def ground_at(self, wx: float, wy: float, wz: float, scan_depth: int = 16) -> Optional[int]:
+        """World y of the top of the highest solid block at or below `wy`.
+
+        Looks at most `scan_depth` blocks down (the block containing `wy`
+        included) and returns None when nothing solid is found there.
+        """
+        x, z = math.floor(wx), math.floor(wz)
+        y = math.floor(wy)
+        lowest = y - scan_depth + 1
+        sx, sy, sz = self.sx, self.sy, self.sz
+        cx, cz = x // sx, z // sz
+        lx, lz = x - cx * sx, z - cz * sz
+        while y >= lowest:
+            cy = y // sy
+            oy = cy * sy
+            chunk = self.chunk_at(cx, cy, cz)
+            if chunk is not None:
+                height = chunk.column_height(lx, lz, y - oy)
+                if height:
+                    top = oy + height
+                    return top if top - 1 >= lowest else None
+            y = oy - 1
+        return None
+
+    def block_ids_at(self, points):
+        """Block ids at an (N, 3) array of world coordinates.
+
+        Returns a uint16 array with NumPy; without it `points` may be any
+        sequence of (x, y, z) and a list is returned.
+        """
+        if np is None:
+            return [self.block_id_at(x, y, z) for x, y, z in points]
+        cells = np.floor(np.asarray(points, dtype=np.float64).reshape(-1, 3)).astype(np.int64)
+        out = np.zeros(len(cells), dtype=np.uint16)
+        if not len(cells):
+            return out
+        size = np.array((self.sx, self.sy, self.sz), dtype=np.int64)
+        coords = cells // size
+        local = cells - coords * size
+        if (coords == coords[0]).all():
+            groups = [(tuple(int(c) for c in coords[0]), slice(None))]
+        else:
+            # one int64 per chunk coordinate (21 bits per axis) is much faster to unique than rows
+            packed = ((coords + _KEY_BIAS) << np.array((42, 21, 0), dtype=np.int64)).sum(axis=1)
+            _, first, inverse = np.unique(packed, return_index=True, return_inverse=True)
+            groups = [(tuple(int(c) for c in coords[i]), inverse == k) for k, i in enumerate(first)]
+        for key, sel in groups:
+            chunk = self.chunk_at(*key)
+            if chunk is None:
+                continue
+            if chunk.is_uniform():
+                out[sel] = chunk.uniform_id
+            else:
+                lx, ly, lz = local[sel].T
+                out[sel] = chunk.block_array()[lx, ly, lz]
+        return out
+
+    def solid_at(self, points):
+        """Solidity of each point; a bool array with NumPy, else a list."""
+        if np is None:
+            return [is_solid(bid) for bid in self.block_ids_at(points)]
+        if self._solid is None:
+            self._solid = solid_lookup()
+        return self._solid[self.block_ids_at(points)]
+
+    def raycast(
+        self,
+        origin: Sequence[float],
+        direction: Sequence[float],
+        max_distance: float = 64.0,
+    ) -> Optional[RayHit]:
+        """First solid block within `max_distance` of `origin` along `direction`, or None.
+
+        `direction` need not be normalised; distances are in blocks.
+        Unloaded chunks are treated as air.
+        """
+        length = math.sqrt(sum(float(c) * float(c) for c in direction))
+        if length == 0.0:
+            raise ValueError("raycast direction must be non-zero")
+        o = [float(c) for c in origin]
+        d = [float(c) / length for c in direction]
+        size = (self.sx, self.sy, self.sz)
+        pos = [math.floor(c) for c in o]
+        step = [(c > 0) - (c < 0) for c in d]
+        t_delta = [abs(1.0 / d[a]) if step[a] else math.inf for a in range(3)]
+        t_max = [((pos[a] + (step[a] > 0)) - o[a]) / d[a] if step[a] else math.inf for a in range(3)]
+        t = 0.0
+        axis = -1
+        chunk = None
+        lo = hi = (0, 0, 0)
+        while t <= max_distance:
+            x, y, z = pos
+            if not (lo[0] <= x < hi[0] and lo[1] <= y < hi[1] and lo[2] <= z < hi[2]):
+                key = (x // size[0], y // size[1], z // size[2])
+                chunk = self.chunk_at(*key)
+                lo = (key[0] * size[0], key[1] * size[1], key[2] * size[2])
+                hi = (lo[0] + size[0], lo[1] + size[1], lo[2] + size[2])
+                uniform = None if chunk is None else chunk.uniform_id
+                if chunk is None or (uniform is not None and not is_solid(uniform)):
+                    # leave the whole chunk in one step: find where the ray exits its box
+                    exit_t, axis = math.inf, -1
+                    for a in range(3):
+                        if step[a]:
+                            bound = hi[a] if step[a] > 0 else lo[a]
+                            ta = (bound - o[a]) / d[a]
+                            if ta < exit_t:
+                                exit_t, axis = ta, a
+                    t = exit_t
+                    for a in range(3):
+                        if a == axis:
+                            pos[a] = hi[a] if step[a] > 0 else lo[a] - 1
+                        else:
+                            pos[a] = min(max(math.floor(o[a] + d[a] * t), lo[a]), hi[a] - 1)
+                        if step[a]:
+                            t_max[a] = ((pos[a] + (step[a] > 0)) - o[a]) / d[a]
+                    continue
+            block_id = chunk.get_block_id(x - lo[0], y - lo[1], z - lo[2])
+            if is_solid(block_id):
+                normal = [0, 0, 0]
+                if axis >= 0:
+                    normal[axis] = -step[axis]
+                return RayHit((x, y, z), block_id, tuple(normal), t)
+            if t_max[0] < t_max[1]:
+                axis = 0 if t_max[0] < t_max[2] else 2
+            else:
+                axis = 1 if t_max[1] < t_max[2] else 2
+            t = t_max[axis]
+            pos[axis] += step[axis]
+            t_max[axis] += t_delta[axis]
+        return None
+
+    def raycast_many(self, origins, directions, max_distance=64.0) -> List[Optional[RayHit]]:
+        """`raycast` for each (origin, direction) pair; `max_distance` may be per ray.
+
+        Accepts (N, 3) NumPy arrays or sequences of triples. The rays share
+        this accessor's chunk cache, so bundles of nearby rays (line of
+        sight checks, explosion fans) avoid most chunk lookups.
+        """
+        if np is not None:
+            origins = np.asarray(origins, dtype=np.float64).reshape(-1, 3).tolist()
+            directions = np.asarray(directions, dtype=np.float64).reshape(-1, 3).tolist()
+            if np.ndim(max_distance):
+                max_distance = np.asarray(max_distance, dtype=np.float64).tolist()
+        if len(origins) != len(directions):
+            raise ValueError("origins and directions must have the same length")
+        if isinstance(max_distance, (int, float)):
+            max_distance = [max_distance] * len(origins)
+        cast = self.raycast
+        return [cast(o, d, m) for o, d, m in zip(origins, directions, max_distance)]
+
+
+def accessor_for(world) -> WorldAccessor:
+    """`world` itself if it is a WorldAccessor, else the ChunkManager's shared accessor."""
+    if isinstance(world, WorldAccessor):
+        return world
+    return world.accessor()
+
+
 def get_block_id_at_world(chunk_manager, wx: float, wy: float, wz: float) -> int:
     """Return block id at world coordinates, or air if chunk unloaded."""
     if chunk_manager is None:
         return BLOCK_AIR
-    cx, cy, cz = world_to_chunk_coords(wx, wy, wz, chunk_manager.chunk_size)
-    chunk = chunk_manager.get_chunk((cx, cy, cz))
-    if chunk is None:
-        return BLOCK_AIR
-    lx, ly, lz = world_to_local(wx, wy, wz, chunk_manager.chunk_size)
-    if not chunk.in_bounds(lx, ly, lz):
-        return BLOCK_AIR
-    return chunk.get_block(lx, ly, lz).block_id
+    return accessor_for(chunk_manager).block_id_at(wx, wy, wz)
 
 
 def is_solid_at_world(chunk_manager, wx: float, wy: float, wz: float) -> bool:
@@ -56,6 +301,9 @@ def find_ground_height(
     scan_depth: int = 16,
 ) -> float | None:
     """Highest walkable Y (top of solid + 1) under the player's feet."""
+    if chunk_manager is None:
+        return None
+    world = accessor_for(chunk_manager)
     top = None
     samples = ((px, pz),)
     if half_width > 0:
@@ -66,16 +314,27 @@ def find_ground_height(
             (px, pz - half_width),
             (px, pz + half_width),
         )
-    start_y = int(math.floor(py))
     for wx, wz in samples:
-        for y in range(start_y, start_y - scan_depth, -1):
-            if is_solid_at_world(chunk_manager, wx, y, wz):
-                candidate = float(y + 1)
-                top = candidate if top is None else max(top, candidate)
-                break
-    return top
+        ground = world.ground_at(wx, py, wz, scan_depth)
+        if ground is not None and (top is None or ground > top):
+            top = ground
+    return None if top is None else float(top)
+
+
+def raycast(
+    chunk_manager,
+    origin: Sequence[float],
+    direction: Sequence[float],
+    max_distance: float = 64.0,
+) -> Optional[RayHit]:
+    """First solid block along a ray (see WorldAccessor.raycast), None on a miss."""
+    if chunk_manager is None:
+        return None
+    return accessor_for(chunk_manager).raycast(origin, direction, max_distance)
 
 
 def feet_on_ground(chunk_manager, px: float, py: float, pz: float) -> bool:
     """Fast check: is there solid directly under the feet?"""
-    return is_solid_at_world(chunk_manager, px, py - 0.05, pz)
+    if chunk_manager is None:
+        return False
+    return accessor_for(chunk_manager).ground_at(px, py - 0.05, pz, 1) is not None
@@ -1,7 +1,11 @@
+import time
 import unittest
 
+from simplex.ecs.chunk_system import ChunkMeshSystem
+from simplex.ecs.components import MeshComponent
 from simplex.ecs.ecs import ECS
-from simplex.world.chunk_manager import ChunkManager
+from simplex.event.event_system import EventSystem
+from simplex.world.chunk_manager import LOADED, PENDING, UNLOADED, ChunkManager
 
 
 class ChunkManagerTests(unittest.TestCase):
@@ -45,6 +49,255 @@ class ChunkManagerTests(unittest.TestCase):
         self.assertEqual(len(loaded), 9)
         self.assertTrue(all(y == 0 for (_, y, _) in loaded))
 
+    def test_eviction_skips_pinned_chunks(self):
+        self.cm.pin_area((0, 0, 0), radius=0)
+        for x in range(4):
+            self.cm.create_chunk((x, 0, 0))
+        self.assertIn((0, 0, 0), self.cm.list_loaded())
+        self.assertEqual(len(self.cm.list_loaded()), 2)
+        self.assertEqual(self.cm.stats()["evictions"], 2)
+
+        # a fully pinned cache grows past cache_size instead of evicting
+        self.cm.pin_area((0, 0, 0), radius=1, horizontal_only=True)
+        self.cm.ensure_area_loaded((0, 0, 0), radius=1, horizontal_only=True)
+        self.assertEqual(len(self.cm.list_loaded()), 9)
+
+    def test_unload_radius_stops_boundary_thrash(self):
+        self.cm.cache_size = 64
+        for step in range(6):
+            center = (step % 2, 0, 0)
+            self.cm.ensure_area_loaded(center, radius=1, horizontal_only=True)
+        thrashing = self.cm.stats()
+        self.assertGreater(thrashing["regenerations"], 0)
+        self.assertGreater(thrashing["thrash_rate"], 0.0)
+
+        steady = ChunkManager(ECS(), chunk_size=(8, 8, 8), cache_size=64)
+        for step in range(6):
+            center = (step % 2, 0, 0)
+            steady.ensure_area_loaded(center, radius=1, horizontal_only=True, unload_radius=2)
+        self.assertEqual(steady.stats()["regenerations"], 0)
+        self.assertEqual(steady.stats()["loads"], 12)
+
+    def test_memory_usage_counts_blocks_and_shared_meshes_once(self):
+        self.cm.cache_size = 10
+        for x in range(3):
+            self.cm.create_chunk((x, 0, 0))
+        shared = [0.0] * 300
+        gpu = {"vbo": 1, "count": 100, "nbytes": 2800}
+        for x in range(2):
+            mesh = MeshComponent(vertices=shared, colors=[])
+            mesh.gpu = gpu
+            self.ecs.get_entity(f"chunk_{x}_0_0").add_component(mesh)
+            self.cm.account_chunk((x, 0, 0))
+        usage = self.cm.memory_usage()
+        self.assertEqual(usage["blocks"], 3 * 8 * 8 * 8 * 2)
+        self.assertEqual(usage["mesh_gpu"], 2800)
+        self.assertEqual(usage["mesh_cpu"], MeshComponent(vertices=shared, colors=[]).cpu_nbytes())
+        self.assertEqual(usage["total"], usage["blocks"] + usage["mesh_cpu"] + usage["mesh_gpu"])
+
+    def test_memory_budget_evicts_oldest_unpinned(self):
+        cm = ChunkManager(ECS(), chunk_size=(8, 8, 8), cache_size=100, memory_budget=3 * 1024)
+        cm.pin_area((0, 0, 0), radius=0)
+        for x in range(6):
+            cm.create_chunk((x, 0, 0))
+        loaded = cm.list_loaded()
+        self.assertEqual(len(loaded), 3)
+        self.assertIn((0, 0, 0), loaded)
+        self.assertIn((5, 0, 0), loaded)
+        self.assertLessEqual(cm.memory_usage()["total"], 3 * 1024)
+
+    def test_new_chunk_stays_loaded_when_over_budget(self):
+        cm = ChunkManager(ECS(), chunk_size=(8, 8, 8), cache_size=100, memory_budget=100)
+        entity = cm.create_chunk((0, 0, 0))
+        self.assertIs(cm.ecs.get(entity.id), entity)
+        self.assertEqual(cm.list_loaded(), [(0, 0, 0)])
+
+        # the pinned area alone exceeds the budget; the new chunk still loads
+        blocks = 8 * 8 * 8 * 2
+        cm.memory_budget = 5 * blocks
+        cm.pin_area((0, 0, 0), radius=1, horizontal_only=True)
+        cm.ensure_area_loaded((0, 0, 0), radius=1, horizontal_only=True)
+        entity = cm.create_chunk((5, 0, 0))
+        self.assertIsNotNone(entity.id)
+        self.assertIn((5, 0, 0), cm.list_loaded())
+        self.assertGreater(cm.memory_usage()["total"], cm.memory_budget)
+
+        # the next load evicts it instead, as it is no longer the newest
+        cm.create_chunk((6, 0, 0))
+        self.assertNotIn((5, 0, 0), cm.list_loaded())
+        self.assertIn((6, 0, 0), cm.list_loaded())
+
+    def test_shared_mesh_is_freed_with_its_last_owner(self):
+        cm = ChunkManager(ECS(), chunk_size=(8, 8, 8), cache_size=100)
+        for x in range(4):
+            cm.create_chunk((x, 0, 0))
+        cm.pin_area((3, 0, 0), radius=0)
+        shared = [0.0] * 3000
+        for x in range(2):
+            cm.ecs.get_entity(f"chunk_{x}_0_0").add_component(MeshComponent(vertices=shared, colors=[]))
+            cm.account_chunk((x, 0, 0))
+        blocks = 8 * 8 * 8 * 2
+        self.assertEqual(cm.memory_usage()["total"], 4 * blocks + MeshComponent(vertices=shared).cpu_nbytes())
+
+        # dropping both owners frees the mesh, so (2, 0, 0) can stay
+        cm.memory_budget = 2 * blocks + 100
+        self.assertEqual(cm.enforce_memory_budget(), 2)
+        self.assertEqual(sorted(cm.list_loaded()), [(2, 0, 0), (3, 0, 0)])
+        self.assertEqual(cm.memory_usage()["total"], 2 * blocks)
+
+    def test_attached_meshes_count_against_the_budget(self):
+        events = EventSystem()
+        ecs = ECS(events)
+        cm = ChunkManager(ecs, event_system=events, chunk_size=(8, 8, 8), cache_size=100)
+
+        class _Engine:
+            chunk_manager = cm
+
+        ecs.add_system(ChunkMeshSystem(event_system=events, max_chunks_per_frame=10, engine=_Engine()))
+        cm.pin_area((3, 0, 0), radius=0)
+        for x in range(4):
+            cm.create_chunk((x, 0, 0))
+        cm.memory_budget = cm.memory_usage()["total"] + 100
+        self.assertEqual(cm.stats()["evictions"], 0)
+
+        # meshing the chunks pushes them over budget without a new load
+        ecs.update()
+        usage = cm.memory_usage()
+        self.assertGreater(cm.stats()["evictions"], 0)
+        self.assertIn((3, 0, 0), cm.list_loaded())
+        self.assertGreater(usage["mesh_cpu"], 0)
+        self.assertTrue(usage["total"] <= cm.memory_budget or cm.list_loaded() == [(3, 0, 0)])
+        # running totals match a full recount
+        measured = [cm._measure(cm._chunks[pos]) for pos in cm.list_loaded()]
+        parts = dict(part for _, chunk_parts in measured for part in chunk_parts)
+        self.assertEqual(usage["total"], sum(b for b, _ in measured) + sum(parts.values()))
+
+    def test_unloading_releases_gpu_buffers(self):
+        class _VBOManager:
+            deleted = []
+
+            def delete_vbo(self, handle):
+                self.deleted.append(handle)
+
+        class _Engine:
+            vbo_manager = _VBOManager()
+
+        events = EventSystem()
+        ecs = ECS(events)
+        cm = ChunkManager(ecs, event_system=events, chunk_size=(8, 8, 8))
+        ChunkMeshSystem(event_system=events, engine=_Engine())
+        cm.create_chunk((0, 0, 0))
+        mesh = MeshComponent(vertices=[0.0] * 9)
+        mesh.gpu = {"vbo": 7, "count": 3}
+        ecs.get_entity("chunk_0_0_0").add_component(mesh)
+        cm.unload_chunk((0, 0, 0))
+        self.assertEqual(_Engine.vbo_manager.deleted, [{"vbo": 7, "count": 3, "refs": 0}])
+        self.assertIsNone(mesh.gpu)
+
+    def test_loading_neighbor_invalidates_only_meshed_sides_it_hides(self):
+        self.cm.cache_size = 10
+        self.cm.create_chunk((0, 0, 0))
+        center = self.cm.get_chunk((0, 0, 0))
+        center.mark_clean()
+
+        # generated terrain has solid border cells, so the meshed chunk must re-mesh
+        self.cm.create_chunk((1, 0, 0))
+        self.assertTrue(center.dirty)
+
+        # an all-air neighbour hides nothing; a border edit always re-meshes
+        self.cm.create_chunk((-1, 0, 0))
+        air = self.cm.peek_chunk((-1, 0, 0))
+        air.fill(0)
+        center.mark_clean()
+        self.assertEqual(self.cm.invalidate_neighbors((-1, 0, 0), ["px"], only_if_solid=True), 0)
+        self.assertFalse(center.dirty)
+        self.assertEqual(self.cm.invalidate_neighbors((-1, 0, 0), ["px"]), 1)
+        self.assertTrue(center.dirty)
+
+    def test_unloading_invalidates_neighbors_it_hid(self):
+        self.cm.cache_size = 10
+        self.cm.create_chunk((0, 0, 0))
+        self.cm.create_chunk((1, 0, 0))
+        self.cm.create_chunk((-1, 0, 0))
+        center = self.cm.get_chunk((0, 0, 0))
+        self.cm.peek_chunk((-1, 0, 0)).fill(0)
+
+        # the solid neighbour exposes the center's faces when it goes
+        center.mark_clean()
+        self.cm.unload_chunk((1, 0, 0))
+        self.assertTrue(center.dirty)
+
+        # an all-air neighbour hid nothing
+        center.mark_clean()
+        self.cm.unload_chunk((-1, 0, 0))
+        self.assertFalse(center.dirty)
+
+    def test_neighbor_borders_reads_facing_layers_without_lru_reorder(self):
+        self.cm.cache_size = 10
+        self.cm.create_chunk((0, 0, 0))
+        self.cm.create_chunk((1, 0, 0))
+        lru_before = list(self.cm._lru)
+        borders = self.cm.neighbor_borders((0, 0, 0))
+        self.assertEqual(set(borders), {"px"})
+        right = self.cm.peek_chunk((1, 0, 0))
+        self.assertEqual(borders["px"][0][0], right.get_block_id(0, 0, 0))
+        self.assertEqual(list(self.cm._lru), lru_before)
+
+
+
+class AsyncChunkManagerTests(unittest.TestCase):
+    def setUp(self):
+        self.ecs = ECS()
+        self.cm = ChunkManager(
+            self.ecs,
+            chunk_size=(8, 8, 8),
+            cache_size=32,
+            workers=2,
+            worker_kind="thread",
+            integrate_per_frame=3,
+        )
+
+    def tearDown(self):
+        self.cm.shutdown()
+
+    def _wait_for_jobs(self):
+        deadline = time.monotonic() + 10.0
+        while not all(f.done() for f in self.cm._pending.values()):
+            self.assertLess(time.monotonic(), deadline, "generation jobs did not finish")
+            time.sleep(0.001)
+
+    def test_preload_queues_jobs_and_integrates_under_budget(self):
+        self.cm.preload_area((0, 0, 0), radius=1, horizontal_only=True)
+        self.assertEqual(self.cm.list_loaded(), [])
+        self.assertEqual(len(self.cm.list_pending()), 9)
+        self.assertEqual(self.cm.chunk_state((1, 0, 1)), PENDING)
+        self.assertEqual(self.cm.chunk_state((5, 0, 5)), UNLOADED)
+        self.assertIsNone(self.cm.get_chunk((1, 0, 1)))
+        self.assertIsNone(self.cm.ensure_loaded((1, 0, 1)))
+
+        self._wait_for_jobs()
+        self.assertEqual(self.cm.integrate_pending(), 3)
+        self.assertEqual(len(self.cm.list_loaded()), 3)
+        while self.cm.integrate_pending():
+            pass
+        self.assertEqual(len(self.cm.list_loaded()), 9)
+        self.assertEqual(self.cm.chunk_state((1, 0, 1)), LOADED)
+        self.assertIsNotNone(self.ecs.get_entity("chunk_1_0_1"))
+
+        sync = ChunkManager(ECS(), chunk_size=(8, 8, 8))
+        sync.create_chunk((1, 0, 1))
+        self.assertEqual(self.cm.get_chunk((1, 0, 1)).snapshot(), sync.get_chunk((1, 0, 1)).snapshot())
+
+    def test_unwanted_pending_positions_are_cancelled(self):
+        self.cm.preload_area((0, 0, 0), radius=1, horizontal_only=True)
+        self.cm.unload_outside_area((0, 0, 0), radius=0, horizontal_only=True)
+        self.assertEqual(self.cm.list_pending(), [(0, 0, 0)])
+
+        # create_chunk generates immediately and replaces the pending job
+        self.cm.create_chunk((0, 0, 0))
+        self.assertEqual(self.cm.chunk_state((0, 0, 0)), LOADED)
+        self.assertEqual(self.cm.list_pending(), [])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,114 @@
+import threading
+import time
+import unittest
+
+from simplex.ecs.chunk_system import ChunkMeshSystem
+from simplex.ecs.ecs import ECS
+from simplex.event.event_system import EventSystem
+from simplex.voxel.chunk import Chunk
+from simplex.voxel.meshgen import generate_greedy_mesh
+from simplex.voxel.mesh_jobs import mesh_snapshot
+from simplex.voxel.voxel import BLOCK_DIRT, BLOCK_STONE
+from simplex.world.chunk_manager import ChunkManager
+
+
+class _Sim:
+    def __init__(self, workers=1, worker_kind="thread"):
+        self.events = EventSystem()
+        self.ecs = ECS(self.events)
+        self.chunk_manager = ChunkManager(self.ecs, chunk_size=(16, 16, 16))
+        self.mesh_system = ChunkMeshSystem(
+            event_system=self.events,
+            max_chunks_per_frame=4,
+            engine=self,
+            workers=workers,
+            worker_kind=worker_kind,
+        )
+        self.ecs.add_system(self.mesh_system)
+        self.generated = []
+        self.events.register("mesh_generated", lambda e: self.generated.append(e["entity"].name))
+
+    def run_until_meshed(self, timeout=30.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            self.ecs.update()
+            dirty = [e for e in self.ecs.get_entities_with("chunk") if e.get_component("chunk").dirty]
+            if not dirty and not self.mesh_system.pending_jobs():
+                return
+            time.sleep(0.001)
+        raise AssertionError("chunks were not meshed in time")
+
+
+class ChunkMeshWorkerTests(unittest.TestCase):
+    def test_snapshot_mesh_matches_direct_mesh(self):
+        chunk = Chunk((0, 0, 0), palette=True)
+        for x in range(16):
+            for z in range(16):
+                for y in range((x * z) % 7 + 1):
+                    chunk.set_block_id(x, y, z, BLOCK_STONE if y < 2 else BLOCK_DIRT)
+        verts, cols, packed = mesh_snapshot(chunk.snapshot(), "greedy")
+        self.assertEqual((verts, cols), generate_greedy_mesh(chunk))
+        self.assertIsNone(packed)
+
+    def test_thread_pool_meshes_chunks_and_emits_events(self):
+        sim = _Sim(workers=2, worker_kind="thread")
+        try:
+            sim.chunk_manager.create_chunk((0, 0, 0))
+            sim.chunk_manager.create_chunk((1, 0, 0))
+            sim.run_until_meshed()
+            self.assertEqual(sorted(sim.generated), ["chunk_0_0_0", "chunk_1_0_0"])
+            mesh = sim.ecs.get_entity("chunk_0_0_0").get_component("mesh")
+            expected, _ = generate_greedy_mesh(
+                sim.chunk_manager.peek_chunk((0, 0, 0)),
+                sim.chunk_manager.neighbor_borders((0, 0, 0)),
+            )
+            self.assertEqual(mesh.vertices, expected)
+        finally:
+            sim.ecs.shutdown()
+
+    def test_result_discarded_when_chunk_changes_in_flight(self):
+        sim = _Sim(workers=1, worker_kind="thread")
+        gate = threading.Event()
+        # block the single worker so the job is still in flight while we edit
+        sim.mesh_system._pool.submit = _gated(sim.mesh_system._pool.submit, gate)
+        try:
+            sim.chunk_manager.create_chunk((0, 0, 0))
+            sim.ecs.update()
+            self.assertEqual(sim.mesh_system.pending_jobs(), 1)
+            chunk = sim.chunk_manager.peek_chunk((0, 0, 0))
+            chunk.set_block_id(3, 14, 3, BLOCK_STONE)
+            gate.set()
+            sim.run_until_meshed()
+            self.assertEqual(sim.mesh_system.stale_results, 1)
+            self.assertEqual(sim.generated, ["chunk_0_0_0"])
+            mesh = sim.ecs.get_entity("chunk_0_0_0").get_component("mesh")
+            self.assertEqual(mesh.vertices, generate_greedy_mesh(chunk)[0])
+        finally:
+            sim.ecs.shutdown()
+
+    def test_process_pool_meshes_chunks(self):
+        sim = _Sim(workers=1, worker_kind="process")
+        try:
+            sim.chunk_manager.create_chunk((0, 0, 0))
+            sim.run_until_meshed(timeout=60.0)
+            self.assertEqual(sim.generated, ["chunk_0_0_0"])
+        finally:
+            sim.ecs.shutdown()
+
+
+def _gated(submit, gate):
+    def _submit(*args, **kwargs):
+        future = submit(*args, **kwargs)
+        done = future.done
+
+        def _done():
+            return gate.is_set() and done()
+
+        future.done = _done
+        return future
+
+    return _submit
+
+
+if __name__ == "__main__":
+    unittest.main()
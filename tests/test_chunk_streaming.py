@@ -1,9 +1,18 @@
 import unittest
 
-from simplex.ecs.chunk_streaming_system import ChunkStreamingSystem
+from simplex.ecs.chunk_streaming_system import ChunkStreamingSystem, chunk_priority
 from simplex.ecs.components import PositionComponent
-from simplex.ecs.ecs import ECS, Entity
-from simplex.world.chunk_manager import ChunkManager
+from simplex.ecs.ecs import ECS, Entity, System
+from simplex.world.chunk_manager import ChunkManager, PENDING
+
+
+class _Controller(System):
+    """Stands in for FirstPersonController's view angles."""
+
+    def __init__(self, yaw=0.0, pitch=0.0):
+        super().__init__("player_control")
+        self.yaw = yaw
+        self.pitch = pitch
 
 
 class ChunkStreamingTests(unittest.TestCase):
@@ -59,5 +68,62 @@ class ChunkStreamingTests(unittest.TestCase):
         self.assertEqual(self.system._last_center[0], 1)
 
 
+
+class ChunkLoadQueueTests(unittest.TestCase):
+    def _make(self, radius=2, loads_per_frame=1, workers=0):
+        ecs = ECS()
+        cm = ChunkManager(ecs, chunk_size=(16, 16, 16), cache_size=64, workers=workers, worker_kind="thread")
+        self.addCleanup(cm.shutdown)
+
+        class _Engine:
+            pass
+
+        engine = _Engine()
+        engine.ecs = ecs
+        engine.chunk_manager = cm
+        controller = _Controller()
+        ecs.add_system(controller)
+        system = ChunkStreamingSystem(engine=engine, radius=radius, loads_per_frame=loads_per_frame)
+        ecs.add_system(system)
+        player = Entity("Player")
+        player.add_component(PositionComponent(8.0, 8.0, 8.0))
+        ecs.add_entity(player)
+        return ecs, cm, controller, system, player.get_component("position")
+
+    def test_priority_prefers_near_and_in_view(self):
+        eye = (8.0, 8.0, 8.0)
+        forward = (0.0, 0.0, 1.0)
+        size = (16, 16, 16)
+        self.assertLess(chunk_priority((0, 0, 1), eye, forward, size), chunk_priority((0, 0, 2), eye, forward, size))
+        self.assertLess(chunk_priority((0, 0, 1), eye, forward, size), chunk_priority((0, 0, -1), eye, forward, size))
+        self.assertEqual(chunk_priority((1, 0, 0), eye, None, size), chunk_priority((0, 0, -1), eye, None, size))
+
+    def test_center_then_view_direction_load_first(self):
+        ecs, cm, controller, system, _ = self._make()
+        controller.yaw = 90.0  # facing +x
+        ecs.update()
+        self.assertEqual(cm.list_loaded(), [(0, 0, 0)])
+        order = system.queued_positions()
+        self.assertEqual(len(order), 24)
+        self.assertEqual(order[0], (1, 0, 0))
+        self.assertGreater(order.index((-1, 0, 0)), order.index((2, 0, 0)))
+
+        # turning around re-sorts the remaining queue
+        controller.yaw = 270.0
+        ecs.update()
+        self.assertEqual(cm.list_loaded()[-1], (-1, 0, 0))
+
+    def test_moving_center_reprioritizes_and_cancels(self):
+        ecs, cm, controller, system, pos = self._make(radius=1, loads_per_frame=4, workers=1)
+        ecs.update()
+        self.assertEqual(len(cm.list_pending()), 4)
+        pos.x += 16.0 * 4
+        ecs.update()
+        # everything around the old center was dropped, the new center goes first
+        self.assertTrue(all(p[0] >= 2 for p in cm.list_pending() + cm.list_loaded()))
+        self.assertEqual(cm.chunk_state((4, 0, 0)), PENDING)
+        self.assertEqual(len(system.queued_positions()), 5)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+from simplex.ecs.components import CollisionComponent, PositionComponent, VelocityComponent
+from simplex.ecs.ecs import ECS, Entity
+from simplex.ecs.systems import MovementSystem
+from simplex.physics.physics import Physics
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _mover(name, position=(0.0, 0.0, 0.0), velocity=(1.0, 2.0, 3.0)):
+    entity = Entity(name)
+    entity.add_component(PositionComponent(*position))
+    entity.add_component(VelocityComponent(*velocity))
+    return entity
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class ColumnStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.ecs = ECS(columns=True)
+        self.store = self.ecs.columns
+
+    def test_components_become_views_over_stable_rows(self):
+        a, b = _mover("a", (1.0, 2.0, 3.0)), _mover("b")
+        self.ecs.add_entity(a)
+        self.ecs.add_entity(b)
+        pos = a.get_component("position")
+        self.assertTrue(pos.bound)
+        self.assertEqual(self.store.position[:, a._row].tolist(), [1.0, 2.0, 3.0])
+        pos.y = 7.0
+        self.assertEqual(self.store.position[1, a._row], 7.0)
+        self.store.velocity[2, b._row] = -4.0
+        self.assertEqual(b.get_component("velocity").vz, -4.0)
+
+        # rows survive growth and are reused once freed
+        row_b = b._row
+        for i in range(self.store.capacity):
+            self.ecs.add_entity(_mover(f"m{i}"))
+        self.assertEqual(b._row, row_b)
+        self.assertEqual(pos.position, (1.0, 7.0, 3.0))
+        self.ecs.remove_entity("a")
+        self.assertFalse(pos.bound)
+        self.assertEqual(pos.position, (1.0, 7.0, 3.0))
+        late = _mover("late")
+        self.ecs.add_entity(late)
+        self.assertEqual(late._row, 0)
+
+    def test_component_swaps_and_removal_unbind(self):
+        entity = _mover("e", (5.0, 0.0, 0.0))
+        self.ecs.add_entity(entity)
+        old = entity.get_component("position")
+        entity.add_component(PositionComponent(9.0, 9.0, 9.0))
+        self.assertFalse(old.bound)
+        self.assertEqual(self.store.position[:, entity._row].tolist(), [9.0, 9.0, 9.0])
+        velocity = entity.remove_component("velocity")
+        self.assertEqual(velocity.velocity, (1.0, 2.0, 3.0))
+        entity.remove_component("position")
+        self.assertEqual(entity._row, -1)
+        self.assertEqual(len(self.store), 0)
+
+    def test_movement_and_physics_integrate_all_rows(self):
+        movers = [_mover(f"m{i}", (float(i), 0.0, 0.0)) for i in range(5)]
+        paddle = _mover("paddle", (0.0, 590.0, 0.0), (0.0, 20.0, 0.0))
+        paddle.add_component(CollisionComponent(height=20.0))
+        still = Entity("still")
+        still.add_component(PositionComponent())
+        for entity in movers + [paddle, still]:
+            self.ecs.add_entity(entity)
+        self.ecs.add_system(MovementSystem(bounds=(800, 600)))
+        self.ecs.update()
+        self.ecs.update()
+        for i, entity in enumerate(movers):
+            self.assertEqual(entity.get_component("position").position, (i + 2.0, 4.0, 6.0))
+        self.assertEqual(paddle.get_component("position").y, 590.0)
+        self.assertEqual(paddle.get_component("velocity").vy, 0)
+        self.assertEqual(still.get_component("position").position, (0.0, 0.0, 0.0))
+
+        Physics(ecs=self.ecs).simulate_ecs(self.ecs)
+        self.assertEqual(movers[0].get_component("position").position, (3.0, 6.0, 9.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+from simplex.ecs.components import PositionComponent
+from simplex.ecs.ecs import ECS, Entity
+from simplex.world.chunk_manager import ChunkManager
+
+
+class EntityHandleTests(unittest.TestCase):
+    def test_stale_handle_does_not_resolve_to_reused_slot(self):
+        ecs = ECS()
+        first = ecs.add_entity("first")
+        handle = first.id
+        self.assertIs(ecs.get(handle), first)
+
+        ecs.remove_entity(handle)
+        self.assertIsNone(first.id)
+        self.assertFalse(ecs.is_alive(handle))
+
+        second = ecs.add_entity("second")
+        # same slot, next generation
+        self.assertNotEqual(second.id, handle)
+        self.assertIsNone(ecs.get(handle))
+        self.assertIs(ecs.get(second.id), second)
+        self.assertIsNone(ecs.remove_entity(handle))
+        self.assertIs(ecs.get_entity("second"), second)
+
+    def test_swap_remove_keeps_entities_and_queries_consistent(self):
+        ecs = ECS()
+        entities = []
+        for i in range(6):
+            entity = Entity(f"e{i}")
+            entity.add_component(PositionComponent(i, 0, 0))
+            entities.append(ecs.add_entity(entity))
+        ecs.remove_entity(entities[1])
+        ecs.remove_entity("e3")
+        ecs.remove_entity(entities[5].id)
+
+        self.assertEqual(sorted(e.name for e in ecs.entities), ["e0", "e2", "e4"])
+        for pos, entity in enumerate(ecs.entities):
+            self.assertEqual(entity._pos, pos)
+            self.assertIs(ecs.get(entity.id), entity)
+        self.assertEqual([e.name for e in ecs.query("position")], ["e0", "e2", "e4"])
+        self.assertIsNone(ecs.get_entity("e3"))
+
+    def test_without_name_index_duplicate_names_coexist(self):
+        ecs = ECS(name_index=False)
+        a = ecs.add_entity("mob")
+        b = ecs.add_entity("mob")
+        self.assertEqual(len(ecs.entities), 2)
+        self.assertIn(ecs.get_entity("mob"), (a, b))
+        ecs.remove_entity(a)
+        self.assertIs(ecs.get_entity("mob"), b)
+
+        indexed = ECS()
+        indexed.add_entity("mob")
+        indexed.add_entity("mob")  # replaces
+        self.assertEqual(len(indexed.entities), 1)
+
+    def test_clear_invalidates_handles(self):
+        ecs = ECS()
+        handle = ecs.add_entity("a").id
+        ecs.clear()
+        self.assertIsNone(ecs.get(handle))
+        self.assertIsNotNone(ecs.get(ecs.add_entity("b").id))
+
+    def test_chunk_manager_tracks_entities_by_handle(self):
+        ecs = ECS()
+        cm = ChunkManager(ecs, chunk_size=(8, 8, 8), cache_size=64)
+        for x in range(4):
+            cm.create_chunk((x, 0, 0))
+        entity = cm.create_chunk((2, 0, 0))
+        self.assertIs(ecs.get_entity("chunk_2_0_0"), entity)
+
+        cm.unload_chunk((2, 0, 0))
+        self.assertIsNone(entity.id)
+        self.assertEqual(len(ecs.entities), 3)
+        reloaded = cm.create_chunk((2, 0, 0))
+        self.assertIsNot(reloaded, entity)
+        self.assertIs(cm.create_chunk((2, 0, 0)), reloaded)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import time
+import unittest
+
+from simplex.debug.debug_overlay import format_system_profile
+from simplex.ecs.components import PositionComponent
+from simplex.ecs.ecs import ECS, System
+from simplex.ecs.profiler import SystemProfiler, percentile
+
+
+class _Spiky(System):
+    """Sleeps `ms` on every `every`-th call."""
+
+    def __init__(self, name, ms=0.0, every=1, required=()):
+        super().__init__(name)
+        self.ms, self.every, self.calls = ms, every, 0
+        self.required_components = list(required)
+        self.reads, self.writes = set(), {name}
+
+    def update(self, entities):
+        self.calls += 1
+        if self.ms and self.calls % self.every == 0:
+            time.sleep(self.ms / 1000.0)
+
+
+class PercentileTests(unittest.TestCase):
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7.0], 99), 7.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_window_rolls(self):
+        profiler = SystemProfiler(window=10)
+        for ms in [100.0] * 10 + [1.0] * 10:
+            profiler.record("s", ms)
+        stats = profiler.stats()["systems"]["s"]
+        self.assertEqual((stats["calls"], stats["p99_ms"], stats["max_ms"]), (20, 1.0, 1.0))
+
+
+class EcsProfilingTests(unittest.TestCase):
+    def _ecs(self, **kwargs):
+        ecs = ECS(**kwargs)
+        self.addCleanup(ecs.shutdown)
+        for i in range(3):
+            ecs.add_entity(f"e{i}").add_component(PositionComponent())
+        ecs.add_entity("bare")
+        ecs.add_system(_Spiky("steady", required=["position"]))
+        ecs.add_system(_Spiky("spiky", ms=5.0, every=10))
+        return ecs
+
+    def test_off_by_default(self):
+        ecs = self._ecs()
+        ecs.update()
+        self.assertIsNone(ecs.profiler)
+        self.assertEqual(ecs.profile_stats(), {})
+
+    def test_spikes_show_in_tail_percentiles_and_get_the_blame(self):
+        ecs = self._ecs()
+        ecs.enable_profiling(window=50, budget_ms=4.0)
+        for _ in range(50):
+            ecs.update()
+        stats = ecs.profile_stats()
+        spiky, steady = stats["systems"]["spiky"], stats["systems"]["steady"]
+        self.assertEqual(stats["frames"], 50)
+        self.assertEqual((spiky["calls"], steady["calls"]), (50, 50))
+        self.assertEqual((steady["entities"], spiky["entities"]), (3, 4))
+        self.assertLess(spiky["p50_ms"], 4.0)
+        self.assertGreaterEqual(spiky["p95_ms"], 5.0)
+        self.assertEqual(spiky["over_budget"], 5)
+        self.assertEqual(steady["over_budget"], 0)
+        self.assertEqual(stats["frame"]["entities"], 4)
+        self.assertEqual(ecs.profiler.slowest(1)[0][0], "spiky")
+
+        lines = format_system_profile(stats)
+        self.assertTrue(lines[0].startswith("frame: "))
+        self.assertTrue(lines[1].startswith("spiky: ") and lines[1].endswith("(5 over)"))
+
+    def test_scheduled_systems_are_profiled(self):
+        ecs = self._ecs(workers=2, profile=True)
+        for _ in range(10):
+            ecs.update()
+        systems = ecs.profile_stats()["systems"]
+        self.assertEqual({name: s["calls"] for name, s in systems.items()}, {"steady": 10, "spiky": 10})
+        self.assertGreaterEqual(systems["spiky"]["max_ms"], 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
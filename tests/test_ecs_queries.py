@@ -0,0 +1,88 @@
+import unittest
+
+from simplex.ecs.components import PositionComponent, VelocityComponent
+from simplex.ecs.ecs import ECS, Component, Entity, System
+
+
+class _Tag(Component):
+    def __init__(self, name="tag"):
+        super().__init__(name)
+
+
+class _Recorder(System):
+    def __init__(self, *required):
+        super().__init__("recorder")
+        self.required_components = list(required)
+        self.seen = []
+
+    def _process_entities(self, entities):
+        self.seen.append([entity.name for entity in entities])
+
+
+def _entity(name, *components):
+    entity = Entity(name)
+    for component in components:
+        entity.add_component(component)
+    return entity
+
+
+class ArchetypeQueryTests(unittest.TestCase):
+    def setUp(self):
+        self.ecs = ECS()
+        self.ecs.add_entity(_entity("a", PositionComponent()))
+        self.ecs.add_entity(_entity("b", PositionComponent(), VelocityComponent()))
+        self.ecs.add_entity(_entity("c", VelocityComponent()))
+        self.ecs.add_entity(_entity("d", PositionComponent(), _Tag()))
+
+    def _names(self, *components):
+        return [entity.name for entity in self.ecs.query(*components)]
+
+    def test_queries_span_archetypes_in_insertion_order(self):
+        self.assertEqual(self._names("position"), ["a", "b", "d"])
+        self.assertEqual(self._names("position", "velocity"), ["b"])
+        self.assertEqual(len(self.ecs.archetypes()), 4)
+        self.assertEqual(self._names(), ["a", "b", "c", "d"])
+        self.assertEqual([e.name for e in self.ecs.get_entities_with("velocity")], ["b", "c"])
+
+    def test_results_are_cached_until_a_matching_archetype_changes(self):
+        moving = self.ecs.query("position", "velocity")
+        self.assertIs(self.ecs.query("velocity", "position"), moving)
+        # "c" gains no position-matching change; the velocity-only query is unaffected
+        self.ecs.get_entity("c").add_component(_Tag("other"))
+        self.assertIs(self.ecs.query("position", "velocity"), moving)
+
+        self.ecs.get_entity("a").add_component(VelocityComponent())
+        self.assertEqual(self._names("position", "velocity"), ["a", "b"])
+        self.ecs.get_entity("b").remove_component("velocity")
+        self.assertEqual(self._names("position", "velocity"), ["a"])
+        self.ecs.remove_entity("a")
+        self.assertEqual(self._names("position", "velocity"), [])
+        self.assertEqual(self._names("position"), ["b", "d"])
+
+        late = _entity("e", PositionComponent(), VelocityComponent(), _Tag())
+        self.ecs.add_entity(late)
+        self.assertEqual(self._names("position", "velocity"), ["e"])
+        self.assertEqual(self._names("tag"), ["d", "e"])
+
+    def test_update_passes_only_matching_entities(self):
+        system = _Recorder("position", "velocity")
+        self.ecs.add_system(system)
+        self.assertIs(system.ecs, self.ecs)
+        self.ecs.update()
+        self.ecs.get_entity("c").add_component(PositionComponent())
+        self.ecs.update()
+        self.assertEqual(system.seen, [["b"], ["b", "c"]])
+        # direct calls with a plain list still filter
+        system.update(self.ecs.entities)
+        self.assertEqual(system.seen[-1], ["b", "c"])
+
+    def test_removed_entities_stop_notifying(self):
+        entity = self.ecs.remove_entity("d")
+        entity.add_component(VelocityComponent())
+        self.assertEqual(self._names("position", "velocity"), ["b"])
+        self.ecs.clear()
+        self.assertEqual(self._names("position"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+import threading
+import unittest
+
+from simplex.ecs.components import (
+    CollisionComponent,
+    InputComponent,
+    PositionComponent,
+    VelocityComponent,
+    VoxelColliderComponent,
+)
+from simplex.ecs.ecs import ECS, Component, Entity, System
+from simplex.ecs.scheduler import STRUCTURE
+from simplex.ecs.systems import CollisionSystem, InputSystem, MovementSystem, ScoringSystem
+from simplex.ecs.voxel_collision_system import VoxelCollisionSystem
+from simplex.event.event_system import EventSystem
+from simplex.world.chunk_manager import ChunkManager
+
+
+class _Call(System):
+    """Declared system that runs `fn(entities)`."""
+
+    def __init__(self, name, fn=None, reads=(), writes=(), required=()):
+        super().__init__(name)
+        self.fn = fn
+        self.reads = set(reads)
+        self.writes = set(writes)
+        self.required_components = list(required)
+
+    def update(self, entities):
+        if self.fn is not None:
+            self.fn(entities)
+
+
+class _Undeclared(System):
+    def update(self, entities):
+        pass
+
+
+class SchedulerPlanTests(unittest.TestCase):
+    def test_stages_follow_conflicts_and_undeclared_barriers(self):
+        ecs = ECS(workers=2)
+        ecs.add_system(_Call("move", writes={"position"}))
+        ecs.add_system(_Call("steer", reads={"input"}, writes={"velocity"}))
+        ecs.add_system(_Call("camera", reads={"position"}))
+        ecs.add_system(_Call("audio", reads={"velocity"}))
+        ecs.add_system(_Undeclared("legacy"))
+        ecs.add_system(_Call("late", reads={"input"}))
+        ecs.add_system(_Call("spawner", writes={STRUCTURE}))
+        self.assertEqual(
+            ecs.system_scheduler.stages(ecs.systems),
+            [["move", "steer"], ["camera", "audio"], ["legacy"], ["late"], ["spawner"]],
+        )
+
+
+class SchedulerRunTests(unittest.TestCase):
+    def setUp(self):
+        self.ecs = ECS(workers=2)
+        self.addCleanup(self.ecs.shutdown)
+
+    def test_non_conflicting_systems_overlap(self):
+        barrier = threading.Barrier(2, timeout=5)
+        threads = set()
+
+        def meet(entities):
+            threads.add(threading.get_ident())
+            barrier.wait()  # breaks (and raises) unless both run at once
+
+        errors = []
+        self.ecs.event_system = EventSystem()
+        self.ecs.event_system.register("system_error", errors.append)
+        self.ecs.add_system(_Call("a", meet, writes={"position"}))
+        self.ecs.add_system(_Call("b", meet, writes={"velocity"}))
+        self.ecs.update()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(threads), 2)
+
+    def test_conflicting_systems_keep_registration_order(self):
+        order = []
+        for name in "abcd":
+            self.ecs.add_system(_Call(name, lambda entities, n=name: order.append(n), writes={"log"}))
+        self.ecs.add_system(_Call("reader", lambda entities: order.append("reader"), reads={"log"}))
+        for _ in range(20):
+            self.ecs.update()
+        self.assertEqual(order, (list("abcd") + ["reader"]) * 20)
+
+    def test_errors_are_reported_and_dependents_still_run(self):
+        errors, ran = [], []
+        self.ecs.event_system = EventSystem()
+        self.ecs.event_system.register("system_error", errors.append)
+
+        def fail(entities):
+            raise RuntimeError("boom")
+
+        self.ecs.add_system(_Call("fails", fail, writes={"position"}))
+        self.ecs.add_system(_Call("other", lambda entities: ran.append("other"), writes={"velocity"}))
+        self.ecs.add_system(_Call("after", lambda entities: ran.append("after"), reads={"position"}))
+        self.ecs.update()
+        self.assertEqual([e["system"] for e in errors], ["fails"])
+        self.assertEqual(sorted(ran), ["after", "other"])
+
+    def test_systems_get_their_query(self):
+        seen = {}
+        self.ecs.add_entity("bare")
+        mover = self.ecs.add_entity("mover")
+        mover.add_component(PositionComponent())
+        self.ecs.add_system(
+            _Call("q", lambda entities: seen.update(q=[e.name for e in entities]), required=["position"])
+        )
+        self.ecs.add_system(_Call("all", lambda entities: seen.update(all=len(entities)), writes={"x"}))
+        self.ecs.update()
+        self.assertEqual(seen, {"q": ["mover"], "all": 2})
+
+
+class _Other(Component):
+    def __init__(self):
+        super().__init__("other")
+        self.value = 0
+
+
+class AccessVerificationTests(unittest.TestCase):
+    def setUp(self):
+        self.ecs = ECS(verify_access=True)
+        entity = Entity("e")
+        entity.add_component(PositionComponent())
+        entity.add_component(VelocityComponent(1, 0, 0))
+        entity.add_component(_Other())
+        self.entity = self.ecs.add_entity(entity)
+
+    def _violations(self, system):
+        self.ecs.add_system(system)
+        self.ecs.update()
+        return self.ecs.system_scheduler.violations
+
+    def test_correct_declaration_passes(self):
+        def move(entities):
+            for e in entities:
+                e.get_component("position").x += e.get_component("velocity").vx
+
+        system = _Call("move", move, reads={"velocity"}, writes={"position"}, required=["position"])
+        self.assertEqual(self._violations(system), [])
+        self.assertEqual(self.entity.get_component("position").x, 1)
+
+    def test_undeclared_write_read_and_structure_change(self):
+        def sneaky(entities):
+            for e in entities:
+                e.get_component("other").value = e.get_component("velocity").vx
+                e.add_component(CollisionComponent())
+
+        system = _Call("sneaky", sneaky, writes={"position"})
+        self.assertEqual(
+            sorted(self._violations(system)),
+            [("sneaky", "read", "other"), ("sneaky", "read", "velocity"),
+             ("sneaky", "structure", STRUCTURE), ("sneaky", "write", "other")],
+        )
+
+    def test_column_backed_writes_are_detected(self):
+        ecs = ECS(columns=True, verify_access=True)
+        entity = ecs.add_entity("e")
+        entity.add_component(PositionComponent())
+
+        def nudge(entities):
+            for e in entities:
+                e.get_component("position").y = 3.0
+
+        ecs.add_system(_Call("nudge", nudge, required=["position"]))
+        ecs.update()
+        self.assertEqual(ecs.system_scheduler.violations, [("nudge", "write", "position")])
+
+
+class BuiltinDeclarationTests(unittest.TestCase):
+    def test_ping_pong_systems_match_their_declarations(self):
+        ecs = ECS(event_system=EventSystem(), verify_access=True)
+        for system in (MovementSystem, CollisionSystem, InputSystem, ScoringSystem):
+            ecs.add_system(system(event_system=ecs.event_system, bounds=(800, 600)))
+        for name, x, kind in (("player_paddle", 50, "player"), ("ai_paddle", 750, "ai")):
+            paddle = Entity(name)
+            paddle.add_component(PositionComponent(x, 300, 0))
+            paddle.add_component(VelocityComponent(0, 0, 0))
+            paddle.add_component(CollisionComponent(10, 80))
+            paddle.add_component(InputComponent(input_type=kind))
+            ecs.add_entity(paddle)
+        ball = Entity("ball")
+        ball.add_component(PositionComponent(400, 300, 0))
+        ball.add_component(VelocityComponent(-9, 5, 0))
+        ball.add_component(CollisionComponent(10, 10))
+        ecs.add_entity(ball)
+        for _ in range(120):
+            ecs.update()
+        self.assertEqual(ecs.system_scheduler.violations, [])
+
+    def test_voxel_collision_declares_the_collider_it_attaches(self):
+        ecs = ECS(verify_access=True)
+        cm = ChunkManager(ecs, chunk_size=(16, 16, 16), cache_size=8)
+        cm.create_chunk((0, 0, 0))
+
+        class _Engine:
+            pass
+
+        engine = _Engine()
+        engine.ecs, engine.chunk_manager = ecs, cm
+        ecs.add_system(VoxelCollisionSystem(engine=engine))
+        player = Entity("Player")
+        player.add_component(PositionComponent(0.5, 20.0, 0.5))
+        ecs.add_entity(player)
+        for _ in range(3):
+            ecs.update()
+        self.assertIsInstance(player.get_component("voxel_collider"), VoxelColliderComponent)
+        self.assertEqual(ecs.system_scheduler.violations, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
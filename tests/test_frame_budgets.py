@@ -0,0 +1,101 @@
+import time
+import unittest
+
+from simplex.ecs.chunk_streaming_system import ChunkStreamingSystem
+from simplex.ecs.chunk_system import ChunkMeshSystem
+from simplex.ecs.components import PositionComponent
+from simplex.ecs.ecs import ECS, Entity
+from simplex.utils.frame_budget import FrameBudget, FrameTimer
+from simplex.voxel.voxel import BLOCK_STONE
+from simplex.world.chunk_manager import ChunkManager
+
+# small enough that every frame runs out after its first item
+TINY_MS = 1e-6
+
+
+class _Engine:
+    def __init__(self, ecs, cm):
+        self.ecs = ecs
+        self.chunk_manager = cm
+
+
+class FrameBudgetTests(unittest.TestCase):
+    def test_count_budget(self):
+        budget = FrameBudget(None, max_items=2).start()
+        self.assertFalse(budget.exhausted())
+        budget.charge(2)
+        self.assertTrue(budget.exhausted())
+        self.assertFalse(budget.expired())
+
+    def test_time_budget_admits_one_item(self):
+        budget = FrameBudget(TINY_MS, max_items=1).start()
+        time.sleep(0.001)
+        self.assertTrue(budget.expired())
+        self.assertFalse(budget.exhausted())
+        budget.charge()
+        self.assertTrue(budget.exhausted())
+        self.assertFalse(FrameBudget(1000.0).start().expired())
+
+    def test_timer_tracks_last_avg_and_max(self):
+        timer = FrameTimer(smoothing=0.5)
+        for ms in (2.0, 4.0, 1.0):
+            timer.record(ms)
+        self.assertEqual(timer.stats(), {"last_ms": 1.0, "avg_ms": 2.0, "max_ms": 4.0, "frames": 3})
+
+
+class MeshTimeBudgetTests(unittest.TestCase):
+    def _world(self, budget_ms):
+        ecs = ECS()
+        cm = ChunkManager(ecs, chunk_size=(8, 8, 8))
+        for cx in range(4):
+            cm.create_chunk((cx, 0, 0))
+            # distinct contents, so nothing comes from the mesh cache
+            cm.get_chunk((cx, 0, 0)).set_block_id(cx, 7, 0, BLOCK_STONE)
+        system = ChunkMeshSystem(max_chunks_per_frame=1, engine=_Engine(ecs, cm), budget_ms=budget_ms)
+        ecs.add_system(system)
+        return ecs, system
+
+    def _dirty(self, ecs):
+        return sum(1 for e in ecs.get_entities_with("chunk") if e.get_component("chunk").dirty)
+
+    def test_spent_budget_carries_work_over(self):
+        ecs, system = self._world(TINY_MS)
+        ecs.update()
+        self.assertEqual(self._dirty(ecs), 3)
+        for _ in range(3):
+            ecs.update()
+        self.assertEqual(self._dirty(ecs), 0)
+        self.assertEqual(system.frame_timer.frames, 4)
+        self.assertGreater(system.frame_timer.max_ms, 0.0)
+
+    def test_large_budget_ignores_chunk_count(self):
+        ecs, _ = self._world(10_000.0)
+        ecs.update()
+        self.assertEqual(self._dirty(ecs), 0)
+
+
+class StreamingTimeBudgetTests(unittest.TestCase):
+    def test_requests_carry_over_and_time_is_reported(self):
+        ecs = ECS()
+        cm = ChunkManager(ecs, chunk_size=(8, 8, 8), cache_size=64)
+        system = ChunkStreamingSystem(engine=_Engine(ecs, cm), radius=1, loads_per_frame=1, budget_ms=TINY_MS)
+        ecs.add_system(system)
+        player = Entity("Player")
+        player.add_component(PositionComponent(4.0, 4.0, 4.0))
+        ecs.add_entity(player)
+
+        ecs.update()
+        self.assertEqual(cm.list_loaded(), [(0, 0, 0)])
+        stats = system.stats()
+        self.assertEqual(stats["queued"], 8)
+        self.assertEqual(stats["frames"], 1)
+        self.assertGreater(stats["last_ms"], 0.0)
+
+        for _ in range(8):
+            ecs.update()
+        self.assertEqual(len(cm.list_loaded()), 9)
+        self.assertEqual(system.stats()["queued"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
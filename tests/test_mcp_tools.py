@@ -27,6 +27,16 @@ class McpToolsTests(unittest.TestCase):
         self.assertGreaterEqual(probe["loaded_count"], 1)
         self.assertEqual(probe["stream_center"][1], 0)
 
+    def test_ecs_profile_reports_every_system(self):
+        profile = tools.ecs_profile(frames=10, radius=1)
+        json.dumps(profile)
+        self.assertEqual(profile["frames"], 10)
+        self.assertEqual(
+            set(profile["systems"]), {"voxel_collision", "chunk_streaming", "chunk", "chunk_mesh"}
+        )
+        self.assertEqual(profile["systems"]["chunk_mesh"]["calls"], 10)
+        self.assertGreaterEqual(profile["frame"]["p99_ms"], profile["frame"]["p50_ms"])
+
     def test_read_resource_todo(self):
         text = tools.read_resource("docs/todo/todo.md")
         self.assertIn("TODO", text)
@@ -10,11 +10,18 @@ import unittest
 
 from simplex.ecs.chunk_streaming_system import ChunkStreamingSystem
 from simplex.ecs.chunk_system import ChunkMeshSystem, ChunkSystem
-from simplex.ecs.components import PositionComponent
+from simplex.ecs.components import PositionComponent, VelocityComponent
 from simplex.ecs.ecs import ECS, Entity
+from simplex.ecs.systems import MovementSystem
 from simplex.ecs.voxel_collision_system import VoxelCollisionSystem
 from simplex.voxel.voxel import BLOCK_DIRT
 from simplex.world.chunk_manager import ChunkManager
+from simplex.world.terrain import SimpleHeightmapGenerator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 def _percentile(samples, pct: float) -> float:
@@ -35,7 +42,9 @@ class _VoxelSim:
         )
         self._last_delta_time = 1.0 / 60.0
         self.ecs.add_system(ChunkSystem())
-        self.ecs.add_system(ChunkMeshSystem(max_chunks_per_frame=mesh_budget))
+        self.ecs.add_system(
+            ChunkMeshSystem(max_chunks_per_frame=mesh_budget, engine=self)
+        )
         self.ecs.add_system(
             VoxelCollisionSystem(engine=self),
         )
@@ -136,5 +145,60 @@ class PerformanceTests(unittest.TestCase):
         )
 
 
+@unittest.skipIf(np is None, "numpy not installed")
+class RaycastPerformanceTests(unittest.TestCase):
+    def test_dda_beats_point_sampling(self):
+        cm = ChunkManager(ECS(), chunk_size=(16, 16, 16), cache_size=256, generator=SimpleHeightmapGenerator(16))
+        for cx in range(-3, 4):
+            for cz in range(-3, 4):
+                for cy in range(-1, 3):
+                    cm.create_chunk((cx, cy, cz))
+        world = cm.accessor()
+        rng = np.random.default_rng(0)
+        n, reach = 200, 48.0
+        origins = np.tile([0.5, 20.0, 0.5], (n, 1))
+        directions = rng.normal(size=(n, 3))
+        directions /= np.linalg.norm(directions, axis=1)[:, None]
+
+        start = time.perf_counter()
+        hits = world.raycast_many(origins, directions, reach)
+        dda = time.perf_counter() - start
+
+        # the naive alternative: sample every ray at 0.1-block steps in one batched lookup
+        start = time.perf_counter()
+        ts = np.arange(0.0, reach, 0.1)
+        points = origins[:, None, :] + directions[:, None, :] * ts[None, :, None]
+        solid = world.solid_at(points.reshape(-1, 3)).reshape(n, -1)
+        sampled = time.perf_counter() - start
+
+        self.assertGreaterEqual(sum(h is not None for h in hits), int(solid.any(axis=1).sum()))
+        self.assertLess(dda, sampled, f"dda={dda:.4f}s sampled={sampled:.4f}s")
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class ColumnStorePerformanceTests(unittest.TestCase):
+    def _movement_frame(self, columns: bool, n: int = 10_000) -> float:
+        ecs = ECS(columns=columns)
+        for i in range(n):
+            entity = Entity(f"mob{i}")
+            entity.add_component(PositionComponent(float(i), 0.0, 0.0))
+            entity.add_component(VelocityComponent(0.1, 0.2, 0.3))
+            ecs.add_entity(entity)
+        ecs.add_system(MovementSystem())
+        ecs.update()
+        return statistics.median(self._tick(ecs) for _ in range(3))
+
+    @staticmethod
+    def _tick(ecs) -> float:
+        start = time.perf_counter()
+        ecs.update()
+        return time.perf_counter() - start
+
+    def test_vectorized_movement_beats_per_entity(self):
+        objects = self._movement_frame(columns=False)
+        columns = self._movement_frame(columns=True)
+        self.assertLess(columns * 5.0, objects, f"columns={columns:.4f}s objects={objects:.4f}s")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -128,3 +128,59 @@ def test_event_unregister():
     events.unregister('test_evt', listener)
     events.emit('test_evt', {'v': 2})
     assert len(calls) == 1  # no new calls after unregister
+
+
+def test_vbo_manager_uploads_packed_meshes():
+    from simplex.ecs.components import MeshComponent
+    from simplex.voxel.mesh_packing import pack_mesh
+
+    uploaded = []
+
+    def _fake_create_packed(packed):
+        uploaded.append(packed)
+        return {"vbo": 7, "count": packed.index_count, "packed": True}
+
+    helpers = {
+        "create_vbo_for_mesh": _fake_create_vbo,
+        "create_vbo_for_packed_mesh": _fake_create_packed,
+        "delete_vbo": _fake_delete_vbo,
+    }
+    vm = VBOManager(helpers=helpers)
+    verts = [0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 1.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 0.0, 0.0, 1.0, 0.0]
+    mesh = MeshComponent(packed=pack_mesh(verts, [1.0, 0.5, 0.25, 1.0] * 6))
+
+    handle = vm.upload_mesh(mesh)
+    assert handle == {"vbo": 7, "count": 6, "packed": True}
+    assert uploaded == [mesh.packed] and mesh.has_geometry()
+
+
+def test_failed_vbo_draw_releases_the_handle(monkeypatch):
+    import simplex.renderer.opengl_renderer as opengl_renderer
+
+    class _BrokenGL:
+        def __getattr__(self, name):
+            if name.startswith("GL_"):
+                return 0
+            def _fail(*args):
+                raise RuntimeError("no context")
+            return _fail
+
+    monkeypatch.setattr(opengl_renderer, "gl", _BrokenGL())
+    renderer = OpenGLRenderer()
+    fake_engine = type("E", (), {})()
+    vm = VBOManager(helpers={"create_vbo_for_mesh": _fake_create_vbo, "delete_vbo": _fake_delete_vbo})
+    fake_engine.vbo_manager = vm
+    renderer.engine = fake_engine
+
+    mesh = _MeshComp(verts=[0.0, 0.0, 0.0] * 3, cols=[1.0, 1.0, 1.0, 1.0] * 3)
+    shared = _MeshComp(verts=mesh.vertices, cols=mesh.colors)
+    handle = vm.create_vbo(mesh.vertices, mesh.colors)
+    handle["refs"] = 2  # shared with another mesh (e.g. the mesh cache)
+    mesh.gpu = shared.gpu = handle
+
+    assert renderer._draw_mesh_vbo(mesh) is False
+    assert mesh.gpu is None and handle["refs"] == 1
+    assert handle in vm._handles
+
+    assert renderer._draw_mesh_vbo(shared) is False
+    assert handle not in vm._handles and handle.get("deleted") is True
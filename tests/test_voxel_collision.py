@@ -1,10 +1,11 @@
 import unittest
 
 from simplex.ecs.ecs import ECS, Entity
-from simplex.ecs.components import PositionComponent
+from simplex.ecs.components import PositionComponent, VoxelColliderComponent
 from simplex.ecs.voxel_collision_system import VoxelCollisionSystem
 from simplex.world.chunk_manager import ChunkManager
-from simplex.voxel.voxel import BLOCK_DIRT
+from simplex.voxel.voxel import BLOCK_AIR, BLOCK_DIRT, BLOCK_STONE
+from simplex.world import collision
 
 
 class VoxelCollisionTests(unittest.TestCase):
@@ -34,7 +35,90 @@ class VoxelCollisionTests(unittest.TestCase):
             self.system.update(self.ecs.entities)
         pos = self.player.get_component("position")
         self.assertAlmostEqual(pos.y, 4.0, delta=0.2)
-        self.assertTrue(self.system._on_ground.get("Player", False))
+        self.assertTrue(self.player.get_component("voxel_collider").on_ground)
+
+
+class SweptCollisionTests(unittest.TestCase):
+    def setUp(self):
+        self.ecs = ECS()
+        self.cm = ChunkManager(self.ecs, chunk_size=(16, 16, 16), cache_size=8)
+        for cx in (0, 1):
+            self.cm.create_chunk((cx, 0, 0))
+            chunk = self.cm.get_chunk((cx, 0, 0))
+            chunk.fill(BLOCK_AIR)
+            for x in range(16):
+                for z in range(16):
+                    chunk.set_block_id(x, 0, z, BLOCK_STONE)
+        # one-block-thick wall at x = 20, and a ceiling over x in [2, 4) at y = 4
+        for y in range(1, 8):
+            for z in range(16):
+                self.cm.get_chunk((1, 0, 0)).set_block_id(4, y, z, BLOCK_STONE)
+        self.cm.get_chunk((0, 0, 0)).set_block_id(2, 4, 8, BLOCK_STONE)
+        self.cm.get_chunk((0, 0, 0)).set_block_id(3, 4, 8, BLOCK_STONE)
+
+        class _Engine:
+            pass
+
+        self.engine = _Engine()
+        self.engine.ecs = self.ecs
+        self.engine.chunk_manager = self.cm
+        self.engine._last_delta_time = 1.0 / 60.0
+        self.system = VoxelCollisionSystem(engine=self.engine)
+
+    def _mob(self, name, x, y, z, **kwargs):
+        mob = Entity(name)
+        mob.add_component(PositionComponent(x, y, z))
+        mob.add_component(VoxelColliderComponent(**kwargs))
+        self.ecs.add_entity(mob)
+        return mob
+
+    def _step(self, frames=1):
+        for _ in range(frames):
+            self.system.update(self.ecs.entities)
+
+    def test_fast_movers_do_not_tunnel(self):
+        mobs = [self._mob(f"mob{i}", 10.5, 1.0, 0.5 + i, width=0.8) for i in range(12)]
+        self._step()
+        for mob in mobs:
+            mob.get_component("position").x += 14.0  # far past the wall in one frame
+        self._step()
+        for mob in mobs:
+            pos, col = mob.get_component("position"), mob.get_component("voxel_collider")
+            self.assertAlmostEqual(pos.x, 19.6)
+            self.assertAlmostEqual(pos.y, 1.0)
+            self.assertTrue(col.on_ground)
+
+    def test_ceiling_stops_jump_and_falls_back(self):
+        mob = self._mob("mob", 3.0, 1.0, 8.5, height=1.8)
+        col = mob.get_component("voxel_collider")
+        self._step()
+        col.vy = 120.0  # reaches the ceiling within one frame
+        self._step()
+        self.assertAlmostEqual(mob.get_component("position").y, 4.0 - 1.8)
+        self.assertEqual(col.vy, 0.0)
+        self._step(60)
+        self.assertAlmostEqual(mob.get_component("position").y, 1.0)
+
+    def test_teleports_are_not_swept_and_leave_terrain(self):
+        mob = self._mob("mob", 10.5, 1.0, 0.5)
+        self._step()
+        pos = mob.get_component("position")
+        pos.x, pos.y = 30.5, 0.5  # inside the floor beyond the wall
+        self._step()
+        self.assertEqual((pos.x, pos.y), (30.5, 1.0))
+
+    def test_without_gravity_and_python_fallback_agree(self):
+        world = self.cm.accessor()
+        mins = [(10.1, 1.0, 0.1), (10.1, 1.0, 0.1), (3.0, 1.0, 8.1)]
+        sizes = [(0.8, 1.8, 0.8)] * 3
+        deltas = [(14.0, -3.0, 0.0), (-9.0, 0.0, 0.0), (0.0, 5.0, 0.0)]
+        moved, blocked = collision.sweep_boxes(world, mins, sizes, deltas)
+        py_moved, py_blocked = collision._sweep_python(world, mins, sizes, deltas)
+        for a, b in zip(py_moved, getattr(moved, "tolist", lambda: moved)()):
+            for x, y in zip(a, b):
+                self.assertAlmostEqual(x, y)
+        self.assertEqual(py_blocked, getattr(blocked, "tolist", lambda: blocked)())
+        self.assertEqual(py_blocked, [[True, True, False], [False, False, False], [False, True, False]])
 
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
 import pytest
 
 from simplex.voxel.chunk import Chunk
-from simplex.voxel.voxel import BLOCK_DIRT
+from simplex.voxel.voxel import BLOCK_AIR, BLOCK_DIRT, BLOCK_STONE, Voxel
 
 
 def test_chunk_get_set_and_iter():
@@ -28,3 +28,99 @@ def test_chunk_bounds_checking():
         c.set_block_id(-1, 0, 0, BLOCK_DIRT)
     with pytest.raises(IndexError):
         c.set_block_id(2, 0, 0, BLOCK_DIRT)
+
+
+def test_chunk_block_id_fast_path_and_metadata():
+    c = Chunk((0, 0, 0), size=(4, 4, 4))
+    assert c.get_block_id(0, 0, 0) == 0
+
+    c.set_block(1, 1, 1, Voxel(BLOCK_DIRT, {"hp": 3}))
+    assert c.get_block_id(1, 1, 1) == BLOCK_DIRT
+    assert c.get_block(1, 1, 1).data == {"hp": 3}
+
+    # overwriting through the id fast path drops the old metadata
+    c.set_block_id(1, 1, 1, BLOCK_DIRT)
+    assert c.get_block(1, 1, 1).data == {}
+    assert [(x, y, z) for (x, y, z, _v) in c.iter_blocks()] == [(1, 1, 1)]
+
+
+def test_chunk_block_array_view():
+    np = pytest.importorskip("numpy")
+    c = Chunk((0, 0, 0), size=(2, 3, 4))
+    c.set_block_id(1, 2, 3, BLOCK_DIRT)
+    arr = c.block_array()
+    assert arr.shape == (2, 3, 4)
+    assert arr.dtype == np.uint16
+    assert arr[1, 2, 3] == BLOCK_DIRT
+    assert int(arr.sum()) == BLOCK_DIRT
+
+
+def test_uniform_chunk_materializes_on_first_different_write():
+    c = Chunk((0, 0, 0), size=(4, 4, 4))
+    assert c.is_uniform() and c.uniform_id == 0 and c.nbytes == 0
+    assert list(c.iter_blocks()) == []
+
+    c.set_block_id(0, 0, 0, 0)  # same id: stays uniform
+    assert c.is_uniform()
+
+    c.fill(BLOCK_DIRT)
+    assert c.uniform_id == BLOCK_DIRT
+    assert c.get_block_id(3, 3, 3) == BLOCK_DIRT
+    assert len(list(c.iter_blocks())) == 64
+
+    c.set_block_id(1, 1, 1, 0)
+    assert not c.is_uniform() and c.uniform_id is None
+    assert c.get_block_id(1, 1, 1) == 0
+    assert c.get_block_id(2, 2, 2) == BLOCK_DIRT
+
+
+def _scanned_heights(c):
+    sx, sy, sz = c.size
+    return [
+        [next((y + 1 for y in range(sy - 1, -1, -1) if c.get_block_id(x, y, z)), 0) for z in range(sz)]
+        for x in range(sx)
+    ]
+
+
+@pytest.mark.parametrize("palette", [False, True])
+def test_heightmap_tracks_writes(palette):
+    c = Chunk((0, 0, 0), size=(4, 6, 4), palette=palette)
+    assert c.column_height(0, 0) == 0
+    c.fill(BLOCK_STONE)
+    assert c.column_height(3, 3) == 6
+
+    c.set_block_id(1, 5, 1, BLOCK_AIR)
+    c.set_block_id(1, 4, 1, BLOCK_AIR)
+    assert c.column_height(1, 1) == 4
+    c.set_block(1, 5, 1, Voxel(BLOCK_DIRT, {"hp": 1}))
+    assert c.column_height(1, 1) == 6
+    for y in range(6):
+        c.set_block_id(2, y, 0, BLOCK_AIR)
+    assert c.column_height(2, 0) == 0
+    # below an overhang: only cells at or under `top` count
+    assert c.column_height(1, 1, top=4) == 4
+    assert c.column_height(1, 1, top=3) == 4
+    assert c.column_height(0, 0, top=0) == 1
+
+    hm = c.heightmap()
+    assert [list(row) for row in hm] == _scanned_heights(c)
+
+
+def test_heightmap_rebuilds_after_bulk_writes():
+    np = pytest.importorskip("numpy")
+    c = Chunk((0, 0, 0), size=(4, 8, 4))
+    ids = np.zeros((4, 8, 4), dtype=np.uint16)
+    ids[:, :3, :] = BLOCK_STONE
+    ids[2, 6, 1] = BLOCK_DIRT
+    c.load_blocks(ids)
+    assert c.column_height(0, 0) == 3
+    assert c.column_height(2, 1) == 7
+
+    # a re-mesh request leaves the heights alone
+    c.mark_dirty()
+    assert c._heights is not None
+
+    c.block_array()[0, 5, 0] = BLOCK_DIRT
+    c.blocks_changed()
+    assert c.modified and c.dirty_borders
+    assert c.heightmap().tolist() == _scanned_heights(c)
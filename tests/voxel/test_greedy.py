@@ -23,3 +23,40 @@ def test_greedy_matches_naive_for_single_block():
     greedy_verts, greedy_cols = generate_greedy_mesh(c)
     assert len(naive_verts) == len(greedy_verts)
     assert naive_cols == greedy_cols
+
+
+def test_uniform_chunks_fast_path_matches_full_scan():
+    air = Chunk((0,0,0), size=(4,4,4))
+    assert generate_greedy_mesh(air) == ([], [])
+    assert generate_naive_mesh(air) == ([], [])
+
+    solid = Chunk((0,0,0), size=(4,3,5))
+    solid.fill(BLOCK_DIRT)
+    dense = Chunk((0,0,0), size=(4,3,5))
+    for x in range(4):
+        for y in range(3):
+            for z in range(5):
+                dense.set_block_id(x,y,z,BLOCK_DIRT)
+    assert solid.is_uniform() and not dense.is_uniform()
+    assert generate_greedy_mesh(solid) == generate_greedy_mesh(dense)
+    assert generate_naive_mesh(solid) == generate_naive_mesh(dense)
+
+
+def test_neighbor_layers_cull_border_faces():
+    c = Chunk((0,0,0), size=(2,2,2))
+    c.fill(BLOCK_DIRT)
+    solid = [[BLOCK_DIRT] * 2] * 2
+    # +x neighbour solid: that side disappears, the other five stay
+    verts, _ = generate_greedy_mesh(c, {"px": solid})
+    assert len(verts) == 5 * 6 * 3
+    # fully enclosed: nothing to draw
+    enclosed = {face: solid for face in ("px", "nx", "py", "ny", "pz", "nz")}
+    assert generate_greedy_mesh(c, enclosed) == ([], [])
+    assert generate_naive_mesh(c, enclosed) == ([], [])
+
+    # a partially solid neighbour only hides the covered cells
+    c.set_block_id(0, 0, 0, 0)
+    partial = [[BLOCK_DIRT, 0], [0, 0]]
+    naive_open, _ = generate_naive_mesh(c)
+    naive_culled, _ = generate_naive_mesh(c, {"px": partial})
+    assert len(naive_open) - len(naive_culled) == 6 * 3
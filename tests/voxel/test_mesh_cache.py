@@ -0,0 +1,101 @@
+from simplex.ecs.chunk_system import ChunkMeshSystem
+from simplex.ecs.components import ChunkComponent
+from simplex.ecs.ecs import ECS, Entity
+from simplex.event.event_system import EventSystem
+from simplex.voxel.chunk import Chunk
+from simplex.voxel.mesh_cache import CachedMesh, MeshCache, mesh_cache_key
+from simplex.voxel.voxel import BLOCK_DIRT, BLOCK_STONE
+
+
+def _floor_chunk(position, palette=False):
+    chunk = Chunk(position, palette=palette)
+    for x in range(16):
+        for z in range(16):
+            for y in range(4):
+                chunk.set_block_id(x, y, z, BLOCK_DIRT)
+    return chunk
+
+
+def test_key_depends_on_blocks_and_border_context():
+    a = _floor_chunk((0, 0, 0))
+    b = _floor_chunk((5, 0, -3))
+    assert mesh_cache_key(a) == mesh_cache_key(b)
+    assert mesh_cache_key(a, None, "greedy") != mesh_cache_key(a, None, "naive")
+
+    wall = {"px": [[BLOCK_STONE] * 16 for _ in range(16)]}
+    assert mesh_cache_key(a, wall) != mesh_cache_key(b)
+
+    b.set_block_id(7, 10, 7, BLOCK_STONE)
+    assert mesh_cache_key(a) != mesh_cache_key(b)
+
+    pa = _floor_chunk((0, 0, 0), palette=True)
+    pb = _floor_chunk((1, 0, 0), palette=True)
+    assert mesh_cache_key(pa) == mesh_cache_key(pb)
+
+
+def test_lru_eviction_and_counters():
+    evicted = []
+    cache = MeshCache(capacity=2, on_evict=evicted.append)
+    first, second, third = (CachedMesh([i], []) for i in range(3))
+    cache.put(b"a", first)
+    cache.put(b"b", second)
+    assert cache.get(b"a") is first  # a becomes most recent
+    cache.put(b"c", third)
+    assert evicted == [second]
+    assert cache.get(b"b") is None
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "evictions": 1,
+        "size": 2,
+        "capacity": 2,
+        "hit_rate": 0.5,
+    }
+
+
+class _VBOManager:
+    def __init__(self):
+        self.deleted = []
+
+    def delete_vbo(self, handle):
+        self.deleted.append(handle)
+
+
+def test_duplicate_chunks_share_mesh_and_gpu_handle():
+    engine = type("E", (), {})()
+    engine.vbo_manager = _VBOManager()
+    events = EventSystem()
+    uploads = []
+
+    def _upload(event):
+        mesh = event["mesh"]
+        if mesh.gpu is None:
+            mesh.gpu = {"vbo": len(uploads) + 1}
+            uploads.append(mesh.gpu)
+
+    events.register("mesh_generated", _upload)
+    system = ChunkMeshSystem(event_system=events, max_chunks_per_frame=1, engine=engine)
+    ecs = ECS()
+    ecs.add_system(system)
+    for i in range(3):
+        entity = Entity(f"chunk_{i}")
+        entity.add_component(ChunkComponent((i, 0, 0), chunk=_floor_chunk((i, 0, 0))))
+        ecs.add_entity(entity)
+
+    ecs.update()
+    meshes = [ecs.get_entity(f"chunk_{i}").get_component("mesh") for i in range(3)]
+    assert system.cache_stats()["misses"] == 1 and system.cache_stats()["hits"] == 2
+    assert len(uploads) == 1
+    assert meshes[0].vertices is meshes[1].vertices is meshes[2].vertices
+    assert meshes[0].gpu is meshes[1].gpu is meshes[2].gpu
+    assert meshes[1].origin == (16, 0, 0)
+
+    # re-meshing one chunk with new content drops its reference only
+    ecs.get_entity("chunk_2").get_component("chunk").chunk.set_block_id(1, 8, 1, BLOCK_STONE)
+    ecs.update()
+    assert meshes[2].gpu is not meshes[0].gpu
+    assert engine.vbo_manager.deleted == []
+
+    system.shutdown()  # cache gives up its reference; chunks 0 and 1 still use it
+    assert engine.vbo_manager.deleted == []
+    assert meshes[0].gpu["refs"] == 2
@@ -0,0 +1,66 @@
+import random
+import struct
+
+import pytest
+
+import simplex.voxel.mesh_packing as mesh_packing
+from simplex.voxel.chunk import Chunk
+from simplex.voxel.mesh_packing import pack_mesh, quad_indices, unpack_mesh
+from simplex.voxel.meshgen import generate_greedy_mesh
+
+
+def _terrain_chunk(seed=3):
+    rng = random.Random(seed)
+    chunk = Chunk((0, 0, 0))
+    for x in range(16):
+        for z in range(16):
+            for y in range(rng.randint(1, 12)):
+                chunk.set_block_id(x, y, z, rng.choice([1, 2, 3]))
+    return chunk
+
+
+@pytest.mark.parametrize("position_type", ["int16", "uint8"])
+def test_pack_roundtrips_and_shrinks(position_type):
+    verts, cols = generate_greedy_mesh(_terrain_chunk())
+    packed = pack_mesh(verts, cols, position_type)
+
+    assert packed.quad_count == len(verts) // 18
+    assert packed.vertex_count == packed.quad_count * 4
+    assert packed.nbytes == packed.vertex_count * packed.stride
+
+    out_verts, out_cols = unpack_mesh(packed)
+    assert out_verts == [float(v) for v in verts]
+    assert max(abs(a - b) for a, b in zip(out_cols, cols)) <= 0.5 / 255 + 1e-6
+
+    float_bytes = len(verts) // 3 * 7 * 4
+    assert packed.nbytes + packed.index_count * 2 < float_bytes / 2.5
+
+
+def test_pure_python_packing_matches_numpy(monkeypatch):
+    pytest.importorskip("numpy")
+    verts, cols = generate_greedy_mesh(_terrain_chunk(5))
+    expected = pack_mesh(verts, cols).data
+    expected_idx = quad_indices(300)
+    monkeypatch.setattr(mesh_packing, "np", None)
+    assert pack_mesh(verts, cols).data == expected
+    assert quad_indices(300) == expected_idx
+
+
+def test_quad_indices_pattern_and_width():
+    idx = struct.unpack("<12H", quad_indices(2))
+    assert idx == (0, 1, 2, 0, 2, 3, 4, 5, 6, 4, 6, 7)
+    assert len(quad_indices(16384)) == 16384 * 6 * 2
+    assert len(quad_indices(16385)) == 16385 * 6 * 4
+
+
+def test_uint8_rejects_out_of_range_positions():
+    verts = [0.0, 0.0, 0.0] * 5 + [300.0, 0.0, 0.0]
+    with pytest.raises(ValueError):
+        pack_mesh(verts, [1.0] * 24, "uint8")
+
+
+def test_chunk_mesh_system_rejects_uint8_vertex_format():
+    from simplex.ecs.chunk_system import ChunkMeshSystem
+
+    with pytest.raises(ValueError, match="shader"):
+        ChunkMeshSystem(vertex_format="uint8")
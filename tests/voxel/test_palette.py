@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from simplex.voxel.chunk import Chunk
+from simplex.voxel.palette import PalettedStorage
+from simplex.voxel.voxel import BLOCK_DIRT, BLOCK_GRASS, BLOCK_STONE
+
+
+def test_palette_grows_through_widths_and_roundtrips():
+    store = PalettedStorage(4096)
+    expected = [0] * 4096
+    rng = random.Random(7)
+    widths = []
+    for block_id in range(1, 300):
+        for _ in range(20):
+            i = rng.randrange(4096)
+            store[i] = block_id
+            expected[i] = block_id
+        if store.bits not in widths:
+            widths.append(store.bits)
+    assert widths == [1, 2, 4, 8, 16]
+    assert list(store) == expected
+    assert [store[i] for i in range(4096)] == expected
+
+
+def test_paletted_chunk_matches_flat_chunk_and_is_smaller():
+    flat = Chunk((0, 0, 0))
+    packed = Chunk((0, 0, 0), palette=True)
+    for x in range(16):
+        for z in range(16):
+            for y in range(6):
+                bid = BLOCK_GRASS if y == 5 else (BLOCK_STONE if y < 2 else BLOCK_DIRT)
+                flat.set_block_id(x, y, z, bid)
+                packed.set_block_id(x, y, z, bid)
+
+    assert packed.is_paletted and packed._blocks.bits == 2
+    assert list(packed.iter_blocks())[0][:3] == list(flat.iter_blocks())[0][:3]
+    assert packed.get_block_id(3, 5, 3) == BLOCK_GRASS
+    assert packed.nbytes * 7 < flat.nbytes
+
+
+def test_paletted_numpy_decode():
+    np = pytest.importorskip("numpy")
+    c = Chunk((0, 0, 0), size=(4, 4, 4), palette=True)
+    c.set_block_id(1, 2, 3, BLOCK_DIRT)
+    c.set_block_id(3, 3, 3, BLOCK_STONE)
+    arr = c.block_array()
+    assert arr.shape == (4, 4, 4)
+    assert arr[1, 2, 3] == BLOCK_DIRT and arr[3, 3, 3] == BLOCK_STONE
+    assert int(np.count_nonzero(arr)) == 2
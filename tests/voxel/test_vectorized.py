@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from simplex.voxel.chunk import Chunk
+from simplex.voxel.meshgen import (
+    generate_greedy_mesh,
+    generate_vectorized_mesh,
+    get_mesher,
+)
+
+np = pytest.importorskip("numpy")
+
+
+def _area_by_face(verts, cols):
+    """Total triangle area keyed by (normal sign, rounded color)."""
+    tris = np.asarray(verts, dtype=np.float64).reshape(-1, 3, 3)
+    colors = np.asarray(cols, dtype=np.float64).reshape(-1, 3, 4)[:, 0, :]
+    normals = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    areas = {}
+    for n, c in zip(normals, colors):
+        key = (
+            tuple(int(s) for s in np.sign(n)),
+            tuple(float(x) for x in np.round(c, 3)),
+        )
+        areas[key] = round(areas.get(key, 0.0) + float(np.linalg.norm(n)) / 2, 6)
+    return areas
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_vectorized_covers_same_area_as_greedy(seed):
+    rng = random.Random(seed)
+    size = (rng.randint(1, 9), rng.randint(1, 9), rng.randint(1, 9))
+    c = Chunk((0, 0, 0), size=size, palette=seed % 2 == 0)
+    for x in range(size[0]):
+        for y in range(size[1]):
+            for z in range(size[2]):
+                if rng.random() < 0.5:
+                    c.set_block_id(x, y, z, rng.choice([1, 2, 3]))
+
+    verts, cols = generate_vectorized_mesh(c)
+    assert verts.dtype == np.float32 and cols.dtype == np.float32
+    assert len(verts) // 3 == len(cols) // 4
+    assert _area_by_face(verts, cols) == _area_by_face(*generate_greedy_mesh(c))
+
+
+def test_vectorized_merges_flat_layer_and_skips_air():
+    c = Chunk((0, 0, 0), size=(8, 4, 8))
+    assert len(generate_vectorized_mesh(c)[0]) == 0
+    for x in range(8):
+        for z in range(8):
+            c.set_block_id(x, 0, z, 1)
+    verts, _ = generate_vectorized_mesh(c)
+    # one quad per side of the slab
+    assert len(verts) == 6 * 6 * 3
+
+
+def test_get_mesher_by_name():
+    assert get_mesher("vectorized") is generate_vectorized_mesh
+    with pytest.raises(ValueError):
+        get_mesher("nope")
@@ -0,0 +1,85 @@
+import unittest
+
+from simplex.ecs.ecs import ECS
+from simplex.voxel.chunk import Chunk
+from simplex.voxel.voxel import BLOCK_STONE, Voxel
+from simplex.world.chunk_manager import LOADED, ChunkManager
+from simplex.world.compressed_cache import CompressedChunkCache
+from simplex.world.terrain import SimpleHeightmapGenerator
+
+
+class _CountingGenerator(SimpleHeightmapGenerator):
+    def __init__(self):
+        super().__init__(8)
+        self.calls = 0
+
+    def generate(self, chunk):
+        self.calls += 1
+        super().generate(chunk)
+
+
+def _chunk(x, marker):
+    chunk = Chunk((x, 0, 0), size=(8, 8, 8))
+    chunk.set_block_id(marker % 8, 0, 0, BLOCK_STONE)
+    return chunk
+
+
+class CompressedChunkCacheTests(unittest.TestCase):
+    def test_roundtrip_and_byte_bound(self):
+        cache = CompressedChunkCache(max_bytes=10_000)
+        first = _chunk(0, 1)
+        first.set_block(2, 2, 2, Voxel(BLOCK_STONE, {"lit": True}))
+        cache.put(first.snapshot(include_meta=True))
+        self.assertGreater(cache.nbytes, 0)
+        self.assertIn((0, 0, 0), cache)
+
+        restored = cache.pop((0, 0, 0))
+        self.assertEqual(restored, first.snapshot(include_meta=True))
+        self.assertEqual((len(cache), cache.nbytes), (0, 0))
+        self.assertIsNone(cache.pop((0, 0, 0)))
+
+        probe = CompressedChunkCache(max_bytes=10_000)
+        probe.put(_chunk(0, 0).snapshot())
+        small = CompressedChunkCache(max_bytes=probe.nbytes * 2)
+        for x in range(4):
+            small.put(_chunk(x, x).snapshot())
+        self.assertLessEqual(small.nbytes, small.max_bytes)
+        self.assertNotIn((0, 0, 0), small)
+        self.assertIn((3, 0, 0), small)
+        self.assertGreater(small.stats()["evictions"], 0)
+
+
+class ChunkManagerCompressedTierTests(unittest.TestCase):
+    def test_revisits_restore_without_regenerating(self):
+        gen = _CountingGenerator()
+        cm = ChunkManager(ECS(), chunk_size=(8, 8, 8), cache_size=2, generator=gen, compressed_cache_bytes=1 << 20)
+        cm.create_chunk((0, 0, 0))
+        cm.get_chunk((0, 0, 0)).set_block_id(3, 7, 3, BLOCK_STONE)
+        cm.create_chunk((1, 0, 0))
+        cm.create_chunk((2, 0, 0))  # evicts (0, 0, 0) into the compressed tier
+        self.assertIn((0, 0, 0), cm.compressed)
+        self.assertEqual(gen.calls, 3)
+
+        cm.create_chunk((0, 0, 0))
+        self.assertEqual(gen.calls, 3)
+        # edits survive without a region store
+        self.assertEqual(cm.get_chunk((0, 0, 0)).get_block_id(3, 7, 3), BLOCK_STONE)
+        stats = cm.stats()["compressed"]
+        self.assertEqual(stats["hits"], 1)
+        self.assertNotIn((0, 0, 0), cm.compressed)
+        self.assertGreater(cm.memory_usage()["compressed"], 0)
+
+    def test_background_request_restores_immediately(self):
+        cm = ChunkManager(
+            ECS(), chunk_size=(8, 8, 8), workers=1, worker_kind="thread", compressed_cache_bytes=1 << 20
+        )
+        self.addCleanup(cm.shutdown)
+        cm.create_chunk((4, 0, 4))
+        cm.unload_chunk((4, 0, 4))
+        self.assertIsNotNone(cm.request_chunk((4, 0, 4)))
+        self.assertEqual(cm.chunk_state((4, 0, 4)), LOADED)
+        self.assertEqual(cm.list_pending(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+import os
+import tempfile
+import time
+import unittest
+
+from simplex.ecs.ecs import ECS
+from simplex.voxel.chunk import Chunk
+from simplex.voxel.voxel import BLOCK_AIR, BLOCK_STONE, Voxel
+from simplex.world.chunk_manager import ChunkManager, PENDING
+from simplex.world.region import (
+    HEADER_SECTORS,
+    SECTOR_SIZE,
+    RegionFile,
+    RegionStore,
+    decode_chunk,
+    encode_chunk,
+    region_coords,
+)
+
+
+def _noisy_payload(n_bytes):
+    # incompressible enough that the payload size is roughly n_bytes
+    return os.urandom(n_bytes)
+
+
+class RegionFormatTests(unittest.TestCase):
+    def test_region_coords_handle_negative_chunks(self):
+        self.assertEqual(region_coords((0, 0, 0)), ((0, 0, 0), 0))
+        self.assertEqual(region_coords((31, 2, 1)), ((0, 2, 0), 32 + 31))
+        self.assertEqual(region_coords((-1, 0, -33)), ((-1, 0, -2), 31 * 32 + 31))
+
+    def test_encode_roundtrip_keeps_blocks_and_meta(self):
+        chunk = Chunk((3, 0, -4), size=(4, 4, 4))
+        chunk.set_block(1, 2, 3, Voxel(BLOCK_STONE, {"owner": "bob"}))
+        snap = chunk.snapshot(include_meta=True)
+        restored = Chunk.from_snapshot(decode_chunk((3, 0, -4), encode_chunk(snap)))
+        self.assertEqual(restored.snapshot(include_meta=True), snap)
+        self.assertEqual(restored.get_block(1, 2, 3).data, {"owner": "bob"})
+        self.assertFalse(restored.modified)
+
+        uniform = Chunk((0, -1, 0), size=(4, 4, 4))
+        uniform.fill(BLOCK_STONE)
+        self.assertEqual(decode_chunk((0, -1, 0), encode_chunk(uniform.snapshot())), uniform.snapshot())
+
+    def test_sectors_are_reused(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            rf = RegionFile(os.path.join(tmp, "r.0.0.0.sxr"))
+            rf.write(0, _noisy_payload(3 * SECTOR_SIZE))
+            rf.write(1, _noisy_payload(100))
+            self.assertEqual(rf.sector_count(), HEADER_SECTORS + 4)
+            # growing slot 0 moves it past slot 1 and frees its three sectors
+            big = _noisy_payload(4 * SECTOR_SIZE)
+            rf.write(0, big)
+            self.assertEqual(rf.free_sectors(), 3)
+            # a new chunk lands in the freed run instead of growing the file
+            rf.write(2, _noisy_payload(2 * SECTOR_SIZE))
+            self.assertEqual(rf.sector_count(), HEADER_SECTORS + 8)
+            self.assertEqual(rf.free_sectors(), 1)
+            # shrinking in place releases the tail
+            rf.write(0, b"x" * 10)
+            self.assertEqual(rf.free_sectors(), 4)
+            self.assertTrue(rf.delete(1))
+            self.assertNotIn(1, rf)
+            rf.close()
+
+            reopened = RegionFile(rf.path)
+            self.assertEqual(reopened.read(0), b"x" * 10)
+            self.assertIsNone(reopened.read(1))
+            self.assertEqual(reopened.free_sectors(), 5)
+            reopened.close()
+
+    def test_store_saves_and_loads_across_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = RegionStore(tmp, max_open=1)
+            chunks = [Chunk((cx, 0, 40), size=(4, 4, 4)) for cx in (-40, 0, 1)]
+            for i, chunk in enumerate(chunks):
+                chunk.set_block_id(i, 0, 0, BLOCK_STONE)
+                store.save(chunk.snapshot())
+            self.assertIsNone(store.load((2, 0, 40)))
+            store.close()
+            self.assertEqual(len(os.listdir(tmp)), 2)
+
+            store = RegionStore(tmp)
+            for chunk in chunks:
+                self.assertTrue(store.contains(chunk.position))
+                self.assertEqual(store.load(chunk.position).blocks, chunk.snapshot().blocks)
+            store.close()
+
+
+class ChunkManagerPersistenceTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.store = RegionStore(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_evicted_edits_are_written_back_and_reloaded(self):
+        cm = ChunkManager(ECS(), chunk_size=(8, 8, 8), cache_size=2, store=self.store)
+        cm.create_chunk((0, 0, 0))
+        cm.get_chunk((0, 0, 0)).set_block_id(1, 7, 1, BLOCK_STONE)
+        cm.create_chunk((1, 0, 0))
+        cm.create_chunk((2, 0, 0))  # evicts (0, 0, 0)
+        # unedited chunks are regenerated rather than saved
+        cm.create_chunk((3, 0, 0))
+        cm.flush()
+        self.assertTrue(self.store.contains((0, 0, 0)))
+        self.assertFalse(self.store.contains((1, 0, 0)))
+        self.assertEqual(cm.pending_writes(), 0)
+
+        cm.create_chunk((0, 0, 0))
+        chunk = cm.get_chunk((0, 0, 0))
+        self.assertEqual(chunk.get_block_id(1, 7, 1), BLOCK_STONE)
+        self.assertFalse(chunk.modified)
+        cm.shutdown()
+
+    def test_shutdown_saves_loaded_edits(self):
+        cm = ChunkManager(ECS(), chunk_size=(8, 8, 8), store=self.store)
+        cm.create_chunk((5, 0, 5))
+        cm.get_chunk((5, 0, 5)).set_block_id(0, 7, 0, BLOCK_STONE)
+        cm.shutdown()
+
+        cm = ChunkManager(ECS(), chunk_size=(8, 8, 8), store=RegionStore(self._tmp.name))
+        cm.create_chunk((5, 0, 5))
+        self.assertEqual(cm.get_chunk((5, 0, 5)).get_block_id(0, 7, 0), BLOCK_STONE)
+        cm.shutdown()
+
+    def test_background_requests_load_from_disk_first(self):
+        edited = Chunk((0, 0, 0), size=(8, 8, 8))
+        edited.fill(BLOCK_AIR)
+        edited.set_block_id(4, 4, 4, BLOCK_STONE)
+        self.store.save(edited.snapshot())
+
+        cm = ChunkManager(
+            ECS(), chunk_size=(8, 8, 8), workers=1, worker_kind="thread", store=self.store
+        )
+        self.assertIsNone(cm.request_chunk((0, 0, 0)))
+        self.assertIsNone(cm.request_chunk((1, 0, 0)))
+        self.assertEqual(cm.chunk_state((1, 0, 0)), PENDING)
+        deadline = time.monotonic() + 10.0
+        while len(cm.list_loaded()) < 2:
+            self.assertLess(time.monotonic(), deadline, "chunks were not integrated")
+            cm.integrate_pending()
+            time.sleep(0.001)
+        self.assertEqual(cm.get_chunk((0, 0, 0)).snapshot(), edited.snapshot())
+        self.assertNotEqual(cm.get_chunk((1, 0, 0)).uniform_id, BLOCK_AIR)
+        cm.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
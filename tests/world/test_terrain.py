@@ -0,0 +1,73 @@
+import unittest
+
+import simplex.world.terrain as terrain
+from simplex.ecs.ecs import ECS
+from simplex.voxel.chunk import Chunk
+from simplex.voxel.voxel import BLOCK_AIR, BLOCK_DIRT, BLOCK_GRASS, BLOCK_STONE
+from simplex.world.chunk_manager import ChunkManager
+from simplex.world.terrain import NoiseTerrainGenerator, SimpleHeightmapGenerator, make_generator
+
+
+def _generate(generator, position, palette=False):
+    chunk = Chunk(position, palette=palette)
+    generator.generate(chunk)
+    return chunk
+
+
+class TerrainGeneratorTests(unittest.TestCase):
+    def test_simple_heightmap_matches_original_terrain(self):
+        chunk = _generate(SimpleHeightmapGenerator(16), (2, 0, -1))
+        for x in range(16):
+            for z in range(16):
+                height = 4 + (2 + 1 + x + z) % 2
+                column = [chunk.get_block_id(x, y, z) for y in range(16)]
+                self.assertEqual(column, [BLOCK_DIRT] * height + [BLOCK_AIR] * (16 - height))
+
+    def test_heights_are_world_space(self):
+        gen = SimpleHeightmapGenerator(16)
+        self.assertEqual(_generate(gen, (0, 1, 0)).uniform_id, BLOCK_AIR)
+        self.assertEqual(_generate(gen, (0, -1, 0)).uniform_id, BLOCK_DIRT)
+
+    def test_noise_is_deterministic_per_seed_and_position(self):
+        first = [_generate(NoiseTerrainGenerator(seed=7), (cx, 0, 3)).snapshot() for cx in range(-2, 3)]
+        again = [_generate(NoiseTerrainGenerator(seed=7), (cx, 0, 3)).snapshot() for cx in (2, 1, 0, -1, -2)]
+        self.assertEqual(first, again[::-1])
+        other = _generate(NoiseTerrainGenerator(seed=8), (0, 0, 3)).snapshot()
+        self.assertNotEqual(first[2], other)
+
+    def test_noise_columns_are_layered(self):
+        chunk = _generate(NoiseTerrainGenerator(seed=1, base_height=6), (1, 0, 1))
+        for x, z in ((0, 0), (5, 9), (15, 15)):
+            column = [chunk.get_block_id(x, y, z) for y in range(16)]
+            top = max(y for y, bid in enumerate(column) if bid != BLOCK_AIR)
+            self.assertEqual(column[top], BLOCK_GRASS)
+            self.assertEqual(column[top - 1], BLOCK_DIRT)
+            self.assertEqual(column[0], BLOCK_STONE)
+
+    def test_pure_python_fallback_matches_numpy(self):
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest("numpy not installed")
+        gen = NoiseTerrainGenerator(seed=99)
+        expected = [_generate(gen, pos).snapshot() for pos in ((0, 0, 0), (-4, 0, 6))]
+        paletted = _generate(gen, (-4, 0, 6), palette=True)
+        original = terrain.np
+        terrain.np = None
+        try:
+            actual = [_generate(gen, pos).snapshot() for pos in ((0, 0, 0), (-4, 0, 6))]
+        finally:
+            terrain.np = original
+        self.assertEqual(actual, expected)
+        self.assertEqual(paletted.snapshot(), expected[1])
+
+    def test_chunk_manager_uses_generator(self):
+        cm = ChunkManager(ECS(), generator=make_generator("noise", seed=3))
+        cm.create_chunk((0, 0, 0))
+        self.assertEqual(cm.get_chunk((0, 0, 0)).snapshot(), _generate(NoiseTerrainGenerator(seed=3), (0, 0, 0)).snapshot())
+        with self.assertRaises(ValueError):
+            make_generator("caves")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,13 +3,21 @@ import unittest
 from simplex.ecs.ecs import ECS
 from simplex.world.chunk_manager import ChunkManager
 from simplex.world.world_query import (
+    WorldAccessor,
+    feet_on_ground,
     find_ground_height,
     get_block_id_at_world,
     is_solid_at_world,
+    raycast,
     world_to_chunk_coords,
     world_to_local,
 )
-from simplex.voxel.voxel import BLOCK_AIR, BLOCK_DIRT
+from simplex.voxel.voxel import BLOCK_AIR, BLOCK_DIRT, BLOCK_STONE
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class WorldQueryTests(unittest.TestCase):
@@ -39,6 +47,113 @@ class WorldQueryTests(unittest.TestCase):
         self.assertEqual(ground, 4.0)
         self.assertTrue(is_solid_at_world(self.cm, 0.5, 3.0, 0.5))
 
+    def test_ground_queries_follow_edits_and_overhangs(self):
+        chunk = self.cm.get_chunk((0, 0, 0))
+        chunk.fill(BLOCK_AIR)
+        self.cm.create_chunk((0, -1, 0))
+        self.cm.get_chunk((0, -1, 0)).fill(BLOCK_DIRT)
+        # nothing in this chunk's column: the ground is the top of the chunk below
+        self.assertEqual(find_ground_height(self.cm, 3.5, 10.0, 3.5, half_width=0), 0.0)
+        self.assertIsNone(find_ground_height(self.cm, 3.5, 10.0, 3.5, half_width=0, scan_depth=10))
+
+        chunk.set_block_id(3, 2, 3, BLOCK_DIRT)
+        chunk.set_block_id(3, 12, 3, BLOCK_DIRT)  # roof above the query point
+        self.assertEqual(find_ground_height(self.cm, 3.5, 10.0, 3.5, half_width=0), 3.0)
+        self.assertEqual(find_ground_height(self.cm, 3.5, 14.0, 3.5, half_width=0), 13.0)
+        self.assertTrue(feet_on_ground(self.cm, 3.5, 3.0, 3.5))
+        self.assertFalse(feet_on_ground(self.cm, 3.5, 4.0, 3.5))
+
+        chunk.set_block_id(3, 2, 3, BLOCK_AIR)
+        self.assertEqual(find_ground_height(self.cm, 3.5, 10.0, 3.5, half_width=0), 0.0)
+        self.assertFalse(feet_on_ground(self.cm, 3.5, 3.0, 3.5))
+        # unloaded column
+        self.assertIsNone(find_ground_height(self.cm, 40.5, 10.0, 3.5))
+
+
+class WorldAccessorTests(unittest.TestCase):
+    def setUp(self):
+        self.cm = ChunkManager(ECS(), chunk_size=(8, 8, 8), cache_size=8)
+        for pos in ((0, 0, 0), (-1, 0, 0), (0, 0, -1)):
+            self.cm.create_chunk(pos)
+            self.cm.get_chunk(pos).fill(BLOCK_AIR)
+        self.cm.get_chunk((0, 0, 0)).set_block_id(1, 2, 3, BLOCK_DIRT)
+        self.cm.get_chunk((-1, 0, 0)).set_block_id(7, 0, 0, BLOCK_STONE)
+        self.cm.get_chunk((0, 0, -1)).fill(BLOCK_STONE)
+
+    def test_reads_do_not_touch_lru_order(self):
+        world = self.cm.accessor()
+        self.assertIs(world, self.cm.accessor())
+        before = self.cm.list_loaded()
+        self.assertEqual(world.block_id_at(-0.5, 0.2, 0.9), BLOCK_STONE)
+        self.assertEqual(world.block_id_at(1.5, 2.0, 3.99), BLOCK_DIRT)
+        self.assertEqual(self.cm.list_loaded(), before)
+
+    def test_cached_chunk_is_dropped_on_unload(self):
+        world = WorldAccessor(self.cm)
+        self.assertEqual(world.block_id_at(1, 2, 3), BLOCK_DIRT)
+        self.cm.unload_chunk((0, 0, 0))
+        self.assertEqual(world.block_id_at(1, 2, 3), BLOCK_AIR)
+        self.assertIsNone(world.chunk_at(0, 0, 0))
+        self.assertTrue(world.is_solid_at(4, 4, -4))
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_batched_lookup_matches_scalar(self):
+        world = self.cm.accessor()
+        rng = np.random.default_rng(3)
+        # spans the three loaded chunks, negative coordinates and unloaded neighbours
+        points = rng.uniform(-10.0, 10.0, size=(500, 3))
+        points[:3] = ((1.2, 2.5, 3.0), (-0.1, 0.0, 0.7), (9.0, 0.0, 0.0))
+        ids = world.block_ids_at(points)
+        self.assertEqual(ids.dtype, np.uint16)
+        expected = [world.block_id_at(*p) for p in points]
+        self.assertEqual(ids.tolist(), expected)
+        self.assertEqual(ids[:3].tolist(), [BLOCK_DIRT, BLOCK_STONE, BLOCK_AIR])
+        self.assertEqual(world.solid_at(points[:3]).tolist(), [True, True, False])
+        self.assertEqual(len(world.block_ids_at(np.empty((0, 3)))), 0)
+
+
+class RaycastTests(unittest.TestCase):
+    def setUp(self):
+        self.cm = ChunkManager(ECS(), chunk_size=(8, 8, 8), cache_size=16)
+        for cx in range(4):
+            self.cm.create_chunk((cx, 0, 0))
+            self.cm.get_chunk((cx, 0, 0)).fill(BLOCK_AIR)
+        self.cm.get_chunk((3, 0, 0)).set_block_id(2, 4, 4, BLOCK_STONE)
+
+    def test_hit_reports_block_face_and_distance(self):
+        hit = raycast(self.cm, (0.5, 4.5, 4.5), (1, 0, 0), 64.0)
+        self.assertEqual(hit.block, (26, 4, 4))
+        self.assertEqual(hit.block_id, BLOCK_STONE)
+        self.assertEqual(hit.normal, (-1, 0, 0))
+        self.assertAlmostEqual(hit.distance, 25.5)
+        self.assertIsNone(raycast(self.cm, (0.5, 4.5, 4.5), (1, 0, 0), 25.0))
+        self.assertIsNone(raycast(self.cm, (0.5, 4.5, 4.5), (-1, 0, 0), 64.0))
+
+        # diagonal ray entering through the top face, crossing chunk borders
+        hit = raycast(self.cm, (21.0, 10.5, 4.5), (6, -6, 0))
+        self.assertEqual((hit.block, hit.normal), ((26, 4, 4), (0, 1, 0)))
+
+        # starting inside a solid block
+        hit = raycast(self.cm, (26.2, 4.2, 4.2), (0, 1, 0))
+        self.assertEqual((hit.distance, hit.normal), (0.0, (0, 0, 0)))
+        with self.assertRaises(ValueError):
+            raycast(self.cm, (0, 0, 0), (0, 0, 0))
+
+    def test_skips_unloaded_and_solid_uniform_chunks_are_hit(self):
+        self.cm.unload_chunk((1, 0, 0))
+        self.cm.get_chunk((2, 0, 0)).fill(BLOCK_STONE)
+        hit = raycast(self.cm, (-20.5, 4.5, 4.5), (1, 0, 0))
+        self.assertEqual((hit.block, hit.normal), ((16, 4, 4), (-1, 0, 0)))
+        self.assertAlmostEqual(hit.distance, 36.5)
+
+    def test_raycast_many_matches_single_rays(self):
+        world = self.cm.accessor()
+        origins = [(0.5, 4.5, 4.5), (0.5, 4.5, 4.5), (20.5, 10.5, 4.5)]
+        directions = [(1, 0, 0), (-1, 0, 0), (1, -1, 0)]
+        hits = world.raycast_many(origins, directions, [64.0, 64.0, 3.0])
+        self.assertEqual(hits[0], world.raycast(origins[0], directions[0]))
+        self.assertEqual(hits[1:], [None, None])
+
 
 if __name__ == "__main__":
     unittest.main()